@@ -4,10 +4,12 @@
 import hashlib
 import json
 import math
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 from typeguard import typechecked
 
+from snnadaptation.selection.Selection_policy import Selection_policy
+
 
 # pylint: disable=R0903
 class Adaptation:
@@ -20,6 +22,8 @@ class Adaptation:
         self,
         adaptation_type: str,
         redundancy: int,
+        selection: Optional[Selection_policy] = None,
+        next_stages: Optional[List["Adaptation"]] = None,
     ) -> None:
         self.adaptation_type: str = adaptation_type
         if self.adaptation_type not in ["redundancy", "population"]:
@@ -31,6 +35,26 @@ class Adaptation:
             raise ValueError(
                 "Error, redundancy must be equal to, or larger than 1."
             )
+        # Adapts all neurons if no selection is given.
+        self.selection: Optional[Selection_policy] = selection
+        # Adaptations that are applied, in order, to the adapted graph.
+        self.next_stages: List[Adaptation] = []
+        if next_stages is not None:
+            self.next_stages = next_stages
+        for next_stage in self.next_stages:
+            if next_stage.next_stages:
+                raise ValueError(
+                    "Error, a next stage can not have next stages itself."
+                )
+
+    @typechecked
+    def get_stages(
+        self,
+    ) -> List["Adaptation"]:
+        """Returns the ordered list of single stage adaptations."""
+        return [
+            Adaptation(self.adaptation_type, self.redundancy, self.selection)
+        ] + self.next_stages
 
     @typechecked
     def get_hash(
@@ -40,9 +64,7 @@ class Adaptation:
         unique_id = str(
             hashlib.sha256(
                 # json.dumps(sorted(some_config.__dict__)).encode("utf-8")
-                json.dumps(f"{self.adaptation_type}_{self.redundancy}").encode(
-                    "utf-8"
-                )
+                json.dumps(self.get_name()).encode("utf-8")
             ).hexdigest()
         )
         return unique_id
@@ -52,8 +74,15 @@ class Adaptation:
         self,
     ) -> str:
         """Returns a the adaptation name in format
-        <adaptation_type>_<redundancy>."""
-        return f"{self.adaptation_type}_{self.redundancy}"
+        <adaptation_type>_<redundancy>, followed by _<selection> if only a
+        selection of the neurons is adapted, and by _then_<name> per next
+        stage."""
+        name: str = f"{self.adaptation_type}_{self.redundancy}"
+        if self.selection is not None:
+            name = f"{name}_{self.selection.get_name()}"
+        for next_stage in self.next_stages:
+            name = f"{name}_then_{next_stage.get_name()}"
+        return name
 
 
 @typechecked
@@ -1,3 +1,22 @@
 """Contains the project versioning."""
 __version__ = "0.0.2"
 __version_info__ = tuple(int(i) for i in __version__.split(".") if i.isdigit())
+
+
+def main() -> None:
+    """Runs the snnadaptation command line batch tool, see
+    snnadaptation.cli.adapt_graph_files."""
+    # Imported here, such that importing the package stays lightweight.
+    # pylint: disable=C0415
+    from snnadaptation.cli.adapt_graph_files import main as run_cli
+
+    run_cli()
+
+
+def serve() -> None:
+    """Runs the local adaptation service, see
+    snnadaptation.service.adaptation_server."""
+    # pylint: disable=C0415
+    from snnadaptation.service.adaptation_server import main as run_service
+
+    run_service()
@@ -0,0 +1,155 @@
+"""Packs many small adapted graphs into one block-diagonal graph, such that a
+single simulation processes all of them, and extracts the graph of each
+input from the simulated batch."""
+import copy
+from typing import Any, Dict, List, Tuple
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.plan.integer_ids import (
+    get_node_names,
+    node_names_key,
+    relabel_to_node_names,
+)
+
+
+class Graph_batch:
+    """A block-diagonal graph of several graphs. The nodes of graph i are
+    prefixed with b<i>_, and have the consecutive neuron_ids of the id range
+    graph_id_ranges[i] of the batch graph."""
+
+    # pylint: disable=R0903
+    @typechecked
+    def __init__(
+        self,
+        batch_graph: nx.DiGraph,
+        graph_attributes: List[Dict[str, Any]],
+    ) -> None:
+        self.batch_graph: nx.DiGraph = batch_graph
+        # The graph attributes of each graph of the batch.
+        self.graph_attributes: List[Dict[str, Any]] = graph_attributes
+        # The names of the nodes of the batch graph, ordered by neuron id.
+        self.node_names: List[str] = []
+
+    @typechecked
+    def get_prefix(self, graph_index: int) -> str:
+        """Returns the prefix of the node names of a graph in the batch."""
+        return f"b{graph_index}_"
+
+    @typechecked
+    def get_batch_node_name(self, graph_index: int, node_name: str) -> str:
+        """Returns the name of a node of a graph in the batch graph."""
+        return f"{self.get_prefix(graph_index)}{node_name}"
+
+    @typechecked
+    def get_id_range(self, graph_index: int) -> Tuple[int, int]:
+        """Returns the [start, stop) neuron id range of a graph, e.g. to
+        slice the arrays of a vectorised simulation."""
+        start, stop = self.batch_graph.graph["graph_id_ranges"][graph_index]
+        return start, stop
+
+    @typechecked
+    def extract_graph(self, graph_index: int) -> nx.DiGraph:
+        """Returns the graph of graph_index with its original node names. Its
+        node and edge attributes are those of the batch graph, e.g. the
+        neurons and results of a simulation of the batch."""
+        prefix_length: int = len(self.get_prefix(graph_index))
+        start, stop = self.get_id_range(graph_index)
+        batch_node_names: List[str] = self.node_names[start:stop]
+        snn_graph = nx.DiGraph()
+        snn_graph.graph.update(self.graph_attributes[graph_index])
+        snn_graph.add_nodes_from(
+            (node_name[prefix_length:], self.batch_graph.nodes[node_name])
+            for node_name in batch_node_names
+        )
+        snn_graph.add_edges_from(
+            (left[prefix_length:], right[prefix_length:], edge_attributes)
+            for left in batch_node_names
+            for right, edge_attributes in self.batch_graph.succ[left].items()
+        )
+        return snn_graph
+
+
+@typechecked
+def batch_graphs(*, snn_graphs: List[nx.DiGraph]) -> Graph_batch:
+    """Returns the block-diagonal batch of the graphs. The batch has copies of
+    the neurons and synapses of the graphs, such that the same graph can be
+    batched more than once, and its neuron ids follow the neuron_ids graph
+    attribute of each graph, if it has them.
+
+    :param snn_graphs: Graphs with node names, e.g. adapted graphs, or with
+    integer node ids, which are batched, and extracted, with their node
+    names.
+    """
+    named_graphs: List[nx.DiGraph] = [
+        relabel_to_node_names(snn_graph=snn_graph)
+        if node_names_key in snn_graph.graph
+        else snn_graph
+        for snn_graph in snn_graphs
+    ]
+    batch = nx.DiGraph()
+    neuron_ids: Dict[str, int] = {}
+    graph_id_ranges: List[List[int]] = []
+    graph_batch = Graph_batch(
+        batch,
+        [copy.deepcopy(snn_graph.graph) for snn_graph in named_graphs],
+    )
+    for graph_index, snn_graph in enumerate(named_graphs):
+        prefix: str = graph_batch.get_prefix(graph_index)
+        start: int = len(neuron_ids)
+        graph_neuron_ids: Dict[str, int] = snn_graph.graph.get(
+            "neuron_ids",
+            {
+                node_name: node_id
+                for node_id, node_name in enumerate(snn_graph.nodes)
+            },
+        )
+        # Add the nodes in order of their ids.
+        for node_name in get_node_names(neuron_ids=graph_neuron_ids):
+            neuron_ids[f"{prefix}{node_name}"] = len(neuron_ids)
+            batch.add_node(
+                f"{prefix}{node_name}",
+                **copy.deepcopy(snn_graph.nodes[node_name]),
+            )
+        batch.add_edges_from(
+            (
+                f"{prefix}{left}",
+                f"{prefix}{right}",
+                copy.deepcopy(edge_attributes),
+            )
+            for left, right, edge_attributes in snn_graph.edges(data=True)
+        )
+        graph_id_ranges.append([start, len(neuron_ids)])
+    batch.graph["neuron_ids"] = neuron_ids
+    graph_batch.node_names = get_node_names(neuron_ids=neuron_ids)
+    batch.graph["graph_id_ranges"] = graph_id_ranges
+    return graph_batch
+
+
+@typechecked
+def adapt_and_batch(
+    *,
+    snn_graphs: List[nx.DiGraph],
+    adaptation: Adaptation,
+    plot_config: Plot_config,
+) -> Graph_batch:
+    """Adapts each graph, and returns the block-diagonal batch of the adapted
+    graphs. The snn_graphs are not changed.
+
+    :param snn_graphs: Graphs with the MDSA SNN approximation solution.
+    :param adaptation: The adaptation that is applied to each graph.
+    """
+    return batch_graphs(
+        snn_graphs=[
+            apply_fused_adaptation(
+                adaptation_graph=snn_graph,
+                adaptation=adaptation,
+                plot_config=plot_config,
+            )
+            for snn_graph in snn_graphs
+        ]
+    )
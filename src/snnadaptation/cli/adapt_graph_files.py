@@ -0,0 +1,274 @@
+"""Adapts serialised SNN graphs in parallel worker processes, and streams the
+adapted graphs and their timing into an output directory."""
+import csv
+import glob
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import IO, Dict, List, Optional, Tuple
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.cli.parse_cli_args import (
+    parse_adaptation_spec,
+    parse_cli_args,
+)
+from snnadaptation.compaction.compact_graph import compact_graph
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.serialization.stream_node_link_json import (
+    stream_graph_from_json,
+    stream_graph_to_json,
+)
+from snnadaptation.validation.check_adapted_graph import verify_adapted_graph
+
+# The file extensions of the adapted graphs, per compression.
+compression_extensions: Dict[str, str] = {
+    "none": ".json",
+    "gzip": ".json.gz",
+    "zstd": ".json.zst",
+}
+
+
+@typechecked
+def main(args: Optional[List[str]] = None) -> None:
+    """Runs the batch tool, and exits with code 1 if any graph could not be
+    adapted."""
+    cli_args = parse_cli_args(args)
+    # Parse the specifications before any work is started.
+    for spec in cli_args.adaptations:
+        parse_adaptation_spec(spec=spec)
+    graph_paths: List[str] = get_graph_paths(inputs=cli_args.inputs)
+    os.makedirs(cli_args.output_dir, exist_ok=True)
+
+    nr_of_failures: int = adapt_graph_files(
+        graph_paths=graph_paths,
+        adaptation_specs=cli_args.adaptations,
+        output_dir=cli_args.output_dir,
+        workers=cli_args.workers,
+        overwrite=cli_args.overwrite,
+        compact=cli_args.compact,
+        compression=cli_args.compression,
+        verify=cli_args.verify,
+    )
+    if nr_of_failures:
+        sys.exit(1)
+
+
+@typechecked
+def get_graph_paths(*, inputs: List[str]) -> List[str]:
+    """Returns the (compressed) json graph files of directories and glob
+    patterns, without duplicates."""
+    graph_paths: Dict[str, None] = {}
+    for input_path in inputs:
+        if os.path.isdir(input_path):
+            matches = [
+                match
+                for extension in compression_extensions.values()
+                for match in glob.glob(
+                    os.path.join(input_path, f"*{extension}")
+                )
+            ]
+        else:
+            matches = glob.glob(input_path)
+        if not matches:
+            raise FileNotFoundError(f"Error, no graphs found for {input_path}")
+        for match in sorted(matches):
+            graph_paths[match] = None
+    return list(graph_paths)
+
+
+@typechecked
+def get_graph_stem(*, graph_path: str) -> str:
+    """Returns the file name of a graph without its (compressed) json
+    extension."""
+    file_name: str = os.path.basename(graph_path)
+    for extension in compression_extensions.values():
+        if file_name.endswith(extension):
+            return file_name[: -len(extension)]
+    return os.path.splitext(file_name)[0]
+
+
+# pylint: disable=R0913
+@typechecked
+def adapt_graph_files(
+    *,
+    graph_paths: List[str],
+    adaptation_specs: List[str],
+    output_dir: str,
+    workers: Optional[int],
+    overwrite: bool,
+    compact: bool = False,
+    compression: str = "none",
+    verify: bool = False,
+) -> int:
+    """Adapts each graph file with each adaptation in a pool of worker
+    processes. Prints the progress and appends the timing of each adapted
+    graph to timings.csv in the output directory as soon as a graph file is
+    done. Returns the amount of graph files that failed."""
+    timings_path: str = os.path.join(output_dir, "timings.csv")
+    write_header: bool = not os.path.exists(timings_path)
+    with open(
+        timings_path, "a", encoding="utf-8", newline=""
+    ) as timings_file, ProcessPoolExecutor(max_workers=workers) as executor:
+        if write_header:
+            csv.writer(timings_file).writerow(
+                ["input", "adaptation", "output", "seconds"]
+            )
+        futures: Dict[Future, str] = {
+            executor.submit(
+                adapt_graph_file,
+                graph_path=graph_path,
+                adaptation_specs=adaptation_specs,
+                output_dir=output_dir,
+                overwrite=overwrite,
+                compact=compact,
+                compression=compression,
+                verify=verify,
+            ): graph_path
+            for graph_path in graph_paths
+        }
+        return write_timings(futures=futures, timings_file=timings_file)
+
+
+@typechecked
+def write_timings(*, futures: Dict[Future, str], timings_file: IO[str]) -> int:
+    """Prints the progress and appends the timings of each graph file as
+    soon as its future is done. Returns the amount of graph files that
+    failed."""
+    nr_of_failures: int = 0
+    timings_writer = csv.writer(timings_file)
+    for nr_done, future in enumerate(as_completed(futures), start=1):
+        graph_path = futures[future]
+        progress: str = f"[{nr_done}/{len(futures)}] {graph_path}"
+        try:
+            timings = future.result()
+        # A failed graph file is reported and counted, instead of stopping
+        # the adaptation of the other graph files.
+        except Exception as error:  # pylint: disable=W0718
+            nr_of_failures += 1
+            print(f"{progress}: failed, {error!r}", flush=True)
+            continue
+        if not timings:
+            print(f"{progress}: skipped, already adapted", flush=True)
+        for adaptation_name, output_path, seconds in timings:
+            timings_writer.writerow(
+                [graph_path, adaptation_name, output_path, seconds]
+            )
+            print(
+                f"{progress}: {adaptation_name} in {seconds:.3f}s",
+                flush=True,
+            )
+        timings_file.flush()
+    return nr_of_failures
+
+
+@typechecked
+def adapt_graph_file(
+    *,
+    graph_path: str,
+    adaptation_specs: List[str],
+    output_dir: str,
+    overwrite: bool,
+    compact: bool = False,
+    compression: str = "none",
+    verify: bool = False,
+) -> List[Tuple[str, str, float]]:
+    """Reads a graph file once, and writes its adapted (and optionally
+    verified and compacted) graph per adaptation, with the file extension of
+    the compression. Returns the name, output path and duration in seconds of
+    each adaptation that was not skipped. The duration includes reading the
+    graph once."""
+    start = time.perf_counter()
+    snn_graph = stream_graph_from_json(json_path=graph_path)
+    read_seconds: float = time.perf_counter() - start
+
+    timings: List[Tuple[str, str, float]] = []
+    for spec in adaptation_specs:
+        adaptation: Adaptation = parse_adaptation_spec(spec=spec)
+        output_path: str = get_output_path(
+            graph_path=graph_path,
+            adaptation=adaptation,
+            output_dir=output_dir,
+            compression=compression,
+        )
+        if os.path.exists(output_path) and not overwrite:
+            continue
+        seconds: float = write_adapted_graph(
+            snn_graph=snn_graph,
+            adaptation=adaptation,
+            output_path=output_path,
+            temporary_path=get_output_path(
+                graph_path=graph_path,
+                adaptation=adaptation,
+                output_dir=output_dir,
+                compression=compression,
+                is_temporary=True,
+            ),
+            compact=compact,
+            verify=verify,
+        )
+        timings.append(
+            (adaptation.get_name(), output_path, read_seconds + seconds)
+        )
+        read_seconds = 0.0
+    return timings
+
+
+@typechecked
+def get_output_path(
+    *,
+    graph_path: str,
+    adaptation: Adaptation,
+    output_dir: str,
+    compression: str,
+    is_temporary: bool = False,
+) -> str:
+    """Returns the path of the adapted graph of a graph file, with the file
+    extension of the compression. The temporary path keeps the extension,
+    which selects the compression."""
+    stem: str = get_graph_stem(graph_path=graph_path)
+    temporary: str = ".tmp" if is_temporary else ""
+    return os.path.join(
+        output_dir,
+        f"{stem}_{adaptation.get_name()}{temporary}"
+        + compression_extensions[compression],
+    )
+
+
+@typechecked
+def write_adapted_graph(
+    *,
+    snn_graph: nx.DiGraph,
+    adaptation: Adaptation,
+    output_path: str,
+    temporary_path: str,
+    compact: bool,
+    verify: bool,
+) -> float:
+    """Adapts, optionally verifies and compacts, and writes a graph. Returns
+    the duration in seconds."""
+    start = time.perf_counter()
+    adapted_graph = apply_fused_adaptation(
+        adaptation_graph=snn_graph,
+        adaptation=adaptation,
+        plot_config=Plot_config(),
+    )
+    if verify:
+        verify_adapted_graph(
+            adapted_graph=adapted_graph, adaptation=adaptation
+        )
+    if compact:
+        print(
+            f"{output_path}: "
+            + compact_graph(snn_graph=adapted_graph).get_summary(),
+            flush=True,
+        )
+    # Write to a temporary file, such that an interrupted run does not leave
+    # an incomplete graph that is skipped in the next run.
+    stream_graph_to_json(snn_graph=adapted_graph, json_path=temporary_path)
+    os.replace(temporary_path, output_path)
+    return time.perf_counter() - start
@@ -0,0 +1,110 @@
+"""Parses the command line arguments of the snnadaptation batch tool."""
+import argparse
+from typing import List, Optional
+
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+
+
+@typechecked
+def parse_cli_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    """Reads command line arguments and converts them into python arguments."""
+    parser = argparse.ArgumentParser(
+        prog="snnadaptation",
+        description=(
+            "Applies adaptations to serialised SNN graphs, in parallel "
+            + "worker processes."
+        ),
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        type=str,
+        help=(
+            "Directories with node-link json graphs, or glob patterns of "
+            + "node-link json graph files."
+        ),
+    )
+    parser.add_argument(
+        "-a",
+        "--adaptation",
+        action="append",
+        required=True,
+        type=str,
+        dest="adaptations",
+        help=(
+            "Adaptation in format <adaptation_type>_<redundancy>, e.g. "
+            + "redundancy_2. Stages are joined with +, e.g. "
+            + "population_2+redundancy_1. Can be given multiple times."
+        ),
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        required=True,
+        type=str,
+        help="Directory into which the adapted graphs are written.",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="Amount of worker processes, the amount of CPUs by default.",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        default=False,
+        help=(
+            "Removes the synapses and neurons of the adapted graphs that "
+            + "provably can not affect their spiking behaviour."
+        ),
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        default=False,
+        help=(
+            "Checks the neurons and synapses of each adapted graph against "
+            + "the structure its adaptation creates, before it is written. "
+            + "Only single stage adaptations can be checked."
+        ),
+    )
+    parser.add_argument(
+        "--compression",
+        choices=["none", "gzip", "zstd"],
+        default="none",
+        help=(
+            "Compresses the adapted graphs, which are written one neuron and "
+            + "synapse at a time. zstd requires the zstandard package."
+        ),
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        default=False,
+        help="Recreates adapted graphs that already exist.",
+    )
+    return parser.parse_args(args)
+
+
+@typechecked
+def parse_adaptation_spec(*, spec: str) -> Adaptation:
+    """Returns the adaptation of a specification like redundancy_2, or
+    population_2+redundancy_1 for an adaptation with a next stage."""
+    stages: List[Adaptation] = []
+    for stage_spec in spec.split("+"):
+        adaptation_type, _, redundancy = stage_spec.rpartition("_")
+        if not redundancy.isdigit():
+            raise ValueError(
+                f"Error, {stage_spec} is not in format "
+                + "<adaptation_type>_<redundancy>."
+            )
+        stages.append(Adaptation(adaptation_type, int(redundancy)))
+    return Adaptation(
+        stages[0].adaptation_type,
+        stages[0].redundancy,
+        next_stages=stages[1:],
+    )
@@ -0,0 +1,166 @@
+"""Removes synapses and neurons that can not affect the spiking behaviour of
+a SNN graph, based on a static analysis of weights, thresholds and
+reachability."""
+# pylint: disable=R0903
+from typing import Dict, List, Optional, Set, Tuple
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import LIF_neuron
+from typeguard import typechecked
+
+from snnadaptation.neuron_roles import redundant_prefix
+
+
+class Compaction_report:
+    """The amount of neurons and synapses before compaction, and the amount
+    that was removed, per reason."""
+
+    @typechecked
+    def __init__(
+        self,
+        nr_of_neurons: int,
+        nr_of_synapses: int,
+    ) -> None:
+        self.nr_of_neurons: int = nr_of_neurons
+        self.nr_of_synapses: int = nr_of_synapses
+        self.removed_synapses: Dict[str, int] = {
+            # Synapses with weight 0, that never change their weight.
+            "zero_weight": 0,
+            # Synapses out of neurons that can never spike.
+            "silent_source": 0,
+            # Synapses into removed neurons, that can never spike.
+            "silent_target": 0,
+        }
+        # Redundant neurons that can never spike.
+        self.nr_of_removed_neurons: int = 0
+
+    @typechecked
+    def get_nr_of_removed_synapses(self) -> int:
+        """Returns the total amount of removed synapses."""
+        return sum(self.removed_synapses.values())
+
+    @typechecked
+    def get_summary(self) -> str:
+        """Returns a single line summary of the savings."""
+        removed_synapses: int = self.get_nr_of_removed_synapses()
+        return (
+            f"removed {removed_synapses}/{self.nr_of_synapses} synapses "
+            + f"({100 * removed_synapses / max(self.nr_of_synapses, 1):.1f}%"
+            + f", {self.removed_synapses}) and "
+            + f"{self.nr_of_removed_neurons}/{self.nr_of_neurons} neurons"
+        )
+
+
+@typechecked
+def compact_graph(
+    *,
+    snn_graph: nx.DiGraph,
+    keep_nodes: Optional[Set[str]] = None,
+) -> Compaction_report:
+    """Removes the inert synapses and neurons of the graph, in place. The
+    analysis assumes the neurons start with u=v=0 and receive no input other
+    than the synapses of the graph, and uses the LIF dynamics:
+    u = u(1-du) + a_in, v = v(1-dv) + u + bias, spike if v > vth.
+
+    Neurons that can never spike are removed if they are redundant neurons
+    and not in keep_nodes, such that original neurons that are read out
+    remain. Removed synapses are those with weight 0, those out of neurons
+    that can never spike, and those into removed neurons. The inputs of the
+    neurons that remain are kept, even if the neuron can never spike, so
+    the spikes and the u and v of every remaining neuron are unchanged.
+
+    A DiGraph has no parallel synapses, an adaptation that adds a synapse
+    twice overwrites it. The self-loops of the redundant selectors are not
+    inert next to those of the original selectors: a self-loop only excites
+    its own neuron, so it is only removed, as silent source, if its
+    redundant selector can never spike.
+
+    :param snn_graph: Graph with a (adapted) MDSA SNN.
+    :param keep_nodes: Neurons that are never removed.
+    """
+    report = Compaction_report(len(snn_graph), snn_graph.number_of_edges())
+    may_spike: Set[str] = get_neurons_that_may_spike(snn_graph=snn_graph)
+    removed_nodes: Set[str] = {
+        node_name
+        for node_name in snn_graph.nodes
+        if node_name not in may_spike
+        and redundant_prefix.match(node_name)
+        and (keep_nodes is None or node_name not in keep_nodes)
+    }
+
+    removed_edges: List[Tuple[str, str]] = []
+    for left, right, synapse in snn_graph.edges(data="synapse"):
+        if synapse.weight == 0 and synapse.change_per_t == 0:
+            report.removed_synapses["zero_weight"] += 1
+        elif left not in may_spike:
+            report.removed_synapses["silent_source"] += 1
+        elif right in removed_nodes:
+            report.removed_synapses["silent_target"] += 1
+        else:
+            continue
+        removed_edges.append((left, right))
+    snn_graph.remove_edges_from(removed_edges)
+
+    # The synapses of these neurons are already removed.
+    snn_graph.remove_nodes_from(removed_nodes)
+    report.nr_of_removed_neurons = len(removed_nodes)
+    return report
+
+
+@typechecked
+def get_neurons_that_may_spike(*, snn_graph: nx.DiGraph) -> Set[str]:
+    """Returns a superset of the neurons that spike at some timestep, as the
+    least fixed point of: a neuron may spike if its bias and the positive
+    synapses from neurons that may spike can bring v above vth. Each neuron
+    is (re)evaluated only when one of its input neurons is found to spike,
+    so the analysis takes linear time in the amount of synapses."""
+    positive_input: Dict[str, float] = {
+        node_name: 0.0 for node_name in snn_graph.nodes
+    }
+    unbounded_input: Set[str] = set()
+    may_spike: Set[str] = set()
+    candidates: List[str] = list(snn_graph.nodes)
+    while candidates:
+        node_name = candidates.pop()
+        if node_name in may_spike or not can_spike(
+            lif_neuron=snn_graph.nodes[node_name]["nx_lif"][0],
+            positive_input=positive_input[node_name],
+            unbounded_input=node_name in unbounded_input,
+        ):
+            continue
+        may_spike.add(node_name)
+        for _, right, synapse in snn_graph.out_edges(
+            node_name, data="synapse"
+        ):
+            if synapse.change_per_t != 0:
+                unbounded_input.add(right)
+            elif synapse.weight > 0:
+                positive_input[right] += synapse.weight
+            else:
+                continue
+            candidates.append(right)
+    return may_spike
+
+
+@typechecked
+def can_spike(
+    *, lif_neuron: LIF_neuron, positive_input: float, unbounded_input: bool
+) -> bool:
+    """Returns False if the neuron provably never spikes, if it receives at
+    most positive_input per timestep."""
+    bias: float = lif_neuron.bias.get()
+    du: float = lif_neuron.du.get()
+    dv: float = lif_neuron.dv.get()
+    vth: float = lif_neuron.vth.get()
+    if unbounded_input or not (0 <= du <= 1 and 0 <= dv <= 1) or vth < 0:
+        return True
+    if positive_input <= 0 and bias <= 0:
+        # u and v never become positive.
+        return False
+    if du == 0 or dv == 0:
+        # u or v can accumulate without bound.
+        return True
+    # Upper bounds of the geometric series of u and v.
+    max_u: float = positive_input / du
+    max_v: float = (max_u + max(bias, 0)) / dv
+    return max_v > vth
@@ -0,0 +1,198 @@
+"""Contains the linear cost model that predicts the memory, adaptation time
+and simulation time of an adapted graph from its size."""
+import copy
+import time
+import tracemalloc
+from typing import Any, Callable, List, Optional
+
+import networkx as nx
+import numpy as np
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.population.apply_population_coding import (
+    apply_population_coding,
+)
+from snnadaptation.redundancy.apply_sparse_redundancy import (
+    apply_sparse_redundancy,
+)
+
+
+class Cost_model:
+    """Predicts resources as a linear function of the amount of neurons and
+    synapses of the adapted graph. The default coefficients are rough
+    values, use calibrate_cost_model to fit them to a machine."""
+
+    # pylint: disable=R0913
+    @typechecked
+    def __init__(
+        self,
+        bytes_per_neuron: float = 2000.0,
+        bytes_per_synapse: float = 600.0,
+        adaptation_seconds_per_neuron: float = 2e-4,
+        adaptation_seconds_per_synapse: float = 2e-5,
+        simulation_seconds_per_neuron: float = 5e-6,
+        simulation_seconds_per_synapse: float = 1e-6,
+    ) -> None:
+        self.bytes_per_neuron: float = bytes_per_neuron
+        self.bytes_per_synapse: float = bytes_per_synapse
+        self.adaptation_seconds_per_neuron: float = (
+            adaptation_seconds_per_neuron
+        )
+        self.adaptation_seconds_per_synapse: float = (
+            adaptation_seconds_per_synapse
+        )
+        self.simulation_seconds_per_neuron: float = (
+            simulation_seconds_per_neuron
+        )
+        self.simulation_seconds_per_synapse: float = (
+            simulation_seconds_per_synapse
+        )
+
+    @typechecked
+    def get_memory_bytes(
+        self, nr_of_neurons: int, nr_of_synapses: int
+    ) -> float:
+        """Returns the predicted memory of a networkx graph of this size."""
+        return (
+            self.bytes_per_neuron * nr_of_neurons
+            + self.bytes_per_synapse * nr_of_synapses
+        )
+
+    @typechecked
+    def get_adaptation_seconds(
+        self, nr_of_neurons: int, nr_of_synapses: int
+    ) -> float:
+        """Returns the predicted duration of the adaptation that yields a
+        graph of this size."""
+        return (
+            self.adaptation_seconds_per_neuron * nr_of_neurons
+            + self.adaptation_seconds_per_synapse * nr_of_synapses
+        )
+
+    @typechecked
+    def get_simulation_seconds_per_timestep(
+        self, nr_of_neurons: int, nr_of_synapses: int
+    ) -> float:
+        """Returns the predicted duration of a simulation timestep of a graph
+        of this size."""
+        return (
+            self.simulation_seconds_per_neuron * nr_of_neurons
+            + self.simulation_seconds_per_synapse * nr_of_synapses
+        )
+
+
+@typechecked
+def calibrate_cost_model(
+    *,
+    snn_graphs: List[nx.DiGraph],
+    adaptations: List[Adaptation],
+    plot_config: Plot_config,
+    simulate: Optional[Callable[[nx.DiGraph, int], Any]] = None,
+    sim_duration: int = 10,
+) -> Cost_model:
+    """Measures the adaptation of each graph with each adaptation on this
+    machine, and returns the cost model that fits the measurements best in
+    the least squares sense. Use graphs and redundancies of different sizes,
+    such that the neuron and synapse coefficients can be separated.
+
+    :param snn_graphs: Graphs with the MDSA SNN approximation solution.
+    :param adaptations: The adaptations that are measured.
+    :param simulate: Optional function that simulates a graph for a number
+    of timesteps. The simulation coefficients are only calibrated if it is
+    given.
+    :param sim_duration: The amount of timesteps that is simulated.
+    """
+    sizes: List[List[float]] = []
+    memory: List[float] = []
+    adaptation_seconds: List[float] = []
+    simulation_seconds: List[float] = []
+    for snn_graph in snn_graphs:
+        for adaptation in adaptations:
+            apply_adaptation = apply_sparse_redundancy
+            if adaptation.adaptation_type == "population":
+                apply_adaptation = apply_population_coding
+            start = time.perf_counter()
+            adaptation_graph = apply_adaptation(
+                adaptation_graph=snn_graph,
+                redundancy=adaptation.redundancy,
+                plot_config=plot_config,
+                selection=adaptation.selection,
+            )
+            adaptation_seconds.append(time.perf_counter() - start)
+
+            tracemalloc.start()
+            copy.deepcopy(adaptation_graph)
+            memory.append(float(tracemalloc.get_traced_memory()[1]))
+            tracemalloc.stop()
+
+            if simulate is not None:
+                start = time.perf_counter()
+                simulate(adaptation_graph, sim_duration)
+                simulation_seconds.append(
+                    (time.perf_counter() - start) / sim_duration
+                )
+            sizes.append(
+                [
+                    float(len(adaptation_graph)),
+                    float(adaptation_graph.number_of_edges()),
+                ]
+            )
+
+    cost_model = Cost_model()
+    (
+        cost_model.bytes_per_neuron,
+        cost_model.bytes_per_synapse,
+    ) = fit_coefficients(sizes=sizes, measurements=memory)
+    (
+        cost_model.adaptation_seconds_per_neuron,
+        cost_model.adaptation_seconds_per_synapse,
+    ) = fit_coefficients(sizes=sizes, measurements=adaptation_seconds)
+    if simulate is not None:
+        (
+            cost_model.simulation_seconds_per_neuron,
+            cost_model.simulation_seconds_per_synapse,
+        ) = fit_coefficients(sizes=sizes, measurements=simulation_seconds)
+    return cost_model
+
+
+@typechecked
+def fit_coefficients(
+    *, sizes: List[List[float]], measurements: List[float]
+) -> List[float]:
+    """Returns the non-negative per neuron and per synapse coefficients that
+    fit the measurements best in the least squares sense. If the
+    unconstrained fit has a negative coefficient, the best fit lies on the
+    boundary, so each coefficient is fitted alone with the other ones at
+    zero, and the fit with the smallest residual is returned."""
+    if not measurements:
+        raise ValueError("Error, at least one measurement is required.")
+    size_matrix = np.array(sizes)
+    measurement_vector = np.array(measurements)
+    coefficients, _, _, _ = np.linalg.lstsq(
+        size_matrix, measurement_vector, rcond=None
+    )
+    if all(coefficient >= 0 for coefficient in coefficients):
+        return [float(coefficient) for coefficient in coefficients]
+
+    best_coefficients: List[float] = [0.0] * size_matrix.shape[1]
+    best_residual: float = float(np.linalg.norm(measurement_vector))
+    for column in range(size_matrix.shape[1]):
+        column_sizes = size_matrix[:, column]
+        squared_norm: float = float(column_sizes @ column_sizes)
+        if squared_norm == 0:
+            continue
+        column_coefficients: List[float] = [0.0] * size_matrix.shape[1]
+        column_coefficients[column] = max(
+            float(column_sizes @ measurement_vector) / squared_norm, 0.0
+        )
+        residual: float = float(
+            np.linalg.norm(
+                size_matrix @ np.array(column_coefficients)
+                - measurement_vector
+            )
+        )
+        if residual < best_residual:
+            best_coefficients, best_residual = column_coefficients, residual
+    return best_coefficients
@@ -0,0 +1,239 @@
+"""Estimates the size of an adapted graph, and the time and memory its
+adaptation and simulation take, without applying the adaptation."""
+# pylint: disable=R0903
+from typing import Dict, Optional, Set
+
+import networkx as nx
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.estimation.Cost_model import Cost_model
+from snnadaptation.selection.select_neurons import is_adaptable, select_neurons
+
+
+class Adaptation_estimate:
+    """The exact amount of neurons and synapses of an adapted graph, and the
+    predicted resources of its adaptation and simulation."""
+
+    # pylint: disable=R0913
+    @typechecked
+    def __init__(
+        self,
+        nr_of_neurons: int,
+        nr_of_synapses: int,
+        nr_of_added_neurons: int,
+        nr_of_added_synapses: int,
+        cost_model: Cost_model,
+    ) -> None:
+        self.nr_of_neurons: int = nr_of_neurons
+        self.nr_of_synapses: int = nr_of_synapses
+        self.nr_of_added_neurons: int = nr_of_added_neurons
+        self.nr_of_added_synapses: int = nr_of_added_synapses
+        self.memory_bytes: float = cost_model.get_memory_bytes(
+            nr_of_neurons=nr_of_neurons, nr_of_synapses=nr_of_synapses
+        )
+        self.adaptation_seconds: float = cost_model.get_adaptation_seconds(
+            nr_of_neurons=nr_of_neurons, nr_of_synapses=nr_of_synapses
+        )
+        self.simulation_seconds_per_timestep: float = (
+            cost_model.get_simulation_seconds_per_timestep(
+                nr_of_neurons=nr_of_neurons, nr_of_synapses=nr_of_synapses
+            )
+        )
+
+
+@typechecked
+def estimate_adaptation(
+    *,
+    snn_graph: nx.DiGraph,
+    adaptation: Adaptation,
+    cost_model: Optional[Cost_model] = None,
+) -> Adaptation_estimate:
+    """Returns the amount of neurons and synapses the adaptation yields for
+    the snn_graph, and the predicted memory, adaptation time and simulation
+    time. The counts are computed in closed form from the role and degree
+    statistics of the graph, without creating any neuron or synapse.
+
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    :param adaptation: The adaptation that is estimated.
+    :param cost_model: Calibrated cost model, the default coefficients are
+    used if no cost model is given.
+    """
+    if adaptation.next_stages:
+        raise NotImplementedError(
+            "Error, estimating adaptation stages is not supported."
+        )
+    if cost_model is None:
+        cost_model = Cost_model()
+    adapted_nodes: Set[str] = get_adapted_node_set(
+        snn_graph=snn_graph, adaptation=adaptation
+    )
+    statistics: Dict[str, int] = get_adaptation_statistics(
+        snn_graph=snn_graph,
+        adaptation_type=adaptation.adaptation_type,
+        adapted_nodes=adapted_nodes,
+    )
+    nr_of_added_synapses: int = get_nr_of_added_synapses_closed_form(
+        adaptation_type=adaptation.adaptation_type,
+        redundancy=adaptation.redundancy,
+        statistics=statistics,
+    )
+    nr_of_added_neurons: int = adaptation.redundancy * len(adapted_nodes)
+    return Adaptation_estimate(
+        nr_of_neurons=len(snn_graph) + nr_of_added_neurons,
+        nr_of_synapses=snn_graph.number_of_edges() + nr_of_added_synapses,
+        nr_of_added_neurons=nr_of_added_neurons,
+        nr_of_added_synapses=nr_of_added_synapses,
+        cost_model=cost_model,
+    )
+
+
+@typechecked
+def get_adapted_node_set(
+    *, snn_graph: nx.DiGraph, adaptation: Adaptation
+) -> Set[str]:
+    """Returns the original neurons that get redundant neurons."""
+    if adaptation.selection is not None:
+        return select_neurons(
+            snn_graph=snn_graph,
+            adaptation_type=adaptation.adaptation_type,
+            redundancy=adaptation.redundancy,
+            selection=adaptation.selection,
+        )
+    return {
+        node_name
+        for node_name in snn_graph.nodes
+        if is_adaptable(
+            node_name=node_name, adaptation_type=adaptation.adaptation_type
+        )
+    }
+
+
+@typechecked
+def get_adaptation_statistics(
+    *,
+    snn_graph: nx.DiGraph,
+    adaptation_type: str,
+    adapted_nodes: Set[str],
+) -> Dict[str, int]:
+    """Returns the role counts and degree statistics of the adapted neurons
+    that determine the amount of added synapses, in a single pass over the
+    adapted neurons (redundancy) or the edges (population)."""
+    if adaptation_type == "redundancy":
+        return get_redundancy_statistics(
+            snn_graph=snn_graph, adapted_nodes=adapted_nodes
+        )
+    if adaptation_type == "population":
+        return get_population_statistics(
+            snn_graph=snn_graph, adapted_nodes=adapted_nodes
+        )
+    raise NotImplementedError(f"Error, {adaptation_type} not supported.")
+
+
+@typechecked
+def get_redundancy_statistics(
+    *, snn_graph: nx.DiGraph, adapted_nodes: Set[str]
+) -> Dict[str, int]:
+    """Returns the statistics of get_adaptation_statistics for sparse
+    redundancy."""
+    statistics: Dict[str, int] = {
+        "in_edges": 0,
+        "out_edges": 0,
+        "next_round_edges": 0,
+        "non_counters": 0,
+        "counters_with_self_loop": 0,
+        "recurrent_neurons": 0,
+    }
+    for node_name in adapted_nodes:
+        has_self_loop: bool = snn_graph.has_edge(node_name, node_name)
+        statistics["in_edges"] += snn_graph.in_degree(node_name) - int(
+            has_self_loop
+        )
+        statistics["out_edges"] += snn_graph.out_degree(node_name)
+        if node_name[:11] == "next_round_":
+            statistics["next_round_edges"] += sum(
+                1
+                for right in snn_graph.successors(node_name)
+                if right != node_name and right in adapted_nodes
+            )
+        if "counter" not in node_name:
+            statistics["non_counters"] += 1
+        elif has_self_loop:
+            statistics["counters_with_self_loop"] += 1
+        if (
+            (node_name[:11] == "next_round_" and has_self_loop)
+            or (
+                "recur" in snn_graph.nodes[node_name]
+                and "counter" not in node_name
+            )
+            or node_name[:9] == "selector_"
+        ):
+            statistics["recurrent_neurons"] += 1
+    return statistics
+
+
+@typechecked
+def get_population_statistics(
+    *, snn_graph: nx.DiGraph, adapted_nodes: Set[str]
+) -> Dict[str, int]:
+    """Returns the statistics of get_adaptation_statistics for population
+    coding."""
+    statistics: Dict[str, int] = {
+        "self_loops": 0,
+        "edges_from_population": 0,
+        "edges_into_population": 0,
+        "edges_between_populations": 0,
+    }
+    for left, right in snn_graph.edges():
+        if "connector" in right:
+            continue
+        left_is_adapted: bool = left in adapted_nodes
+        right_is_adapted: bool = right in adapted_nodes
+        if left == right:
+            statistics["self_loops"] += int(left_is_adapted)
+        elif left_is_adapted and right_is_adapted:
+            statistics["edges_between_populations"] += 1
+        elif left_is_adapted:
+            statistics["edges_from_population"] += 1
+        elif right_is_adapted:
+            statistics["edges_into_population"] += 1
+    return statistics
+
+
+@typechecked
+def get_nr_of_added_synapses_closed_form(
+    *,
+    adaptation_type: str,
+    redundancy: int,
+    statistics: Dict[str, int],
+) -> int:
+    """Returns the amount of synapses the adaptation adds, given the
+    statistics of get_adaptation_statistics."""
+    if adaptation_type == "redundancy":
+        # Each redundant neuron copies the incoming and outgoing synapses of
+        # its original, and is inhibited by the original and by each lower
+        # redundant neuron, which yields the inhibition lattice.
+        return redundancy * (
+            statistics["in_edges"]
+            + statistics["out_edges"]
+            + statistics["next_round_edges"]
+            + statistics["counters_with_self_loop"]
+            + statistics["recurrent_neurons"]
+        ) + statistics["non_counters"] * (
+            redundancy + redundancy * (redundancy - 1) // 2
+        )
+    if adaptation_type == "population":
+        # Every neuron of the left population connects to every neuron of the
+        # right population, which yields (R+1)^2 synapses per original edge
+        # between two populations.
+        return (
+            redundancy * statistics["self_loops"]
+            + redundancy
+            * (
+                statistics["edges_from_population"]
+                + statistics["edges_into_population"]
+            )
+            + ((redundancy + 1) ** 2 - 1)
+            * statistics["edges_between_populations"]
+        )
+    raise NotImplementedError(f"Error, {adaptation_type} not supported.")
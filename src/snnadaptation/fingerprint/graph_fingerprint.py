@@ -0,0 +1,193 @@
+"""Computes a canonical fingerprint of a SNN graph, that is independent of the
+order in which the neurons and synapses were added, such that adapted graphs
+can be compared with stored snapshots without simulating them."""
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import LIF_neuron, Synapse
+from typeguard import typechecked
+
+from snnadaptation.neuron_roles import get_neuron_role, redundant_prefix
+
+# The digests of a class are summed modulo 2^128, which does not depend on
+# the order of the neurons or synapses.
+digest_modulus: int = 2**128
+
+
+class Graph_fingerprint:
+    """The amount of neurons and synapses, and their combined digest, per
+    neuron class (role and original/redundant) and per synapse class (roles
+    of the endpoints and original/redundant)."""
+
+    @typechecked
+    def __init__(
+        self,
+        neuron_classes: Dict[str, List[int]],
+        synapse_classes: Dict[str, List[int]],
+    ) -> None:
+        # Maps a class to [count, digest].
+        self.neuron_classes: Dict[str, List[int]] = neuron_classes
+        self.synapse_classes: Dict[str, List[int]] = synapse_classes
+
+    @typechecked
+    def get_digest(self) -> str:
+        """Returns the fingerprint of the whole graph as a hex string."""
+        return get_digest(
+            value=(
+                sorted(
+                    (key, tuple(value))
+                    for key, value in self.neuron_classes.items()
+                ),
+                sorted(
+                    (key, tuple(value))
+                    for key, value in self.synapse_classes.items()
+                ),
+            )
+        ).hex()
+
+    @typechecked
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the json serialisable fingerprint."""
+        return {
+            "digest": self.get_digest(),
+            "neuron_classes": {
+                key: [count, f"{digest:032x}"]
+                for key, (count, digest) in sorted(self.neuron_classes.items())
+            },
+            "synapse_classes": {
+                key: [count, f"{digest:032x}"]
+                for key, (count, digest) in sorted(
+                    self.synapse_classes.items()
+                )
+            },
+        }
+
+
+@typechecked
+def fingerprint_from_dict(
+    *, fingerprint_dict: Dict[str, Any]
+) -> Graph_fingerprint:
+    """Returns the fingerprint of a Graph_fingerprint.to_dict dict."""
+    return Graph_fingerprint(
+        neuron_classes={
+            key: [count, int(digest, 16)]
+            for key, (count, digest) in fingerprint_dict[
+                "neuron_classes"
+            ].items()
+        },
+        synapse_classes={
+            key: [count, int(digest, 16)]
+            for key, (count, digest) in fingerprint_dict[
+                "synapse_classes"
+            ].items()
+        },
+    )
+
+
+@typechecked
+def get_graph_fingerprint(*, snn_graph: nx.DiGraph) -> Graph_fingerprint:
+    """Returns the fingerprint of the neuron properties, synapse weights and
+    flags of the graph, in time linear in its size. Graphs with integer node
+    ids are fingerprinted with their node names, so they have the same
+    fingerprint as the graph with node names.
+
+    :param snn_graph: Graph with LIF neurons and synapses.
+    """
+    node_names: Optional[List[str]] = snn_graph.graph.get("node_names")
+    neuron_classes: Dict[str, List[int]] = {}
+    node_classes: Dict[Any, Tuple[str, str]] = {}
+    for node, node_attributes in snn_graph.nodes.items():
+        node_name: str = node if node_names is None else node_names[node]
+        node_classes[node] = (
+            get_neuron_role(node_name=node_name),
+            "redundant" if redundant_prefix.match(node_name) else "original",
+        )
+        add_digest(
+            classes=neuron_classes,
+            key="/".join(node_classes[node]),
+            value=(
+                node_name,
+                [
+                    get_neuron_values(lif_neuron=lif_neuron)
+                    for lif_neuron in node_attributes["nx_lif"]
+                ],
+                repr(node_attributes.get("recur")),
+            ),
+        )
+
+    synapse_classes: Dict[str, List[int]] = {}
+    for left, right, edge_attributes in snn_graph.edges(data=True):
+        synapse: Synapse = edge_attributes["synapse"]
+        is_redundant: bool = bool(edge_attributes.get("is_redundant", False))
+        add_digest(
+            classes=synapse_classes,
+            key=f"{node_classes[left][0]}->{node_classes[right][0]}/"
+            + ("redundant" if is_redundant else "original"),
+            value=(
+                left if node_names is None else node_names[left],
+                right if node_names is None else node_names[right],
+                float(synapse.weight),
+                float(synapse.delay),
+                float(synapse.change_per_t),
+                is_redundant,
+            ),
+        )
+    return Graph_fingerprint(neuron_classes, synapse_classes)
+
+
+@typechecked
+def get_neuron_values(*, lif_neuron: LIF_neuron) -> Tuple[Any, ...]:
+    """Returns the name, properties and position of a LIF neuron."""
+    return (
+        lif_neuron.full_name,
+        float(lif_neuron.bias.get()),
+        float(lif_neuron.du.get()),
+        float(lif_neuron.dv.get()),
+        float(lif_neuron.vth.get()),
+        tuple(float(coordinate) for coordinate in lif_neuron.pos),
+    )
+
+
+@typechecked
+def add_digest(*, classes: Dict[str, List[int]], key: str, value: Any) -> None:
+    """Adds the digest of the value to the count and digest of its class."""
+    count_and_digest: List[int] = classes.setdefault(key, [0, 0])
+    count_and_digest[0] += 1
+    count_and_digest[1] = (
+        count_and_digest[1] + int.from_bytes(get_digest(value=value), "big")
+    ) % digest_modulus
+
+
+@typechecked
+def get_digest(*, value: Any) -> bytes:
+    """Returns the 128 bit digest of the repr of the value. The repr of
+    floats is exact, so any change of a weight changes the digest."""
+    return hashlib.blake2b(repr(value).encode(), digest_size=16).digest()
+
+
+@typechecked
+def get_fingerprint_diff(
+    *, expected: Graph_fingerprint, actual: Graph_fingerprint
+) -> List[str]:
+    """Returns a line per neuron or synapse class whose count or digest
+    differs, or an empty list if the fingerprints are equal."""
+    diff: List[str] = []
+    for kind, expected_classes, actual_classes in [
+        ("neurons", expected.neuron_classes, actual.neuron_classes),
+        ("synapses", expected.synapse_classes, actual.synapse_classes),
+    ]:
+        for key in sorted(set(expected_classes) | set(actual_classes)):
+            expected_count, expected_digest = expected_classes.get(key, [0, 0])
+            actual_count, actual_digest = actual_classes.get(key, [0, 0])
+            if expected_count != actual_count:
+                diff.append(
+                    f"{kind} {key}: {expected_count} expected, "
+                    + f"{actual_count} found"
+                )
+            elif expected_digest != actual_digest:
+                diff.append(
+                    f"{kind} {key}: {actual_count} {kind}, but their "
+                    + "properties or weights changed"
+                )
+    return diff
@@ -0,0 +1,367 @@
+"""Builds an adaptation once at its maximum redundancy, such that the adapted
+graphs of all smaller redundancies are views of the same graph.
+
+The redundant neurons and synapses of redundancy R are those of the maximum
+redundancy whose redundant neurons have a red_level of at most R. Each node
+and edge is tagged with that minimum redundancy. The neuron properties,
+positions and synapse weights that depend on the redundancy, e.g. the
+thresholds of population coding, are stored per redundancy in override
+columns.
+"""
+import copy
+from typing import Any, Dict, Tuple
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import LIF_neuron, Synapse
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.Adaptation_delta import (
+    Adaptation_delta,
+    reverse_index_key,
+)
+from snnadaptation.plan.Adaptation_plan import (
+    Adaptation_plan,
+    Synapse_operation,
+)
+from snnadaptation.plan.apply_adaptation_plan import (
+    apply_adaptation_delta,
+    get_adaptation_delta,
+    get_redundant_neuron_position,
+    get_redundant_neuron_properties,
+    get_synapse_weight,
+    set_neuron_properties,
+)
+from snnadaptation.plan.compile_adaptation_plan import compile_adaptation_plan
+from snnadaptation.plan.group_metadata import get_group_metadata
+from snnadaptation.population.create_population_synapses import (
+    get_population_weight_scale,
+)
+
+min_red_level_key = "min_red_level"
+
+
+class Nested_adaptation:
+    """The adapted graph of the maximum redundancy, with its nodes and edges
+    tagged with their min_red_level, and the values that differ per
+    redundancy."""
+
+    # pylint: disable=R0903
+    @typechecked
+    def __init__(
+        self,
+        adaptation: Adaptation,
+        max_graph: nx.DiGraph,
+        neuron_overrides: Dict[int, Dict[str, Dict[str, Any]]],
+        synapse_overrides: Dict[int, Dict[Tuple[str, str], float]],
+    ) -> None:
+        self.adaptation: Adaptation = adaptation
+        self.max_redundancy: int = adaptation.redundancy
+        self.max_graph: nx.DiGraph = max_graph
+        # Maps a redundancy to the nodes whose bias, du, dv, vth or pos
+        # differ from those in the max_graph.
+        self.neuron_overrides: Dict[
+            int, Dict[str, Dict[str, Any]]
+        ] = neuron_overrides
+        # Maps a redundancy to the edges whose weight differs from the weight
+        # in the max_graph.
+        self.synapse_overrides: Dict[
+            int, Dict[Tuple[str, str], float]
+        ] = synapse_overrides
+
+    @typechecked
+    def get_view(self, redundancy: int) -> nx.DiGraph:
+        """Returns a read-only view of the max_graph, with the nodes and edges
+        of the redundancy. The view shares the neurons and synapses of the
+        max_graph, so the values that depend on the redundancy are those of
+        the maximum redundancy, see neuron_overrides and synapse_overrides,
+        or use get_adapted_graph."""
+        self.verify_redundancy(redundancy=redundancy)
+        return nx.subgraph_view(
+            self.max_graph,
+            filter_node=lambda node_name: self.max_graph.nodes[node_name][
+                min_red_level_key
+            ]
+            <= redundancy,
+            filter_edge=lambda left, right: self.max_graph.edges[left, right][
+                min_red_level_key
+            ]
+            <= redundancy,
+        )
+
+    @typechecked
+    def get_adapted_graph(self, redundancy: int) -> nx.DiGraph:
+        """Returns a copy of the view of the redundancy, with the neuron
+        properties and synapse weights of the redundancy. It equals the graph
+        that the adaptation with this redundancy creates."""
+        view: nx.DiGraph = self.get_view(redundancy)
+        neuron_overrides = self.neuron_overrides.get(redundancy, {})
+        synapse_overrides = self.synapse_overrides.get(redundancy, {})
+        adapted_graph = nx.DiGraph()
+        adapted_graph.graph.update(copy.deepcopy(view.graph))
+        adapted_graph.graph["red_level"] = redundancy
+        adapted_graph.graph[reverse_index_key][-1] = get_view_reverse_index(
+            view=view,
+            max_reverse_index=view.graph[reverse_index_key][-1],
+        )
+        (
+            adapted_graph.graph["neuron_ids"],
+            adapted_graph.graph["neuron_groups"],
+        ) = get_group_metadata(
+            original_node_names=[
+                node_name
+                for node_name, min_red_level in view.nodes(
+                    data=min_red_level_key
+                )
+                if min_red_level == 0
+            ],
+            added_node_names=[
+                node_name
+                for node_name, min_red_level in view.nodes(
+                    data=min_red_level_key
+                )
+                if min_red_level > 0
+            ],
+        )
+
+        for node_name, node_attributes in view.nodes.items():
+            adapted_graph.add_node(
+                node_name,
+                **{
+                    key: copy.deepcopy(value)
+                    for key, value in node_attributes.items()
+                    if key != min_red_level_key
+                },
+            )
+            if node_name in neuron_overrides:
+                set_neuron_values(
+                    lif_neuron=adapted_graph.nodes[node_name]["nx_lif"][0],
+                    neuron_values=neuron_overrides[node_name],
+                )
+        for left, right, edge_attributes in view.edges(data=True):
+            adapted_graph.add_edge(
+                left,
+                right,
+                **{
+                    key: copy.deepcopy(value)
+                    for key, value in edge_attributes.items()
+                    if key != min_red_level_key
+                },
+            )
+            if (left, right) in synapse_overrides:
+                adapted_graph.edges[left, right]["synapse"] = Synapse(
+                    weight=synapse_overrides[(left, right)],
+                    delay=0,
+                    change_per_t=0,
+                )
+        return adapted_graph
+
+    @typechecked
+    def verify_redundancy(self, redundancy: int) -> None:
+        """Raises an error if the redundancy is not in 1..max_redundancy."""
+        if not 1 <= redundancy <= self.max_redundancy:
+            raise ValueError(
+                f"Error, redundancy:{redundancy} is not in range 1 to "
+                + f"{self.max_redundancy}."
+            )
+
+
+@typechecked
+def get_view_reverse_index(
+    *, view: nx.DiGraph, max_reverse_index: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Returns the reverse index of the adaptation with the redundancy of the
+    view. It has the added neurons and synapses of the view, and the original
+    values of the maximum redundancy, as those do not depend on the
+    redundancy."""
+    reverse_index: Dict[str, Any] = copy.deepcopy(max_reverse_index)
+    reverse_index["added_neurons"] = [
+        node_name
+        for node_name in max_reverse_index["added_neurons"]
+        if node_name in view
+    ]
+    reverse_index["added_synapses"] = [
+        [left, right]
+        for left, right in max_reverse_index["added_synapses"]
+        if view.has_edge(left, right)
+    ]
+    return reverse_index
+
+
+@typechecked
+def build_nested_adaptation(
+    *,
+    snn_graph: nx.DiGraph,
+    adaptation: Adaptation,
+    plot_config: Plot_config,
+) -> Nested_adaptation:
+    """Adapts the graph once with the redundancy of the adaptation, and
+    returns it with the tags and override columns of all smaller
+    redundancies. The snn_graph is not changed.
+
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    :param adaptation: The adaptation with the maximum redundancy.
+    """
+    if adaptation.next_stages:
+        raise NotImplementedError(
+            "Error, adaptations with next stages can not be nested."
+        )
+    if adaptation.selection is not None and (
+        adaptation.selection.max_neurons is not None
+        or adaptation.selection.max_synapses is not None
+    ):
+        # The neurons that fit within a budget depend on the redundancy.
+        raise ValueError("Error, a selection with a budget can not be nested.")
+    plan: Adaptation_plan = compile_adaptation_plan(
+        snn_graph=snn_graph, adaptation=adaptation
+    )
+    delta: Adaptation_delta = get_adaptation_delta(
+        snn_graph=snn_graph, plan=plan, plot_config=plot_config
+    )
+    max_graph: nx.DiGraph = apply_adaptation_delta(
+        adaptation_graph=copy.deepcopy(snn_graph), delta=delta
+    )
+
+    for node_name in max_graph.nodes:
+        max_graph.nodes[node_name][min_red_level_key] = 0
+    for neuron_operation in plan.neuron_operations.values():
+        max_graph.nodes[neuron_operation.name][
+            min_red_level_key
+        ] = neuron_operation.red_level
+    for left, right in max_graph.edges:
+        max_graph.edges[left, right][min_red_level_key] = max(
+            max_graph.nodes[left][min_red_level_key],
+            max_graph.nodes[right][min_red_level_key],
+        )
+
+    neuron_overrides: Dict[int, Dict[str, Dict[str, Any]]] = {}
+    synapse_overrides: Dict[int, Dict[Tuple[str, str], float]] = {}
+    for redundancy in range(1, adaptation.redundancy):
+        neuron_overrides[redundancy] = get_neuron_overrides(
+            snn_graph=snn_graph,
+            max_graph=max_graph,
+            plan=plan,
+            plot_config=plot_config,
+            redundancy=redundancy,
+        )
+        synapse_overrides[redundancy] = get_synapse_overrides(
+            snn_graph=snn_graph,
+            max_graph=max_graph,
+            plan=plan,
+            redundancy=redundancy,
+        )
+    return Nested_adaptation(
+        adaptation, max_graph, neuron_overrides, synapse_overrides
+    )
+
+
+@typechecked
+def get_neuron_overrides(
+    *,
+    snn_graph: nx.DiGraph,
+    max_graph: nx.DiGraph,
+    plan: Adaptation_plan,
+    plot_config: Plot_config,
+    redundancy: int,
+) -> Dict[str, Dict[str, Any]]:
+    """Returns the values of the neurons of the redundancy that differ from
+    those in the max_graph."""
+    neuron_values: Dict[str, Dict[str, Any]] = {}
+    for neuron_operation in plan.neuron_operations.values():
+        if neuron_operation.red_level > redundancy:
+            continue
+        ori_lif: LIF_neuron = snn_graph.nodes[neuron_operation.node_name][
+            "nx_lif"
+        ][0]
+        neuron_values[neuron_operation.name] = dict(
+            get_redundant_neuron_properties(
+                adaptation_type=plan.adaptation_type,
+                snn_graph=snn_graph,
+                node_name=neuron_operation.node_name,
+                red_level=neuron_operation.red_level,
+                redundancy=redundancy,
+            ),
+            pos=get_redundant_neuron_position(
+                ori_lif=ori_lif,
+                plot_config=plot_config,
+                red_level=neuron_operation.red_level,
+                max_redundancy=redundancy,
+            ),
+        )
+    for node_name in plan.overridden_neurons:
+        neuron_values[node_name] = get_redundant_neuron_properties(
+            adaptation_type=plan.adaptation_type,
+            snn_graph=snn_graph,
+            node_name=node_name,
+            red_level=1,
+            redundancy=redundancy,
+        )
+
+    neuron_overrides: Dict[str, Dict[str, Any]] = {}
+    for node_name, values in neuron_values.items():
+        max_lif: LIF_neuron = max_graph.nodes[node_name]["nx_lif"][0]
+        max_values: Dict[str, Any] = {
+            "bias": max_lif.bias.get(),
+            "du": max_lif.du.get(),
+            "dv": max_lif.dv.get(),
+            "vth": max_lif.vth.get(),
+            "pos": max_lif.pos,
+        }
+        if any(values[key] != max_values[key] for key in values):
+            neuron_overrides[node_name] = values
+    return neuron_overrides
+
+
+@typechecked
+def get_synapse_overrides(
+    *,
+    snn_graph: nx.DiGraph,
+    max_graph: nx.DiGraph,
+    plan: Adaptation_plan,
+    redundancy: int,
+) -> Dict[Tuple[str, str], float]:
+    """Returns the weights of the synapses of the redundancy that differ from
+    those in the max_graph. Only the population coding weights that are
+    scaled, because a part of the neurons is selected, depend on the
+    redundancy."""
+    synapse_overrides: Dict[Tuple[str, str], float] = {}
+    for edge, synapse_operation in plan.synapse_operations.items():
+        if (
+            synapse_operation.weight_scale == 1
+            or synapse_operation.weight_edge is None
+            or max_graph.edges[edge][min_red_level_key] > redundancy
+        ):
+            continue
+        weight: float = get_synapse_weight(
+            snn_graph=snn_graph,
+            synapse_operation=Synapse_operation(
+                synapse_operation.left,
+                synapse_operation.right,
+                weight_edge=synapse_operation.weight_edge,
+                is_redundant=synapse_operation.is_redundant,
+                weight_scale=get_population_weight_scale(
+                    plan=plan,
+                    original_edge=synapse_operation.weight_edge,
+                    redundancy=redundancy,
+                ),
+            ),
+        )
+        if weight != max_graph.edges[edge]["synapse"].weight:
+            synapse_overrides[edge] = weight
+    return synapse_overrides
+
+
+@typechecked
+def set_neuron_values(
+    *, lif_neuron: LIF_neuron, neuron_values: Dict[str, Any]
+) -> None:
+    """Sets the bias, du, dv, vth and optionally the pos of a LIF neuron."""
+    set_neuron_properties(
+        lif_neuron=lif_neuron,
+        neuron_properties={
+            key: neuron_values[key] for key in ["bias", "du", "dv", "vth"]
+        },
+    )
+    if "pos" in neuron_values:
+        lif_neuron.pos = neuron_values["pos"]
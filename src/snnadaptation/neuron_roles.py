@@ -0,0 +1,51 @@
+"""Identifies the role of a neuron of the MDSA SNN, from its node name."""
+import re
+from typing import List
+
+from typeguard import typechecked
+
+neuron_roles: List[str] = [
+    "spike_once",
+    "rand",
+    "degree_receiver",
+    "selector",
+    "counter",
+    "next_round",
+    "terminator",
+    "connector",
+]
+# Redundant neurons of later adaptation stages are prefixed with s<stage>_.
+redundant_prefix = re.compile(r"^(?:s\d+_)?r_(\d+)_")
+
+
+@typechecked
+def get_redundant_node_name(
+    *, node_name: str, red_level: int, stage: int = 0
+) -> str:
+    """Returns the name of redundant neuron red_level of a neuron, e.g.
+    r_2_selector_0_1, or s1_r_2_selector_0_1 for adaptation stage 1."""
+    if stage == 0:
+        return f"r_{red_level}_{node_name}"
+    return f"s{stage}_r_{red_level}_{node_name}"
+
+
+@typechecked
+def get_original_node_name(*, node_name: str) -> str:
+    """Returns the name of the original neuron of a redundant neuron, e.g.
+    selector_0_1 for r_2_selector_0_1 or s1_r_1_r_2_selector_0_1."""
+    while redundant_prefix.match(node_name):
+        node_name = redundant_prefix.sub("", node_name, count=1)
+    return node_name
+
+
+@typechecked
+def get_neuron_role(*, node_name: str) -> str:
+    """Returns the role of an original or redundant neuron, e.g. selector for
+    r_2_selector_0_1, or unknown if the neuron has no MDSA role."""
+    original_node_name = get_original_node_name(node_name=node_name)
+    for role in neuron_roles:
+        if original_node_name == role or original_node_name.startswith(
+            f"{role}_"
+        ):
+            return role
+    return "unknown"
@@ -0,0 +1,346 @@
+"""Stores a SNN graph in an SQLite database, such that it can be read and
+written in bounded-size chunks instead of as a single networkx object."""
+import json
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import Identifier, LIF_neuron, Synapse
+from typeguard import typechecked
+
+schema: List[str] = [
+    """CREATE TABLE IF NOT EXISTS neurons (
+        id INTEGER PRIMARY KEY,
+        node_name TEXT NOT NULL UNIQUE,
+        lif_name TEXT NOT NULL,
+        bias REAL NOT NULL,
+        du REAL NOT NULL,
+        dv REAL NOT NULL,
+        vth REAL NOT NULL,
+        x REAL,
+        y REAL,
+        identifiers TEXT,
+        recur REAL
+    )""",
+    """CREATE TABLE IF NOT EXISTS synapses (
+        id INTEGER PRIMARY KEY,
+        pre TEXT NOT NULL,
+        post TEXT NOT NULL,
+        weight REAL NOT NULL,
+        delay INTEGER NOT NULL,
+        change_per_t INTEGER NOT NULL,
+        is_redundant INTEGER,
+        UNIQUE(pre, post)
+    )""",
+    "CREATE INDEX IF NOT EXISTS synapses_post ON synapses(post)",
+    """CREATE TABLE IF NOT EXISTS graph_attributes (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )""",
+]
+neuron_columns: str = (
+    "node_name, lif_name, bias, du, dv, vth, x, y, identifiers, recur"
+)
+
+
+class Sqlite_graph_store:
+    """SNN graph in an SQLite database. The neurons and synapses are kept in
+    insertion order, such that reading the store back into networkx yields
+    the same node and edge order."""
+
+    @typechecked
+    def __init__(
+        self,
+        store_path: str,
+    ) -> None:
+        self.store_path: str = store_path
+        self.connection: sqlite3.Connection = sqlite3.connect(store_path)
+        for statement in schema:
+            self.connection.execute(statement)
+        self.connection.commit()
+
+    @typechecked
+    def close(self) -> None:
+        """Commits the pending changes and closes the database."""
+        self.connection.commit()
+        self.connection.close()
+
+    @typechecked
+    def get_node_names(self) -> Iterator[str]:
+        """Yields the node names, in insertion order."""
+        for (node_name,) in self.connection.execute(
+            "SELECT node_name FROM neurons ORDER BY id"
+        ):
+            yield node_name
+
+    @typechecked
+    def get_neuron(self, node_name: str) -> LIF_neuron:
+        """Returns the LIF neuron of a node."""
+        row = self.connection.execute(
+            f"SELECT {neuron_columns} FROM neurons WHERE node_name = ?",
+            (node_name,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Error, {node_name} is not in the store.")
+        return neuron_from_row(row=row)
+
+    @typechecked
+    def get_recurrent_nodes(self) -> Set[str]:
+        """Returns the nodes that have a recur attribute."""
+        return {
+            node_name
+            for (node_name,) in self.connection.execute(
+                "SELECT node_name FROM neurons WHERE recur IS NOT NULL"
+            )
+        }
+
+    @typechecked
+    def get_recur(self, node_name: str) -> float:
+        """Returns the recur attribute of a node."""
+        return self.connection.execute(
+            "SELECT recur FROM neurons WHERE node_name = ?", (node_name,)
+        ).fetchone()[0]
+
+    @typechecked
+    def get_edges(self) -> Iterator[Tuple[str, str]]:
+        """Yields the edges in the order of networkx: per node in insertion
+        order, the outgoing edges in insertion order."""
+        for pre, post in self.connection.execute(
+            """SELECT synapses.pre, synapses.post FROM synapses
+            JOIN neurons ON neurons.node_name = synapses.pre
+            ORDER BY neurons.id, synapses.id"""
+        ):
+            yield (pre, post)
+
+    @typechecked
+    def get_input_edges(self, node_name: str) -> List[Tuple[str, str]]:
+        """Returns the incoming edges of a node, in the order of networkx."""
+        return list(
+            self.connection.execute(
+                """SELECT synapses.pre, synapses.post FROM synapses
+                JOIN neurons ON neurons.node_name = synapses.pre
+                WHERE synapses.post = ? ORDER BY neurons.id, synapses.id""",
+                (node_name,),
+            )
+        )
+
+    @typechecked
+    def get_output_edges(self, node_name: str) -> List[Tuple[str, str]]:
+        """Returns the outgoing edges of a node, in insertion order."""
+        return list(
+            self.connection.execute(
+                "SELECT pre, post FROM synapses WHERE pre = ? ORDER BY id",
+                (node_name,),
+            )
+        )
+
+    @typechecked
+    def get_weight(self, edge: Tuple[str, str]) -> float:
+        """Returns the synapse weight of an edge."""
+        row = self.connection.execute(
+            "SELECT weight FROM synapses WHERE pre = ? AND post = ?", edge
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Error, {edge} is not in the store.")
+        return row[0]
+
+    @typechecked
+    def get_graph_attributes(self) -> Dict[str, Any]:
+        """Returns the (json serialisable) graph attributes."""
+        return {
+            key: json.loads(value)
+            for key, value in self.connection.execute(
+                "SELECT key, value FROM graph_attributes"
+            )
+        }
+
+    @typechecked
+    def set_graph_attribute(self, key: str, value: Any) -> None:
+        """Stores a json serialisable graph attribute."""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO graph_attributes VALUES (?, ?)",
+            (key, json.dumps(value)),
+        )
+
+
+@typechecked
+def neuron_to_row(
+    *, node_name: str, lif_neuron: LIF_neuron, recur: Optional[float]
+) -> Tuple[Any, ...]:
+    """Returns the neurons table row of a LIF neuron."""
+    identifiers: Optional[str] = None
+    if lif_neuron.identifiers is not None:
+        identifiers = json.dumps(
+            [
+                [identifier.description, identifier.position, identifier.value]
+                for identifier in lif_neuron.identifiers
+            ]
+        )
+    x: Optional[float] = None
+    y: Optional[float] = None
+    if lif_neuron.pos is not None:
+        x, y = lif_neuron.pos
+    return (
+        node_name,
+        lif_neuron.name,
+        lif_neuron.bias.get(),
+        lif_neuron.du.get(),
+        lif_neuron.dv.get(),
+        lif_neuron.vth.get(),
+        x,
+        y,
+        identifiers,
+        recur,
+    )
+
+
+@typechecked
+def neuron_from_row(*, row: Tuple[Any, ...]) -> LIF_neuron:
+    """Returns the LIF neuron of a neurons table row."""
+    identifiers: Optional[List[Identifier]] = None
+    if row[8] is not None:
+        identifiers = [
+            Identifier(description=description, position=position, value=value)
+            for description, position, value in json.loads(row[8])
+        ]
+    pos: Optional[Tuple[float, float]] = None
+    if row[6] is not None:
+        pos = (row[6], row[7])
+    return LIF_neuron(
+        name=row[1],
+        bias=row[2],
+        du=row[3],
+        dv=row[4],
+        vth=row[5],
+        pos=pos,
+        identifiers=identifiers,
+    )
+
+
+@typechecked
+def write_graph_to_store(
+    *,
+    snn_graph: nx.DiGraph,
+    store_path: str,
+    chunk_size: int = 10000,
+) -> None:
+    """Writes the neurons, synapses and json serialisable graph attributes of
+    a SNN graph into an SQLite store, in chunks of chunk_size rows.
+
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    :param store_path: Path of the SQLite database that is created.
+    """
+    store = Sqlite_graph_store(store_path)
+    rows: List[Tuple[Any, ...]] = []
+    for node_name, node_attributes in snn_graph.nodes.items():
+        rows.append(
+            neuron_to_row(
+                node_name=node_name,
+                lif_neuron=node_attributes["nx_lif"][0],
+                recur=node_attributes.get("recur"),
+            )
+        )
+        if len(rows) >= chunk_size:
+            insert_neuron_rows(store=store, rows=rows)
+    insert_neuron_rows(store=store, rows=rows)
+
+    for pre, post, edge_attributes in snn_graph.edges(data=True):
+        synapse: Synapse = edge_attributes["synapse"]
+        rows.append(
+            (
+                pre,
+                post,
+                synapse.weight,
+                synapse.delay,
+                synapse.change_per_t,
+                edge_attributes.get("is_redundant"),
+            )
+        )
+        if len(rows) >= chunk_size:
+            insert_synapse_rows(store=store, rows=rows)
+    insert_synapse_rows(store=store, rows=rows)
+
+    for key, value in snn_graph.graph.items():
+        try:
+            store.set_graph_attribute(key, value)
+        except TypeError:
+            # Only json serialisable graph attributes are stored.
+            pass
+    store.close()
+
+
+@typechecked
+def read_graph_from_store(*, store_path: str) -> nx.DiGraph:
+    """Returns the SNN graph of an SQLite store as networkx graph. This loads
+    the whole graph into memory.
+
+    :param store_path: Path of the SQLite database.
+    """
+    store = Sqlite_graph_store(store_path)
+    snn_graph = nx.DiGraph()
+    snn_graph.graph.update(store.get_graph_attributes())
+    for row in store.connection.execute(
+        f"SELECT {neuron_columns} FROM neurons ORDER BY id"
+    ):
+        snn_graph.add_node(row[0], nx_lif=[neuron_from_row(row=row)])
+        if row[9] is not None:
+            snn_graph.nodes[row[0]]["recur"] = row[9]
+    for (
+        pre,
+        post,
+        weight,
+        delay,
+        change_per_t,
+        is_redundant,
+    ) in store.connection.execute(
+        """SELECT pre, post, weight, delay, change_per_t, is_redundant
+            FROM synapses ORDER BY id"""
+    ):
+        snn_graph.add_edge(
+            pre,
+            post,
+            synapse=Synapse(
+                weight=weight, delay=delay, change_per_t=change_per_t
+            ),
+        )
+        if is_redundant is not None:
+            snn_graph.edges[pre, post]["is_redundant"] = bool(is_redundant)
+    store.close()
+    return snn_graph
+
+
+@typechecked
+def insert_neuron_rows(
+    *, store: Sqlite_graph_store, rows: List[Tuple[Any, ...]]
+) -> None:
+    """Writes a chunk of neuron rows and empties the chunk."""
+    store.connection.executemany(
+        f"INSERT INTO neurons ({neuron_columns}) VALUES "
+        + "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    store.connection.commit()
+    rows.clear()
+
+
+@typechecked
+def insert_synapse_rows(
+    *, store: Sqlite_graph_store, rows: List[Tuple[Any, ...]]
+) -> None:
+    """Writes a chunk of synapse rows and empties the chunk. Writing an
+    existing synapse overwrites its weight, and keeps its is_redundant flag
+    if the new row has no flag, similar to adding an existing edge in
+    networkx."""
+    store.connection.executemany(
+        """INSERT INTO synapses
+        (pre, post, weight, delay, change_per_t, is_redundant)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(pre, post) DO UPDATE SET
+        weight = excluded.weight,
+        delay = excluded.delay,
+        change_per_t = excluded.change_per_t,
+        is_redundant = coalesce(excluded.is_redundant, is_redundant)""",
+        rows,
+    )
+    store.connection.commit()
+    rows.clear()
@@ -0,0 +1,277 @@
+"""Applies an adaptation to a SNN graph in an SQLite store, and writes the
+adapted graph into another SQLite store in bounded-size chunks, such that the
+adapted graph never has to fit in memory."""
+import os
+from typing import Any, List, Optional, Set, Tuple
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.out_of_core.Sqlite_graph_store import (
+    Sqlite_graph_store,
+    insert_neuron_rows,
+    insert_synapse_rows,
+    neuron_to_row,
+)
+from snnadaptation.plan.Adaptation_plan import (
+    Neuron_operation,
+    Operation_sink,
+    Synapse_operation,
+)
+from snnadaptation.plan.apply_adaptation_plan import (
+    create_redundant_neuron,
+    get_redundant_neuron_properties,
+)
+from snnadaptation.population.apply_population_coding import (
+    add_population_coding_operations,
+)
+from snnadaptation.redundancy.apply_sparse_redundancy import (
+    add_sparse_redundancy_operations,
+)
+from snnadaptation.selection.select_neurons import is_adaptable, select_neurons
+
+
+class Sqlite_operation_writer(Operation_sink):
+    """Writes the operations of an adaptation directly into an SQLite store,
+    in chunks of at most chunk_size rows. Neuron properties and synapse
+    weights are read from the input store."""
+
+    # pylint: disable=R0902,R0913
+    @typechecked
+    def __init__(
+        self,
+        adaptation_type: str,
+        redundancy: int,
+        input_store: Sqlite_graph_store,
+        output_store: Sqlite_graph_store,
+        plot_config: Plot_config,
+        chunk_size: int,
+    ) -> None:
+        super().__init__(
+            adaptation_type, redundancy, input_store.get_recurrent_nodes()
+        )
+        self.input_store: Sqlite_graph_store = input_store
+        self.output_store: Sqlite_graph_store = output_store
+        self.plot_config: Plot_config = plot_config
+        self.chunk_size: int = chunk_size
+        self.neuron_rows: List[Tuple[Any, ...]] = []
+        self.synapse_rows: List[Tuple[Any, ...]] = []
+        # Single node graph of the original neuron of the last added neuron.
+        self.neuron_graph: nx.DiGraph = nx.DiGraph()
+        # The original and written redundant neurons, such that has_neuron
+        # does not flush the buffer and query the output store per synapse.
+        self.neuron_names: Set[str] = set(input_store.get_node_names())
+
+    # pylint: disable=W0613
+    @typechecked
+    def add_projection(self, edge: Tuple[str, str]) -> None:
+        """Ignores the fully connected populations of an edge."""
+        # The output store has no group metadata, so the projections are not
+        # kept, which would grow with the graph.
+        return
+
+    @typechecked
+    def add_neuron(self, node_name: str, red_level: int) -> None:
+        """Buffers the row of a redundant neuron of an original neuron."""
+        if node_name not in self.neuron_graph:
+            self.neuron_graph = nx.DiGraph()
+            self.neuron_graph.add_node(
+                node_name, nx_lif=[self.input_store.get_neuron(node_name)]
+            )
+        lif_neuron = create_redundant_neuron(
+            adaptation_graph=self.neuron_graph,
+            neuron_operation=Neuron_operation(node_name, red_level),
+            plan=self,
+            plot_config=self.plot_config,
+        )
+        self.neuron_names.add(lif_neuron.full_name)
+        self.neuron_rows.append(
+            neuron_to_row(
+                node_name=lif_neuron.full_name,
+                lif_neuron=lif_neuron,
+                recur=None,
+            )
+        )
+        if len(self.neuron_rows) >= self.chunk_size:
+            insert_neuron_rows(store=self.output_store, rows=self.neuron_rows)
+
+    @typechecked
+    def add_synapse(self, synapse_operation: Synapse_operation) -> None:
+        """Buffers the row of a synapse, with its weight from the input
+        store."""
+        if synapse_operation.weight_edge is not None:
+            weight = self.input_store.get_weight(synapse_operation.weight_edge)
+            if synapse_operation.weight_scale != 1:
+                weight = weight * synapse_operation.weight_scale
+        elif synapse_operation.weight_recur is not None:
+            weight = self.input_store.get_recur(synapse_operation.weight_recur)
+        else:
+            weight = synapse_operation.weight
+        is_redundant: Optional[bool] = None
+        if synapse_operation.is_redundant:
+            is_redundant = True
+        self.synapse_rows.append(
+            (
+                synapse_operation.left,
+                synapse_operation.right,
+                weight,
+                0,
+                0,
+                is_redundant,
+            )
+        )
+        if len(self.synapse_rows) >= self.chunk_size:
+            self.flush()
+
+    @typechecked
+    def add_overridden_neuron(self, node_name: str) -> None:
+        """Overwrites the properties of an original neuron in the output
+        store with those of its redundant neurons."""
+        # The overridden properties are computed from the input store, so the
+        # redundant neurons are not affected by the override.
+        self.flush()
+        neuron_graph = nx.DiGraph()
+        neuron_graph.add_node(
+            node_name, nx_lif=[self.input_store.get_neuron(node_name)]
+        )
+        red_neuron_props = get_redundant_neuron_properties(
+            adaptation_type=self.adaptation_type,
+            snn_graph=neuron_graph,
+            node_name=node_name,
+            red_level=1,
+            redundancy=self.redundancy,
+        )
+        self.output_store.connection.execute(
+            """UPDATE neurons SET bias = ?, du = ?, dv = ?, vth = ?
+            WHERE node_name = ?""",
+            (
+                red_neuron_props["bias"],
+                red_neuron_props["du"],
+                red_neuron_props["dv"],
+                red_neuron_props["vth"],
+                node_name,
+            ),
+        )
+
+    @typechecked
+    def has_neuron(self, node_name: str) -> bool:
+        """Returns True if the node is an original or a written redundant
+        neuron."""
+        return node_name in self.neuron_names
+
+    @typechecked
+    def flush(self) -> None:
+        """Writes the buffered neurons and synapses into the output store."""
+        insert_neuron_rows(store=self.output_store, rows=self.neuron_rows)
+        insert_synapse_rows(store=self.output_store, rows=self.synapse_rows)
+
+
+@typechecked
+def adapt_out_of_core(
+    *,
+    input_store_path: str,
+    output_store_path: str,
+    adaptation: Adaptation,
+    plot_config: Plot_config,
+    chunk_size: int = 10000,
+) -> None:
+    """Applies the adaptation to the graph in the input store, and writes the
+    adapted graph into a new output store. At most chunk_size neurons and
+    synapses are kept in memory.
+
+    If the adaptation has a selection, the topology of the input graph (node
+    names and edges, without neuron properties) is loaded to select the
+    neurons.
+
+    :param input_store_path: SQLite store with the original graph.
+    :param output_store_path: Path of the SQLite store that is created for
+    the adapted graph.
+    :param adaptation: The adaptation that is applied.
+    :param chunk_size: The maximum amount of rows that is written at once.
+    """
+    if os.path.exists(output_store_path):
+        raise FileExistsError(f"Error, {output_store_path} already exists.")
+    if chunk_size < 1:
+        raise ValueError("Error, chunk_size must be 1 or larger.")
+    if adaptation.next_stages:
+        raise NotImplementedError(
+            "Error, adaptation stages are not supported out-of-core."
+        )
+
+    input_store = Sqlite_graph_store(input_store_path)
+    output_store = Sqlite_graph_store(output_store_path)
+
+    # Copy the original graph into the output store within SQLite.
+    output_store.connection.execute(
+        "ATTACH DATABASE ? AS input_store", (input_store_path,)
+    )
+    for table in ["neurons", "synapses", "graph_attributes"]:
+        output_store.connection.execute(
+            f"INSERT INTO {table} SELECT * FROM input_store.{table}"
+        )
+    output_store.connection.commit()
+    output_store.connection.execute("DETACH DATABASE input_store")
+    output_store.set_graph_attribute("red_level", adaptation.redundancy)
+
+    writer = Sqlite_operation_writer(
+        adaptation.adaptation_type,
+        adaptation.redundancy,
+        input_store,
+        output_store,
+        plot_config,
+        chunk_size,
+    )
+    adapted_nodes: List[str] = get_adapted_nodes(
+        input_store=input_store, adaptation=adaptation
+    )
+    if adaptation.adaptation_type == "redundancy":
+        add_sparse_redundancy_operations(
+            plan=writer,
+            adapted_nodes=adapted_nodes,
+            get_input_edges=input_store.get_input_edges,
+            get_output_edges=input_store.get_output_edges,
+        )
+    elif adaptation.adaptation_type == "population":
+        add_population_coding_operations(
+            plan=writer,
+            adapted_nodes=adapted_nodes,
+            original_edges=input_store.get_edges(),
+        )
+    else:
+        raise NotImplementedError(
+            f"Error, {adaptation.adaptation_type} not supported."
+        )
+    writer.flush()
+    input_store.close()
+    output_store.close()
+
+
+@typechecked
+def get_adapted_nodes(
+    *, input_store: Sqlite_graph_store, adaptation: Adaptation
+) -> List[str]:
+    """Returns the original nodes that get redundant neurons, in insertion
+    order."""
+    selected_nodes: Optional[Set[str]] = None
+    if adaptation.selection is not None:
+        topology = nx.DiGraph()
+        topology.add_nodes_from(input_store.get_node_names())
+        for node_name in input_store.get_recurrent_nodes():
+            topology.nodes[node_name]["recur"] = True
+        topology.add_edges_from(input_store.get_edges())
+        selected_nodes = select_neurons(
+            snn_graph=topology,
+            adaptation_type=adaptation.adaptation_type,
+            redundancy=adaptation.redundancy,
+            selection=adaptation.selection,
+        )
+    return [
+        node_name
+        for node_name in input_store.get_node_names()
+        if is_adaptable(
+            node_name=node_name, adaptation_type=adaptation.adaptation_type
+        )
+        and (selected_nodes is None or node_name in selected_nodes)
+    ]
@@ -0,0 +1,40 @@
+"""Creates several adaptations of one shared base graph concurrently."""
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+
+
+@typechecked
+def adapt_concurrently(
+    *,
+    snn_graph: nx.DiGraph,
+    adaptations: List[Adaptation],
+    plot_config: Plot_config,
+    max_workers: Optional[int] = None,
+) -> List[nx.DiGraph]:
+    """Returns the adapted graphs of the adaptations, in the order of the
+    adaptations, created by a pool of threads. The engines only read the
+    snn_graph, so all threads share it, and it is not changed.
+
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    :param adaptations: The adaptations that are applied to the snn_graph.
+    :param max_workers: The maximum amount of threads, see
+    ThreadPoolExecutor.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(
+                lambda adaptation: apply_fused_adaptation(
+                    adaptation_graph=snn_graph,
+                    adaptation=adaptation,
+                    plot_config=plot_config,
+                ),
+                adaptations,
+            )
+        )
@@ -0,0 +1,113 @@
+"""Adapts a sequence of graphs ahead of their simulation, such that the
+adaptation of the next graphs overlaps with the simulation of the current
+one."""
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Deque, Iterable, Iterator, Tuple
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+
+
+@typechecked
+def adapt_pipelined(
+    *,
+    graph_adaptations: Iterable[Tuple[nx.DiGraph, Adaptation]],
+    plot_config: Plot_config,
+    prefetch: int = 2,
+    use_processes: bool = True,
+) -> Iterator[nx.DiGraph]:
+    """Yields the adapted graph of each (graph, adaptation) pair, in order.
+    While the caller simulates an adapted graph, the next prefetch pairs are
+    adapted by background workers, e.g.:
+
+    for adapted_graph in adapt_pipelined(
+        graph_adaptations=..., plot_config=...
+    ):
+        simulate(adapted_graph)
+
+    At most prefetch adaptations are pending at any time, and
+    graph_adaptations is consumed lazily, so at most prefetch + 1 adapted
+    graphs are in memory. If the caller stops early, the pending
+    adaptations that have not started are cancelled.
+
+    :param graph_adaptations: The graphs, each with the adaptation that is
+    applied to it.
+    :param prefetch: The amount of graphs that is adapted ahead, which is
+    also the amount of workers.
+    :param use_processes: If True, the workers are processes, such that
+    the adaptations run in parallel with a simulation that holds the GIL.
+    The adapted graphs are then pickled to the caller. Else the workers are
+    threads.
+    """
+    if prefetch < 1:
+        raise ValueError(
+            f"Error, prefetch should be at least 1, it is:{prefetch}."
+        )
+    executor: Executor
+    if use_processes:
+        executor = ProcessPoolExecutor(max_workers=prefetch)
+    else:
+        executor = ThreadPoolExecutor(max_workers=prefetch)
+    graph_adaptation_iterator: Iterator[Tuple[nx.DiGraph, Adaptation]] = iter(
+        graph_adaptations
+    )
+    pending: Deque[Future] = deque()
+    with executor:
+        try:
+            submit_adaptations(
+                executor=executor,
+                pending=pending,
+                graph_adaptation_iterator=graph_adaptation_iterator,
+                plot_config=plot_config,
+                prefetch=prefetch,
+            )
+            while pending:
+                future: Future = pending.popleft()
+                # Adapt the next graph while this one is simulated.
+                submit_adaptations(
+                    executor=executor,
+                    pending=pending,
+                    graph_adaptation_iterator=graph_adaptation_iterator,
+                    plot_config=plot_config,
+                    prefetch=prefetch,
+                )
+                yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+@typechecked
+def submit_adaptations(
+    *,
+    executor: Executor,
+    pending: Deque[Future],
+    graph_adaptation_iterator: Iterator[Tuple[nx.DiGraph, Adaptation]],
+    plot_config: Plot_config,
+    prefetch: int,
+) -> None:
+    """Submits the adaptation of the next graphs, until prefetch adaptations
+    are pending or the graphs are exhausted."""
+    while len(pending) < prefetch:
+        graph_adaptation = next(graph_adaptation_iterator, None)
+        if graph_adaptation is None:
+            return
+        snn_graph, adaptation = graph_adaptation
+        pending.append(
+            executor.submit(
+                apply_fused_adaptation,
+                adaptation_graph=snn_graph,
+                adaptation=adaptation,
+                plot_config=plot_config,
+            )
+        )
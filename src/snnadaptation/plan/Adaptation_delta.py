@@ -0,0 +1,36 @@
+"""Contains what an adaptation adds to, or changes in, the original graph."""
+# pylint: disable=R0903
+from typing import Any, Dict, Tuple
+
+from snnbackends.networkx.LIF_neuron import LIF_neuron
+from typeguard import typechecked
+
+# Graph attribute with the reverse indices of the applied adaptations.
+reverse_index_key: str = "adaptation_reverse_index"
+
+
+class Adaptation_delta:
+    """The redundant neurons and synapses an adaptation adds, and the neuron
+    properties and synapse weights it overrides in the original graph.
+
+    Applying the delta to the original graph with apply_adaptation_delta
+    yields the adapted graph.
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        adaptation_type: str,
+        redundancy: int,
+    ) -> None:
+        self.adaptation_type: str = adaptation_type
+        self.redundancy: int = redundancy
+        # Redundant neurons, per node name, in the order of creation.
+        self.added_neurons: Dict[str, LIF_neuron] = {}
+        # Edge attributes (synapse and optional is_redundant flag) per edge.
+        self.added_synapses: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # New bias, du, dv and vth of original neurons.
+        self.neuron_overrides: Dict[str, Dict[str, float]] = {}
+        # New weights of original synapses.
+        self.synapse_overrides: Dict[Tuple[str, str], float] = {}
+        self.graph_attributes: Dict[str, Any] = {"red_level": redundancy}
@@ -0,0 +1,217 @@
+"""Contains the structural decisions of an adaptation, such that they can be
+re-used on graphs with the same topology."""
+# pylint: disable=R0903
+import sys
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set, Tuple
+
+import networkx as nx
+from typeguard import typechecked
+
+from snnadaptation.neuron_roles import get_redundant_node_name
+
+
+class Neuron_operation:
+    """Creation of the redundant neuron at red_level of an original neuron, by
+    adaptation stage stage."""
+
+    @typechecked
+    def __init__(
+        self,
+        node_name: str,
+        red_level: int,
+        stage: int = 0,
+    ) -> None:
+        self.node_name: str = node_name
+        self.red_level: int = red_level
+        self.stage: int = stage
+        self.name: str = get_redundant_node_name(
+            node_name=node_name, red_level=red_level, stage=stage
+        )
+
+
+class Synapse_operation:
+    """Creation (or overwrite) of a synapse. The weight is either copied from
+    an original edge (optionally scaled), copied from the recur attribute of
+    an original node, or a constant."""
+
+    # pylint: disable=R0913
+    @typechecked
+    def __init__(
+        self,
+        left: str,
+        right: str,
+        weight_edge: Optional[Tuple[str, str]] = None,
+        weight_recur: Optional[str] = None,
+        weight: Optional[float] = None,
+        is_redundant: bool = False,
+        weight_scale: float = 1,
+    ) -> None:
+        if [weight_edge, weight_recur, weight].count(None) != 2:
+            raise ValueError(
+                "Error, a synapse needs exactly one source for its weight."
+            )
+        self.left: str = left
+        self.right: str = right
+        self.weight_edge: Optional[Tuple[str, str]] = weight_edge
+        self.weight_recur: Optional[str] = weight_recur
+        self.weight: Optional[float] = weight
+        self.is_redundant: bool = is_redundant
+        self.weight_scale: float = weight_scale
+
+
+class Operation_sink(ABC):
+    """Receives the neuron and synapse operations of an adaptation, in the
+    order in which the adaptation rules create them."""
+
+    def __init__(
+        self,
+        adaptation_type: str,
+        redundancy: int,
+        recurrent_nodes: Set[str],
+        stage: int = 0,
+    ) -> None:
+        self.adaptation_type: str = adaptation_type
+        self.redundancy: int = redundancy
+        # The original nodes that have a recur attribute.
+        self.recurrent_nodes: Set[str] = recurrent_nodes
+        # The index of the adaptation stage, which prefixes the names of the
+        # redundant neurons of later stages.
+        self.stage: int = stage
+
+    @typechecked
+    def get_redundant_name(self, node_name: str, red_level: int) -> str:
+        """Returns the name of redundant neuron red_level of node_name."""
+        return get_redundant_node_name(
+            node_name=node_name, red_level=red_level, stage=self.stage
+        )
+
+    @abstractmethod
+    def add_projection(self, edge: Tuple[str, str]) -> None:
+        """Adds a pair of nodes whose populations (the node and its redundant
+        neurons of this stage) are fully connected."""
+
+    @abstractmethod
+    def add_neuron(self, node_name: str, red_level: int) -> None:
+        """Adds the creation of redundant neuron red_level of node_name."""
+
+    @abstractmethod
+    def add_synapse(self, synapse_operation: Synapse_operation) -> None:
+        """Adds a synapse. Writing an existing synapse overwrites its weight,
+        and keeps the is_redundant flag if it was set before, similar to
+        adding an existing edge in networkx."""
+
+    @abstractmethod
+    def add_overridden_neuron(self, node_name: str) -> None:
+        """Adds an original neuron that gets the properties of its redundant
+        neurons."""
+
+    @abstractmethod
+    def has_neuron(self, node_name: str) -> bool:
+        """Returns True if the node is an original or a redundant neuron of
+        the adapted graph."""
+
+
+class Adaptation_plan(Operation_sink):
+    """Neuron and synapse operations of an adaptation, indexed by the original
+    node and edge names of the topology it was compiled for.
+
+    The plan does not store any neuron parameter or synapse weight, those
+    are read from the graph the plan is applied to.
+    """
+
+    # pylint: disable=R0902
+    @typechecked
+    def __init__(
+        self,
+        adaptation_type: str,
+        redundancy: int,
+        snn_graph: nx.DiGraph,
+        stage: int = 0,
+    ) -> None:
+        super().__init__(
+            adaptation_type,
+            redundancy,
+            get_recurrent_nodes(snn_graph=snn_graph),
+            stage,
+        )
+        self.original_nodes: List[str] = list(snn_graph.nodes)
+        self.original_node_set: Set[str] = set(self.original_nodes)
+        self.original_edges: Set[Tuple[str, str]] = set(snn_graph.edges)
+
+        self.neuron_operations: Dict[str, Neuron_operation] = {}
+        self.synapse_operations: Dict[Tuple[str, str], Synapse_operation] = {}
+        # Original neurons that get the properties of their redundant neurons.
+        self.overridden_neurons: List[str] = []
+        self.projections: List[Tuple[str, str]] = []
+        # Interned names of the redundant neurons, such that each name is
+        # formatted and hashed once, and shared by all synapses.
+        self.redundant_names: Dict[Tuple[str, int], str] = {}
+
+    @typechecked
+    def get_redundant_name(self, node_name: str, red_level: int) -> str:
+        """Returns the interned name of redundant neuron red_level of
+        node_name."""
+        key = (node_name, red_level)
+        if key not in self.redundant_names:
+            self.redundant_names[key] = sys.intern(
+                super().get_redundant_name(node_name, red_level)
+            )
+        return self.redundant_names[key]
+
+    @typechecked
+    def add_projection(self, edge: Tuple[str, str]) -> None:
+        """Stores the fully connected populations of an edge."""
+        self.projections.append(edge)
+
+    @typechecked
+    def add_neuron(self, node_name: str, red_level: int) -> None:
+        """Stores the creation of a redundant neuron by its name."""
+        neuron_operation = Neuron_operation(node_name, red_level, self.stage)
+        self.neuron_operations[neuron_operation.name] = neuron_operation
+
+    @typechecked
+    def add_synapse(self, synapse_operation: Synapse_operation) -> None:
+        """Stores a synapse by its edge, see Operation_sink.add_synapse."""
+        edge = (synapse_operation.left, synapse_operation.right)
+        if edge in self.synapse_operations:
+            synapse_operation.is_redundant = (
+                synapse_operation.is_redundant
+                or self.synapse_operations[edge].is_redundant
+            )
+        self.synapse_operations[edge] = synapse_operation
+
+    @typechecked
+    def add_overridden_neuron(self, node_name: str) -> None:
+        """Stores an original neuron that gets overridden properties."""
+        self.overridden_neurons.append(node_name)
+
+    @typechecked
+    def has_neuron(self, node_name: str) -> bool:
+        """Returns True if the node is an original or a planned redundant
+        neuron."""
+        return (
+            node_name in self.neuron_operations
+            or node_name in self.original_node_set
+        )
+
+    @typechecked
+    def matches_topology(self, snn_graph: nx.DiGraph) -> bool:
+        """Returns True if the graph has the topology this plan was compiled
+        for."""
+        return (
+            set(snn_graph.nodes) == self.original_node_set
+            and set(snn_graph.edges) == self.original_edges
+            and get_recurrent_nodes(snn_graph=snn_graph)
+            == self.recurrent_nodes
+        )
+
+
+@typechecked
+def get_recurrent_nodes(*, snn_graph: nx.DiGraph) -> Set[str]:
+    """Returns the nodes that have a recur attribute."""
+    return {
+        node_name
+        for node_name, node_attributes in snn_graph.nodes.items()
+        if "recur" in node_attributes
+    }
@@ -0,0 +1,201 @@
+"""Tracks which redundant neurons and synapses of an adapted graph depend on
+which neurons and synapses of its input graph, such that local changes of
+the neuron properties or synapse weights of the input graph are re-adapted
+without redoing the whole adaptation."""
+import copy
+from typing import Any, Dict, Iterable, List, Tuple
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import LIF_neuron, Synapse
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.Adaptation_delta import reverse_index_key
+from snnadaptation.plan.Adaptation_plan import Adaptation_plan
+from snnadaptation.plan.apply_adaptation_plan import (
+    apply_adaptation_delta,
+    create_redundant_neuron,
+    get_adaptation_delta,
+    get_redundant_neuron_properties,
+    get_synapse_weight,
+    set_neuron_properties,
+)
+from snnadaptation.plan.compile_adaptation_plan import compile_adaptation_plan
+
+
+class Adaptation_tracker:
+    """An input graph, its adapted graph, and the index from each input
+    neuron and synapse to the parts of the adapted graph that are computed
+    from it."""
+
+    # pylint: disable=R0902
+    @typechecked
+    def __init__(
+        self,
+        snn_graph: nx.DiGraph,
+        adapted_graph: nx.DiGraph,
+        plan: Adaptation_plan,
+        plot_config: Plot_config,
+    ) -> None:
+        self.snn_graph: nx.DiGraph = snn_graph
+        self.adapted_graph: nx.DiGraph = adapted_graph
+        self.plan: Adaptation_plan = plan
+        self.plot_config: Plot_config = plot_config
+        # The reverse index entry of this adaptation, whose original values
+        # are updated with the changes of the input graph.
+        self.reverse_index: Dict[str, Any] = adapted_graph.graph[
+            reverse_index_key
+        ][-1]
+
+        # Redundant neurons per original node.
+        self.node_neurons: Dict[str, List[str]] = {}
+        for neuron_operation in plan.neuron_operations.values():
+            self.node_neurons.setdefault(
+                neuron_operation.node_name, []
+            ).append(neuron_operation.name)
+        self.overridden_neurons: Dict[str, None] = dict.fromkeys(
+            plan.overridden_neurons
+        )
+        # Synapses of the plan per original edge or node they copy the
+        # weight of.
+        self.edge_synapses: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        self.recur_synapses: Dict[str, List[Tuple[str, str]]] = {}
+        for edge, synapse_operation in plan.synapse_operations.items():
+            if synapse_operation.weight_edge is not None:
+                self.edge_synapses.setdefault(
+                    synapse_operation.weight_edge, []
+                ).append(edge)
+            elif synapse_operation.weight_recur is not None:
+                self.recur_synapses.setdefault(
+                    synapse_operation.weight_recur, []
+                ).append(edge)
+        # Position of each overridden original synapse in the reverse index.
+        self.synapse_override_positions: Dict[Tuple[str, str], int] = {
+            (left, right): position
+            for position, (left, right, *_) in enumerate(
+                self.reverse_index["synapse_overrides"]
+            )
+        }
+
+    @typechecked
+    def readapt(
+        self,
+        modified_nodes: Iterable[str] = (),
+        modified_edges: Iterable[Tuple[str, str]] = (),
+    ) -> None:
+        """Updates the adapted graph, in place, after the neuron properties,
+        recur attributes or synapse weights of the input graph changed, in
+        time proportional to the amount of recomputed neurons and synapses.
+
+        :param modified_nodes: The input nodes whose neuron or recur
+        attribute changed.
+        :param modified_edges: The input edges whose synapse changed.
+        The topology of the input graph should be unchanged.
+        """
+        recomputed_synapses: Dict[Tuple[str, str], None] = {}
+        for node_name in modified_nodes:
+            self.update_original_node(node_name=node_name)
+            for redundant_node_name in self.node_neurons.get(node_name, []):
+                self.adapted_graph.nodes[redundant_node_name]["nx_lif"] = [
+                    create_redundant_neuron(
+                        adaptation_graph=self.snn_graph,
+                        neuron_operation=self.plan.neuron_operations[
+                            redundant_node_name
+                        ],
+                        plan=self.plan,
+                        plot_config=self.plot_config,
+                    )
+                ]
+            recomputed_synapses.update(
+                dict.fromkeys(self.recur_synapses.get(node_name, []))
+            )
+        for edge in modified_edges:
+            self.update_original_edge(edge=edge)
+            recomputed_synapses.update(
+                dict.fromkeys(self.edge_synapses.get(edge, []))
+            )
+
+        for edge in recomputed_synapses:
+            self.adapted_graph.edges[edge]["synapse"] = Synapse(
+                weight=get_synapse_weight(
+                    snn_graph=self.snn_graph,
+                    synapse_operation=self.plan.synapse_operations[edge],
+                ),
+                delay=0,
+                change_per_t=0,
+            )
+
+    @typechecked
+    def update_original_node(self, node_name: str) -> None:
+        """Copies the neuron and recur attribute of an input node into the
+        adapted graph, with the overridden properties if the adaptation
+        overrides them."""
+        self.adapted_graph.nodes[node_name].update(
+            copy.deepcopy(self.snn_graph.nodes[node_name])
+        )
+        if node_name not in self.overridden_neurons:
+            return
+        lif_neuron: LIF_neuron = self.snn_graph.nodes[node_name]["nx_lif"][0]
+        self.reverse_index["neuron_overrides"][node_name] = {
+            "bias": lif_neuron.bias.get(),
+            "du": lif_neuron.du.get(),
+            "dv": lif_neuron.dv.get(),
+            "vth": lif_neuron.vth.get(),
+        }
+        set_neuron_properties(
+            lif_neuron=self.adapted_graph.nodes[node_name]["nx_lif"][0],
+            neuron_properties=get_redundant_neuron_properties(
+                adaptation_type=self.plan.adaptation_type,
+                snn_graph=self.snn_graph,
+                node_name=node_name,
+                red_level=1,
+                redundancy=self.plan.redundancy,
+            ),
+        )
+
+    @typechecked
+    def update_original_edge(self, edge: Tuple[str, str]) -> None:
+        """Copies the synapse of an input edge into the adapted graph, unless
+        the adaptation overrides its weight."""
+        if edge in self.synapse_override_positions:
+            synapse: Synapse = self.snn_graph.edges[edge]["synapse"]
+            self.reverse_index["synapse_overrides"][
+                self.synapse_override_positions[edge]
+            ] = [
+                edge[0],
+                edge[1],
+                synapse.weight,
+                synapse.delay,
+                synapse.change_per_t,
+            ]
+        else:
+            self.adapted_graph.edges[edge].update(
+                copy.deepcopy(self.snn_graph.edges[edge])
+            )
+
+
+@typechecked
+def track_adaptation(
+    *,
+    snn_graph: nx.DiGraph,
+    adaptation: Adaptation,
+    plot_config: Plot_config,
+) -> Adaptation_tracker:
+    """Adapts the graph, and returns the tracker of the input graph and its
+    adapted graph. The input graph is not changed by the adaptation, and is
+    read again by Adaptation_tracker.readapt after the caller changed it.
+
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    :param adaptation: A single stage adaptation.
+    """
+    plan: Adaptation_plan = compile_adaptation_plan(
+        snn_graph=snn_graph, adaptation=adaptation
+    )
+    adapted_graph: nx.DiGraph = apply_adaptation_delta(
+        adaptation_graph=copy.deepcopy(snn_graph),
+        delta=get_adaptation_delta(
+            snn_graph=snn_graph, plan=plan, plot_config=plot_config
+        ),
+    )
+    return Adaptation_tracker(snn_graph, adapted_graph, plan, plot_config)
@@ -0,0 +1,376 @@
+"""Applies a compiled adaptation plan to a graph with the same topology."""
+from typing import Any, Dict, List, Optional, Tuple
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import LIF_neuron, Synapse
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import get_xy_point_on_circle
+from snnadaptation.neuron_roles import get_redundant_node_name
+from snnadaptation.plan.Adaptation_delta import (
+    Adaptation_delta,
+    reverse_index_key,
+)
+from snnadaptation.plan.Adaptation_plan import (
+    Adaptation_plan,
+    Neuron_operation,
+    Operation_sink,
+    Synapse_operation,
+)
+from snnadaptation.plan.group_metadata import add_group_metadata
+from snnadaptation.population.create_population_neurons import (
+    get_population_neuron_properties,
+)
+from snnadaptation.redundancy.create_redundant_neurons import (
+    computer_red_neuron_properties,
+)
+
+
+@typechecked
+def apply_adaptation_plan(
+    *,
+    adaptation_graph: nx.DiGraph,
+    plan: Adaptation_plan,
+    plot_config: Plot_config,
+) -> nx.DiGraph:
+    """Creates the redundant neurons and synapses of the plan. Only the neuron
+    properties and synapse weights are taken from the adaptation_graph, all
+    structural decisions are taken from the plan.
+
+    :param adaptation_graph: Graph with the MDSA SNN approximation solution.
+    :param plan: Adaptation plan compiled for the topology of the graph.
+    """
+    return apply_adaptation_delta(
+        adaptation_graph=adaptation_graph,
+        delta=get_adaptation_delta(
+            snn_graph=adaptation_graph, plan=plan, plot_config=plot_config
+        ),
+    )
+
+
+@typechecked
+def get_adaptation_delta(
+    *,
+    snn_graph: nx.DiGraph,
+    plan: Adaptation_plan,
+    plot_config: Plot_config,
+    base_delta: Optional[Adaptation_delta] = None,
+) -> Adaptation_delta:
+    """Returns the neurons and synapses the plan adds to the snn_graph, and
+    the properties and weights it overrides, without changing the snn_graph.
+
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    :param plan: Adaptation plan compiled for the topology of the graph.
+    :param base_delta: Changes of earlier adaptation stages. If given, the
+    plan was compiled for the topology of the snn_graph with the base_delta
+    applied, and the neuron properties and synapse weights are read through
+    the base_delta.
+
+    The delta contains the group metadata of the adapted graph, see
+    add_group_metadata, and for population coding the
+    population_projections: the pairs of neurons whose populations are fully
+    connected.
+    """
+    if base_delta is None and not plan.matches_topology(snn_graph=snn_graph):
+        raise ValueError(
+            "Error, the adaptation plan was compiled for a different topology."
+        )
+    delta = Adaptation_delta(plan.adaptation_type, plan.redundancy)
+    for neuron_operation in plan.neuron_operations.values():
+        delta.added_neurons[neuron_operation.name] = create_redundant_neuron(
+            adaptation_graph=get_neuron_graph(
+                snn_graph=snn_graph,
+                base_delta=base_delta,
+                node_name=neuron_operation.node_name,
+            ),
+            neuron_operation=neuron_operation,
+            plan=plan,
+            plot_config=plot_config,
+        )
+
+    for node_name in plan.overridden_neurons:
+        # The original neuron gets the properties of its redundant neurons.
+        delta.neuron_overrides[node_name] = get_redundant_neuron_properties(
+            adaptation_type=plan.adaptation_type,
+            snn_graph=get_neuron_graph(
+                snn_graph=snn_graph, base_delta=base_delta, node_name=node_name
+            ),
+            node_name=node_name,
+            red_level=1,
+            redundancy=plan.redundancy,
+        )
+
+    for edge, synapse_operation in plan.synapse_operations.items():
+        weight: float = get_synapse_weight(
+            snn_graph=snn_graph,
+            synapse_operation=synapse_operation,
+            base_delta=base_delta,
+        )
+        if edge in plan.original_edges:
+            delta.synapse_overrides[edge] = weight
+        elif synapse_operation.is_redundant:
+            delta.added_synapses[edge] = {
+                "synapse": Synapse(weight=weight, delay=0, change_per_t=0),
+                "is_redundant": True,
+            }
+        else:
+            delta.added_synapses[edge] = {
+                "synapse": Synapse(weight=weight, delay=0, change_per_t=0),
+            }
+    if plan.adaptation_type == "population":
+        delta.graph_attributes["population_projections"] = [
+            list(projection) for projection in plan.projections
+        ]
+    if base_delta is None:
+        add_group_metadata(snn_graph=snn_graph, delta=delta)
+    return delta
+
+
+@typechecked
+def apply_adaptation_delta(
+    *,
+    adaptation_graph: nx.DiGraph,
+    delta: Adaptation_delta,
+) -> nx.DiGraph:
+    """Adds the neurons and synapses of the delta to the graph, and overrides
+    its original neuron properties and synapse weights. The reverse index of
+    the changes is stored in the graph, such that strip_adaptation can undo
+    them.
+
+    :param adaptation_graph: The graph the delta was computed for.
+    :param delta: The changes of an adaptation.
+    """
+    adaptation_graph.graph.setdefault(reverse_index_key, []).append(
+        get_reverse_index(adaptation_graph=adaptation_graph, delta=delta)
+    )
+    adaptation_graph.graph.update(delta.graph_attributes)
+    for node_name, lif_neuron in delta.added_neurons.items():
+        adaptation_graph.add_node(node_name)
+        adaptation_graph.nodes[node_name]["nx_lif"] = [lif_neuron]
+
+    for node_name, neuron_properties in delta.neuron_overrides.items():
+        set_neuron_properties(
+            lif_neuron=adaptation_graph.nodes[node_name]["nx_lif"][0],
+            neuron_properties=neuron_properties,
+        )
+
+    for edge, weight in delta.synapse_overrides.items():
+        adaptation_graph.edges[edge]["synapse"] = Synapse(
+            weight=weight, delay=0, change_per_t=0
+        )
+    adaptation_graph.add_edges_from(
+        (edge[0], edge[1], edge_attributes)
+        for edge, edge_attributes in delta.added_synapses.items()
+    )
+    return adaptation_graph
+
+
+@typechecked
+def get_reverse_index(
+    *,
+    adaptation_graph: nx.DiGraph,
+    delta: Adaptation_delta,
+) -> Dict[str, Any]:
+    """Returns the json serialisable information that is needed to undo the
+    delta: the added neurons and synapses, and the original values of the
+    overridden neuron properties, synapses and graph attributes."""
+    neuron_overrides: Dict[str, Dict[str, float]] = {}
+    for node_name in delta.neuron_overrides:
+        lif_neuron: LIF_neuron = adaptation_graph.nodes[node_name]["nx_lif"][0]
+        neuron_overrides[node_name] = {
+            "bias": lif_neuron.bias.get(),
+            "du": lif_neuron.du.get(),
+            "dv": lif_neuron.dv.get(),
+            "vth": lif_neuron.vth.get(),
+        }
+    synapse_overrides: List[List[Any]] = []
+    for edge in delta.synapse_overrides:
+        synapse: Synapse = adaptation_graph.edges[edge]["synapse"]
+        synapse_overrides.append(
+            [
+                edge[0],
+                edge[1],
+                synapse.weight,
+                synapse.delay,
+                synapse.change_per_t,
+            ]
+        )
+    return {
+        "added_neurons": list(delta.added_neurons.keys()),
+        "added_synapses": [
+            list(edge)
+            for edge in delta.added_synapses
+            if edge[0] not in delta.added_neurons
+            and edge[1] not in delta.added_neurons
+        ],
+        "neuron_overrides": neuron_overrides,
+        "synapse_overrides": synapse_overrides,
+        "graph_attributes": {
+            key: adaptation_graph.graph.get(key)
+            for key in delta.graph_attributes
+        },
+    }
+
+
+@typechecked
+def set_neuron_properties(
+    *, lif_neuron: LIF_neuron, neuron_properties: Dict[str, float]
+) -> None:
+    """Sets the bias, du, dv and vth of a LIF neuron."""
+    property_neuron = LIF_neuron(
+        name=lif_neuron.name,
+        bias=neuron_properties["bias"],
+        du=neuron_properties["du"],
+        dv=neuron_properties["dv"],
+        vth=neuron_properties["vth"],
+        pos=lif_neuron.pos,
+        identifiers=lif_neuron.identifiers,
+    )
+    lif_neuron.bias = property_neuron.bias
+    lif_neuron.du = property_neuron.du
+    lif_neuron.dv = property_neuron.dv
+    lif_neuron.vth = property_neuron.vth
+
+
+@typechecked
+def get_neuron_graph(
+    *,
+    snn_graph: nx.DiGraph,
+    base_delta: Optional[Adaptation_delta],
+    node_name: str,
+) -> nx.DiGraph:
+    """Returns a graph that contains the neuron of node_name, with the
+    properties it has after the base_delta is applied."""
+    if base_delta is None or (
+        node_name not in base_delta.added_neurons
+        and node_name not in base_delta.neuron_overrides
+    ):
+        return snn_graph
+    if node_name in base_delta.added_neurons:
+        lif_neuron: LIF_neuron = base_delta.added_neurons[node_name]
+    else:
+        ori_lif: LIF_neuron = snn_graph.nodes[node_name]["nx_lif"][0]
+        neuron_properties = base_delta.neuron_overrides[node_name]
+        lif_neuron = LIF_neuron(
+            name=ori_lif.name,
+            bias=neuron_properties["bias"],
+            du=neuron_properties["du"],
+            dv=neuron_properties["dv"],
+            vth=neuron_properties["vth"],
+            pos=ori_lif.pos,
+            identifiers=ori_lif.identifiers,
+        )
+    neuron_graph = nx.DiGraph()
+    neuron_graph.add_node(node_name, nx_lif=[lif_neuron])
+    return neuron_graph
+
+
+@typechecked
+def get_synapse_weight(
+    *,
+    snn_graph: nx.DiGraph,
+    synapse_operation: Synapse_operation,
+    base_delta: Optional[Adaptation_delta] = None,
+) -> float:
+    """Returns the weight of a synapse of the plan, for the given graph with
+    the optional base_delta applied."""
+    if synapse_operation.weight_edge is not None:
+        edge: Tuple[str, str] = synapse_operation.weight_edge
+        if base_delta is not None and edge in base_delta.added_synapses:
+            weight = base_delta.added_synapses[edge]["synapse"].weight
+        elif base_delta is not None and edge in base_delta.synapse_overrides:
+            weight = base_delta.synapse_overrides[edge]
+        else:
+            weight = snn_graph.edges[edge]["synapse"].weight
+        if synapse_operation.weight_scale != 1:
+            return weight * synapse_operation.weight_scale
+        return weight
+    if synapse_operation.weight_recur is not None:
+        return snn_graph.nodes[synapse_operation.weight_recur]["recur"]
+    return synapse_operation.weight
+
+
+@typechecked
+def get_redundant_neuron_properties(
+    *,
+    adaptation_type: str,
+    snn_graph: nx.DiGraph,
+    node_name: str,
+    red_level: int,
+    redundancy: int,
+) -> Dict[str, float]:
+    """Returns the bias, du, dv and vth of a redundant neuron, based on the
+    properties of its original neuron."""
+    if adaptation_type == "redundancy":
+        return computer_red_neuron_properties(
+            adaptation_graph=snn_graph,
+            node_name=node_name,
+            red_level=red_level,
+        )
+    if adaptation_type == "population":
+        return get_population_neuron_properties(
+            adaptation_graph=snn_graph,
+            node_name=node_name,
+            max_redundancy=redundancy,
+        )
+    raise NotImplementedError(f"Error, {adaptation_type} not supported.")
+
+
+@typechecked
+def get_redundant_neuron_position(
+    *,
+    ori_lif: LIF_neuron,
+    plot_config: Plot_config,
+    red_level: int,
+    max_redundancy: int,
+) -> Tuple[float, float]:
+    """Returns the plot position of a redundant neuron, on a circle around its
+    original neuron."""
+    x, y = get_xy_point_on_circle(
+        radius=plot_config.redundancy_radius,
+        n=red_level,
+        total_points=max_redundancy + 1,
+    )
+    return (float(ori_lif.pos[0] + x), float(ori_lif.pos[1] + y))
+
+
+@typechecked
+def create_redundant_neuron(
+    *,
+    adaptation_graph: nx.DiGraph,
+    neuron_operation: Neuron_operation,
+    plan: Operation_sink,
+    plot_config: Plot_config,
+) -> LIF_neuron:
+    """Creates the redundant neuron of a neuron operation.
+
+    :param adaptation_graph: Graph with the MDSA SNN approximation solution.
+    :param neuron_operation: The redundant neuron that is created.
+    """
+    ori_lif = adaptation_graph.nodes[neuron_operation.node_name]["nx_lif"][0]
+    red_neuron_props: Dict[str, float] = get_redundant_neuron_properties(
+        adaptation_type=plan.adaptation_type,
+        snn_graph=adaptation_graph,
+        node_name=neuron_operation.node_name,
+        red_level=neuron_operation.red_level,
+        redundancy=plan.redundancy,
+    )
+    return LIF_neuron(
+        name=get_redundant_node_name(
+            node_name=ori_lif.name,
+            red_level=neuron_operation.red_level,
+            stage=neuron_operation.stage,
+        ),
+        bias=red_neuron_props["bias"],
+        du=red_neuron_props["du"],
+        dv=red_neuron_props["dv"],
+        vth=red_neuron_props["vth"],
+        pos=get_redundant_neuron_position(
+            ori_lif=ori_lif,
+            plot_config=plot_config,
+            red_level=neuron_operation.red_level,
+            max_redundancy=plan.redundancy,
+        ),
+        identifiers=ori_lif.identifiers,
+    )
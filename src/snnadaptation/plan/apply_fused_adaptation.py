@@ -0,0 +1,149 @@
+"""Applies the stages of an adaptation in a single emission into the original
+graph, without building the intermediate adapted graphs."""
+import copy
+from typing import List, Optional
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import Synapse
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.Adaptation_delta import Adaptation_delta
+from snnadaptation.plan.Adaptation_plan import Adaptation_plan
+from snnadaptation.plan.apply_adaptation_plan import (
+    apply_adaptation_delta,
+    get_adaptation_delta,
+    set_neuron_properties,
+)
+from snnadaptation.plan.compile_adaptation_plan import compile_adaptation_plan
+from snnadaptation.plan.group_metadata import add_group_metadata
+from snnadaptation.plan.integer_ids import (
+    apply_adaptation_delta_with_integer_ids,
+)
+
+
+@typechecked
+def apply_fused_adaptation(
+    *,
+    adaptation_graph: nx.DiGraph,
+    adaptation: Adaptation,
+    plot_config: Plot_config,
+    integer_ids: bool = False,
+) -> nx.DiGraph:
+    """Applies the adaptation and its next stages, in order, to the graph.
+    Each stage adapts the graph that the previous stages yield, and the
+    redundant neurons of stage s>0 are prefixed with s<s>_.
+
+    :param adaptation_graph: Graph with the MDSA SNN approximation solution.
+    :param adaptation: The adaptation, with optional next stages.
+    :param integer_ids: If True, the adapted graph has dense integer node
+    ids, with the node names in the node_names graph attribute, see
+    plan.integer_ids.
+
+    The adaptation_graph is not changed, the adapted graph is a copy. Use
+    get_fused_adaptation_delta for only the neurons and synapses the stages
+    add or change.
+    """
+    delta: Adaptation_delta = get_fused_adaptation_delta(
+        snn_graph=adaptation_graph,
+        adaptation=adaptation,
+        plot_config=plot_config,
+    )
+    if integer_ids:
+        return apply_adaptation_delta_with_integer_ids(
+            snn_graph=adaptation_graph, delta=delta
+        )
+    return apply_adaptation_delta(
+        adaptation_graph=copy.deepcopy(adaptation_graph), delta=delta
+    )
+
+
+@typechecked
+def get_fused_adaptation_delta(
+    *,
+    snn_graph: nx.DiGraph,
+    adaptation: Adaptation,
+    plot_config: Plot_config,
+) -> Adaptation_delta:
+    """Returns the combined changes of all stages of the adaptation. A stage
+    is compiled for the topology (node names and edges, without neurons or
+    synapses) of the previous stage, and reads its neuron properties and
+    synapse weights through the combined changes of the previous stages.
+
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    :param adaptation: The adaptation, with optional next stages.
+    """
+    stages: List[Adaptation] = adaptation.get_stages()
+    topology: nx.DiGraph = snn_graph
+    delta: Optional[Adaptation_delta] = None
+    for stage, stage_adaptation in enumerate(stages):
+        plan: Adaptation_plan = compile_adaptation_plan(
+            snn_graph=topology, adaptation=stage_adaptation, stage=stage
+        )
+        stage_delta: Adaptation_delta = get_adaptation_delta(
+            snn_graph=snn_graph,
+            plan=plan,
+            plot_config=plot_config,
+            base_delta=delta,
+        )
+        if delta is None:
+            delta = stage_delta
+        else:
+            merge_adaptation_delta(delta=delta, stage_delta=stage_delta)
+        if stage < len(stages) - 1:
+            topology = get_adapted_topology(topology=topology, plan=plan)
+    if delta is None:
+        raise ValueError("Error, an adaptation has at least one stage.")
+    add_group_metadata(snn_graph=snn_graph, delta=delta)
+    return delta
+
+
+@typechecked
+def get_adapted_topology(
+    *, topology: nx.DiGraph, plan: Adaptation_plan
+) -> nx.DiGraph:
+    """Returns the node names and edges of the topology after the plan is
+    applied, in the order in which applying the plan would create them."""
+    adapted_topology = nx.DiGraph()
+    adapted_topology.add_nodes_from(topology.nodes)
+    for node_name in plan.recurrent_nodes:
+        adapted_topology.nodes[node_name]["recur"] = True
+    adapted_topology.add_edges_from(topology.edges)
+    adapted_topology.add_nodes_from(plan.neuron_operations)
+    adapted_topology.add_edges_from(plan.synapse_operations)
+    return adapted_topology
+
+
+@typechecked
+def merge_adaptation_delta(
+    *, delta: Adaptation_delta, stage_delta: Adaptation_delta
+) -> None:
+    """Adds the changes of a later stage to the combined changes. Overrides of
+    neurons and synapses that an earlier stage added, are applied to those
+    added neurons and synapses."""
+    delta.added_neurons.update(stage_delta.added_neurons)
+    for node_name, neuron_properties in stage_delta.neuron_overrides.items():
+        if node_name in delta.added_neurons:
+            set_neuron_properties(
+                lif_neuron=delta.added_neurons[node_name],
+                neuron_properties=neuron_properties,
+            )
+        else:
+            delta.neuron_overrides[node_name] = neuron_properties
+    for edge, weight in stage_delta.synapse_overrides.items():
+        if edge in delta.added_synapses:
+            delta.added_synapses[edge]["synapse"] = Synapse(
+                weight=weight, delay=0, change_per_t=0
+            )
+        else:
+            delta.synapse_overrides[edge] = weight
+    delta.added_synapses.update(stage_delta.added_synapses)
+    projections = delta.graph_attributes.get("population_projections", [])
+    delta.graph_attributes.update(stage_delta.graph_attributes)
+    if "population_projections" in stage_delta.graph_attributes:
+        # The projections of all population coding stages are kept.
+        delta.graph_attributes["population_projections"] = (
+            projections
+            + stage_delta.graph_attributes["population_projections"]
+        )
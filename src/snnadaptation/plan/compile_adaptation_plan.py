@@ -0,0 +1,64 @@
+"""Compiles an Adaptation into a plan for the topology of a graph."""
+from typing import Optional, Set
+
+import networkx as nx
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.Adaptation_plan import Adaptation_plan
+from snnadaptation.population.apply_population_coding import (
+    compile_population_coding_plan,
+)
+from snnadaptation.redundancy.apply_sparse_redundancy import (
+    compile_sparse_redundancy_plan,
+)
+from snnadaptation.selection.select_neurons import select_neurons
+
+
+@typechecked
+def compile_adaptation_plan(
+    *,
+    snn_graph: nx.DiGraph,
+    adaptation: Adaptation,
+    stage: int = 0,
+) -> Adaptation_plan:
+    """Returns the plan of neuron and synapse operations of the adaptation for
+    the topology of the snn_graph. The plan can be applied to every graph with
+    the same topology using apply_adaptation_plan.
+
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    :param adaptation: The adaptation that is compiled.
+    :param stage: The index of the adaptation stage, which prefixes the names
+    of the redundant neurons of later stages.
+    """
+    if adaptation.next_stages:
+        raise NotImplementedError(
+            "Error, compile the stages of the adaptation separately, or use "
+            + "apply_fused_adaptation."
+        )
+    selected_nodes: Optional[Set[str]] = None
+    if adaptation.selection is not None:
+        selected_nodes = select_neurons(
+            snn_graph=snn_graph,
+            adaptation_type=adaptation.adaptation_type,
+            redundancy=adaptation.redundancy,
+            selection=adaptation.selection,
+        )
+
+    if adaptation.adaptation_type == "redundancy":
+        return compile_sparse_redundancy_plan(
+            snn_graph=snn_graph,
+            redundancy=adaptation.redundancy,
+            selected_nodes=selected_nodes,
+            stage=stage,
+        )
+    if adaptation.adaptation_type == "population":
+        return compile_population_coding_plan(
+            snn_graph=snn_graph,
+            redundancy=adaptation.redundancy,
+            selected_nodes=selected_nodes,
+            stage=stage,
+        )
+    raise NotImplementedError(
+        f"Error, {adaptation.adaptation_type} not supported."
+    )
@@ -0,0 +1,54 @@
+"""Creates the metadata that groups each original neuron with its redundant
+neurons, such that backends do not need to parse the node names."""
+from typing import Dict, Iterable, List, Tuple
+
+import networkx as nx
+from typeguard import typechecked
+
+from snnadaptation.neuron_roles import get_original_node_name
+from snnadaptation.plan.Adaptation_delta import Adaptation_delta
+
+
+@typechecked
+def add_group_metadata(
+    *, snn_graph: nx.DiGraph, delta: Adaptation_delta
+) -> None:
+    """Adds the neuron_ids and neuron_groups graph attributes of the adapted
+    graph to the delta.
+
+    neuron_ids maps each node to an integer id, such that each original
+    neuron and its redundant neurons (of all stages) have consecutive ids.
+    neuron_groups maps each original neuron to the [start, stop) id range of
+    its group.
+
+    :param snn_graph: The graph the delta was computed for.
+    :param delta: The changes of an adaptation.
+    """
+    neuron_ids, neuron_groups = get_group_metadata(
+        original_node_names=snn_graph.nodes,
+        added_node_names=delta.added_neurons,
+    )
+    delta.graph_attributes["neuron_ids"] = neuron_ids
+    delta.graph_attributes["neuron_groups"] = neuron_groups
+
+
+@typechecked
+def get_group_metadata(
+    *, original_node_names: Iterable[str], added_node_names: Iterable[str]
+) -> Tuple[Dict[str, int], Dict[str, List[int]]]:
+    """Returns the neuron_ids and neuron_groups of a graph with the original
+    and added nodes, see add_group_metadata."""
+    groups: Dict[str, List[str]] = {
+        node_name: [node_name] for node_name in original_node_names
+    }
+    for node_name in added_node_names:
+        groups[get_original_node_name(node_name=node_name)].append(node_name)
+
+    neuron_ids: Dict[str, int] = {}
+    neuron_groups: Dict[str, List[int]] = {}
+    for original_node_name, group in groups.items():
+        start: int = len(neuron_ids)
+        for node_name in group:
+            neuron_ids[node_name] = len(neuron_ids)
+        neuron_groups[original_node_name] = [start, len(neuron_ids)]
+    return neuron_ids, neuron_groups
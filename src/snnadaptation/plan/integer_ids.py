@@ -0,0 +1,196 @@
+"""Converts adapted graphs to and from graphs with dense integer node ids, with
+the node names in a side table.
+
+The node names of an adapted graph are formatted strings, e.g.
+r_2_spike_1, that are hashed on every node and edge lookup. With integer
+ids, each original neuron and its redundant neurons have consecutive
+ids, as assigned by add_group_metadata, and the node_names graph
+attribute maps an id back to its name.
+"""
+import copy
+from typing import Any, Dict, List
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import Synapse
+from typeguard import typechecked
+
+from snnadaptation.plan.Adaptation_delta import (
+    Adaptation_delta,
+    reverse_index_key,
+)
+from snnadaptation.plan.apply_adaptation_plan import (
+    get_reverse_index,
+    set_neuron_properties,
+)
+
+node_names_key = "node_names"
+
+
+class Node_name_table:
+    """Maps the integer node ids of a graph to the node names, and back."""
+
+    # pylint: disable=R0903
+    @typechecked
+    def __init__(
+        self,
+        node_names: List[str],
+    ) -> None:
+        # The name of node id i is node_names[i].
+        self.node_names: List[str] = node_names
+        self.node_ids: Dict[str, int] = {
+            node_name: node_id for node_id, node_name in enumerate(node_names)
+        }
+        if len(self.node_ids) != len(node_names):
+            raise ValueError("Error, the node names are not unique.")
+
+    @typechecked
+    def get_id(self, node_name: str) -> int:
+        """Returns the integer id of a node name."""
+        return self.node_ids[node_name]
+
+    @typechecked
+    def get_name(self, node_id: int) -> str:
+        """Returns the node name of an integer id."""
+        return self.node_names[node_id]
+
+
+@typechecked
+def get_node_name_table(*, snn_graph: nx.DiGraph) -> Node_name_table:
+    """Returns the name table of a graph with integer node ids."""
+    if node_names_key not in snn_graph.graph:
+        raise KeyError("Error, the graph does not have integer node ids.")
+    return Node_name_table(snn_graph.graph[node_names_key])
+
+
+@typechecked
+def apply_adaptation_delta_with_integer_ids(
+    *,
+    snn_graph: nx.DiGraph,
+    delta: Adaptation_delta,
+) -> nx.DiGraph:
+    """Returns the graph with the delta applied, with integer node ids.
+
+    The delta is computed with node names, and only relabelled to integer
+    ids here, so this does not lower the adaptation time or memory; it only
+    skips the copy of the adapted graph with node names that
+    relabel_to_integer_ids would make. The snn_graph is not changed. The
+    reverse index, like the one of apply_adaptation_delta, uses the node
+    names, which strip_adaptation maps through the node_names table.
+
+    :param snn_graph: The graph the delta was computed for.
+    :param delta: The changes of an adaptation, with the group metadata.
+    """
+    node_ids: Dict[str, int] = delta.graph_attributes["neuron_ids"]
+    node_names: List[str] = get_node_names(neuron_ids=node_ids)
+    id_graph = nx.DiGraph()
+    id_graph.graph.update(copy.deepcopy(snn_graph.graph))
+    id_graph.graph.setdefault(reverse_index_key, []).append(
+        get_reverse_index(adaptation_graph=snn_graph, delta=delta)
+    )
+    id_graph.graph.update(delta.graph_attributes)
+    id_graph.graph.pop("neuron_ids")
+    set_integer_id_attributes(
+        id_graph=id_graph, node_names=node_names, node_ids=node_ids
+    )
+
+    for node_id, node_name in enumerate(node_names):
+        if node_name in delta.added_neurons:
+            id_graph.add_node(node_id, nx_lif=[delta.added_neurons[node_name]])
+        else:
+            id_graph.add_node(
+                node_id, **copy.deepcopy(snn_graph.nodes[node_name])
+            )
+            if node_name in delta.neuron_overrides:
+                set_neuron_properties(
+                    lif_neuron=id_graph.nodes[node_id]["nx_lif"][0],
+                    neuron_properties=delta.neuron_overrides[node_name],
+                )
+
+    for left, right, edge_attributes in snn_graph.edges(data=True):
+        id_edge_attributes: Dict[str, Any] = copy.deepcopy(edge_attributes)
+        if (left, right) in delta.synapse_overrides:
+            id_edge_attributes["synapse"] = Synapse(
+                weight=delta.synapse_overrides[(left, right)],
+                delay=0,
+                change_per_t=0,
+            )
+        id_graph.add_edge(
+            node_ids[left], node_ids[right], **id_edge_attributes
+        )
+    id_graph.add_edges_from(
+        (node_ids[edge[0]], node_ids[edge[1]], edge_attributes)
+        for edge, edge_attributes in delta.added_synapses.items()
+    )
+    return id_graph
+
+
+@typechecked
+def relabel_to_integer_ids(*, snn_graph: nx.DiGraph) -> nx.DiGraph:
+    """Returns a copy of the graph with integer node ids. The ids of the
+    neuron_ids graph attribute are used if the graph has them, else the nodes
+    are numbered in graph order.
+
+    :param snn_graph: Graph with node names.
+    """
+    neuron_ids: Dict[str, int] = snn_graph.graph.get(
+        "neuron_ids",
+        {node_name: node_id for node_id, node_name in enumerate(snn_graph)},
+    )
+    id_graph: nx.DiGraph = nx.relabel_nodes(snn_graph, neuron_ids, copy=True)
+    id_graph.graph = copy.deepcopy(snn_graph.graph)
+    id_graph.graph.pop("neuron_ids", None)
+    set_integer_id_attributes(
+        id_graph=id_graph,
+        node_names=get_node_names(neuron_ids=neuron_ids),
+        node_ids=neuron_ids,
+    )
+    return id_graph
+
+
+@typechecked
+def relabel_to_node_names(*, snn_graph: nx.DiGraph) -> nx.DiGraph:
+    """Returns a copy of a graph with integer node ids, with the node names as
+    node ids. This is the inverse of relabel_to_integer_ids.
+
+    :param snn_graph: Graph with integer node ids and a node_names graph
+    attribute.
+    """
+    name_table: Node_name_table = get_node_name_table(snn_graph=snn_graph)
+    named_graph: nx.DiGraph = nx.relabel_nodes(
+        snn_graph, dict(enumerate(name_table.node_names)), copy=True
+    )
+    named_graph.graph = copy.deepcopy(snn_graph.graph)
+    named_graph.graph.pop(node_names_key)
+    named_graph.graph["neuron_ids"] = name_table.node_ids
+    if "population_projections" in named_graph.graph:
+        named_graph.graph["population_projections"] = [
+            [name_table.get_name(left), name_table.get_name(right)]
+            for left, right in named_graph.graph["population_projections"]
+        ]
+    return named_graph
+
+
+@typechecked
+def get_node_names(*, neuron_ids: Dict[str, int]) -> List[str]:
+    """Returns the node names ordered by their integer id."""
+    node_names: List[str] = [""] * len(neuron_ids)
+    for node_name, node_id in neuron_ids.items():
+        node_names[node_id] = node_name
+    return node_names
+
+
+@typechecked
+def set_integer_id_attributes(
+    *,
+    id_graph: nx.DiGraph,
+    node_names: List[str],
+    node_ids: Dict[str, int],
+) -> None:
+    """Stores the node names side table in the graph attributes, and converts
+    the population_projections to integer ids."""
+    id_graph.graph[node_names_key] = node_names
+    if "population_projections" in id_graph.graph:
+        id_graph.graph["population_projections"] = [
+            [node_ids[left], node_ids[right]]
+            for left, right in id_graph.graph["population_projections"]
+        ]
@@ -0,0 +1,160 @@
+"""Removes the redundant neurons and synapses of an adaptation from an adapted
+graph, and restores the original neuron properties and synapse weights."""
+from typing import Any, Dict, List, Optional
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import Synapse
+from typeguard import typechecked
+
+from snnadaptation.neuron_roles import redundant_prefix
+from snnadaptation.plan.Adaptation_delta import reverse_index_key
+from snnadaptation.plan.apply_adaptation_plan import set_neuron_properties
+from snnadaptation.plan.integer_ids import get_node_name_table, node_names_key
+
+# The graph attributes that the adaptations add to the adapted graph.
+adaptation_graph_attributes: List[str] = [
+    "red_level",
+    "neuron_ids",
+    "neuron_groups",
+    "population_projections",
+]
+
+
+@typechecked
+def strip_adaptation(*, adaptation_graph: nx.DiGraph) -> nx.DiGraph:
+    """Undoes the adaptations of the graph, in reverse order of application,
+    in time proportional to the redundant part of the graph.
+
+    Graphs without a reverse index, e.g. graphs that were adapted before the
+    index existed, are stripped by scanning for the redundant node name
+    prefixes and is_redundant edge flags. Overridden neuron properties and
+    synapse weights, as written by population coding, can not be restored in
+    that case. Original synapses that compact_graph removed are only restored
+    if the adaptation overrode their weight.
+
+    The reverse index uses node names. For graphs with integer node ids, it
+    is mapped through the node_names table, and the stripped graph gets the
+    node names of the unadapted graph back.
+
+    :param adaptation_graph: Graph with an adapted MDSA SNN.
+    """
+    node_ids: Optional[Dict[str, int]] = None
+    if node_names_key in adaptation_graph.graph:
+        node_ids = get_node_name_table(snn_graph=adaptation_graph).node_ids
+    if reverse_index_key not in adaptation_graph.graph:
+        if node_ids is not None:
+            raise ValueError(
+                "Error, a graph with integer node ids can only be stripped "
+                "with its reverse index."
+            )
+        return strip_redundant_names(adaptation_graph=adaptation_graph)
+    reverse_indices: List[Dict[str, Any]] = adaptation_graph.graph.pop(
+        reverse_index_key
+    )
+    for reverse_index in reversed(reverse_indices):
+        if node_ids is not None:
+            reverse_index = get_id_reverse_index(
+                reverse_index=reverse_index, node_ids=node_ids
+            )
+        undo_reverse_index(
+            adaptation_graph=adaptation_graph, reverse_index=reverse_index
+        )
+    if node_ids is not None:
+        node_names: List[str] = adaptation_graph.graph.pop(node_names_key)
+        nx.relabel_nodes(
+            adaptation_graph,
+            {node_id: node_names[node_id] for node_id in adaptation_graph},
+            copy=False,
+        )
+    return adaptation_graph
+
+
+@typechecked
+def get_id_reverse_index(
+    *, reverse_index: Dict[str, Any], node_ids: Dict[str, int]
+) -> Dict[str, Any]:
+    """Returns the reverse index with the node names replaced by their integer
+    node ids."""
+    return {
+        "added_neurons": [
+            node_ids[node_name] for node_name in reverse_index["added_neurons"]
+        ],
+        "added_synapses": [
+            [node_ids[left], node_ids[right]]
+            for left, right in reverse_index["added_synapses"]
+        ],
+        "neuron_overrides": {
+            node_ids[node_name]: neuron_properties
+            for node_name, neuron_properties in reverse_index[
+                "neuron_overrides"
+            ].items()
+        },
+        "synapse_overrides": [
+            [node_ids[left], node_ids[right]] + synapse_values
+            for left, right, *synapse_values in reverse_index[
+                "synapse_overrides"
+            ]
+        ],
+        "graph_attributes": reverse_index["graph_attributes"],
+    }
+
+
+@typechecked
+def undo_reverse_index(
+    *, adaptation_graph: nx.DiGraph, reverse_index: Dict[str, Any]
+) -> None:
+    """Undoes a single adaptation, using its reverse index."""
+    # Removing a node also removes its synapses.
+    adaptation_graph.remove_nodes_from(reverse_index["added_neurons"])
+    adaptation_graph.remove_edges_from(
+        (left, right) for left, right in reverse_index["added_synapses"]
+    )
+    for node_name, neuron_properties in reverse_index[
+        "neuron_overrides"
+    ].items():
+        set_neuron_properties(
+            lif_neuron=adaptation_graph.nodes[node_name]["nx_lif"][0],
+            neuron_properties=neuron_properties,
+        )
+    for left, right, weight, delay, change_per_t in reverse_index[
+        "synapse_overrides"
+    ]:
+        # Re-adds the original synapse if compact_graph removed it.
+        adaptation_graph.add_edge(
+            left,
+            right,
+            synapse=Synapse(
+                weight=weight, delay=delay, change_per_t=change_per_t
+            ),
+        )
+    for key, value in reverse_index["graph_attributes"].items():
+        if value is None:
+            adaptation_graph.graph.pop(key, None)
+        else:
+            adaptation_graph.graph[key] = value
+
+
+@typechecked
+def strip_redundant_names(*, adaptation_graph: nx.DiGraph) -> nx.DiGraph:
+    """Removes the neurons with a redundant name prefix, the synapses with an
+    is_redundant flag and the graph attributes of the adaptations, by
+    scanning the whole graph."""
+    for key in adaptation_graph_attributes:
+        adaptation_graph.graph.pop(key, None)
+    adaptation_graph.remove_nodes_from(
+        [
+            node_name
+            for node_name in adaptation_graph.nodes
+            if redundant_prefix.match(node_name)
+        ]
+    )
+    adaptation_graph.remove_edges_from(
+        [
+            (left, right)
+            for left, right, is_redundant in adaptation_graph.edges(
+                data="is_redundant"
+            )
+            if is_redundant
+        ]
+    )
+    return adaptation_graph
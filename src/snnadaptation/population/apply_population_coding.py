@@ -1,19 +1,25 @@
 """Applies population coding to an incoming algorithm."""
 import copy
-from typing import Dict
+from typing import Iterable, List, Optional, Set, Tuple
 
 import networkx as nx
-from snnbackends.networkx.LIF_neuron import LIF_neuron
 from snncompare.export_plots.Plot_config import Plot_config
 from typeguard import typechecked
 
-from snnadaptation.Adaptation import get_xy_point_on_circle
-from snnadaptation.population.create_population_neurons import (
-    get_population_neuron_properties,
+from snnadaptation.plan.Adaptation_delta import Adaptation_delta
+from snnadaptation.plan.Adaptation_plan import Adaptation_plan, Operation_sink
+from snnadaptation.plan.apply_adaptation_plan import (
+    apply_adaptation_delta,
+    get_adaptation_delta,
+)
+from snnadaptation.plan.integer_ids import (
+    apply_adaptation_delta_with_integer_ids,
 )
 from snnadaptation.population.create_population_synapses import (
     add_population_synapses,
 )
+from snnadaptation.selection.select_neurons import is_adaptable, select_neurons
+from snnadaptation.selection.Selection_policy import Selection_policy
 
 
 @typechecked
@@ -22,104 +28,129 @@ def apply_population_coding(
     adaptation_graph: nx.DiGraph,
     redundancy: int,
     plot_config: Plot_config,
+    selection: Optional[Selection_policy] = None,
+    integer_ids: bool = False,
     # m,
 ) -> nx.DiGraph:
     """
     :param adaptation_graph: Graph with the MDSA SNN approximation solution.
     :param m: The amount of approximation iterations used in the MDSA
     approximation.
-    """
-    adaptation_graph.graph["red_level"] = redundancy
-    original_edges = copy.deepcopy(adaptation_graph.edges)
-    # Create a copy of the original list of nodes of the input graph.
-    original_nodes = copy.deepcopy(adaptation_graph.nodes)
-    for node_name in original_nodes:
-        # Get input synapses as dictionaries, one per node, store as node
-        # attribute.
-        for red_level in range(1, redundancy + 1):
-            # Create redundant neurons.
-            if "connector_" not in node_name:
-                create_redundant_population_node(
-                    adaptation_graph=adaptation_graph,
-                    max_redundancy=redundancy,
-                    node_name=node_name,
-                    plot_config=plot_config,
-                    red_level=red_level,
-                )
-
-    for node_name in original_nodes:
-        if "connector_" not in node_name:
-            # TODO: overwrite original neuron with new properties.
-            ori_lif = adaptation_graph.nodes[node_name]["nx_lif"][0]
-            r_1_lif = adaptation_graph.nodes[f"r_1_{node_name}"]["nx_lif"][0]
-            ori_lif.bias = copy.deepcopy(r_1_lif.bias)
-            ori_lif.du = copy.deepcopy(r_1_lif.du)
-            ori_lif.dv = copy.deepcopy(r_1_lif.dv)
-            ori_lif.vth = copy.deepcopy(r_1_lif.vth)
-            # ori_lif.vth = Vth(red_neuron_props["vth"])
+    :param selection: Policy that selects the neurons that become a
+    population. All neurons are adapted if no selection is given.
+    :param integer_ids: If True, the adapted graph has dense integer node
+    ids, with the node names in the node_names graph attribute, see
+    plan.integer_ids.
 
-    add_population_synapses(
-        adaptation_graph=adaptation_graph,
-        original_edges=original_edges,
+    The adaptation_graph is not changed, the adapted graph is a copy.
+    """
+    delta: Adaptation_delta = get_population_coding_delta(
+        snn_graph=adaptation_graph,
         redundancy=redundancy,
+        plot_config=plot_config,
+        selection=selection,
+    )
+    if integer_ids:
+        return apply_adaptation_delta_with_integer_ids(
+            snn_graph=adaptation_graph, delta=delta
+        )
+    return apply_adaptation_delta(
+        adaptation_graph=copy.deepcopy(adaptation_graph), delta=delta
     )
-
-    return adaptation_graph
 
 
 @typechecked
-def create_redundant_population_node(
+def get_population_coding_delta(
     *,
-    adaptation_graph: nx.DiGraph,
-    max_redundancy: int,
-    node_name: str,
+    snn_graph: nx.DiGraph,
+    redundancy: int,
     plot_config: Plot_config,
-    red_level: int,
-) -> None:
-    """Create neuron and set coordinate position.
+    selection: Optional[Selection_policy] = None,
+) -> Adaptation_delta:
+    """Returns only the neurons and synapses that population coding adds or
+    changes, without changing or copying the snn_graph. Apply it with
+    apply_adaptation_delta, or with apply_adaptation_delta_with_integer_ids
+    for integer node ids.
 
-    :param d: Unit length of the spacing used in the positions of the nodes for
-    plotting.
-    :param adaptation_graph: Graph with the MDSA SNN approximation solution.
-    :param node_name: Node of the name of a networkx graph.
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    :param selection: Policy that selects the neurons that become a
+    population. All neurons are adapted if no selection is given.
     """
+    selected_nodes: Optional[Set[str]] = None
+    if selection is not None:
+        selected_nodes = select_neurons(
+            snn_graph=snn_graph,
+            adaptation_type="population",
+            redundancy=redundancy,
+            selection=selection,
+        )
+    plan: Adaptation_plan = compile_population_coding_plan(
+        snn_graph=snn_graph,
+        redundancy=redundancy,
+        selected_nodes=selected_nodes,
+    )
+    return get_adaptation_delta(
+        snn_graph=snn_graph, plan=plan, plot_config=plot_config
+    )
+
 
-    ori_lif = adaptation_graph.nodes[node_name]["nx_lif"][0]
-    bare_node_name = ori_lif.name
-    identifiers = ori_lif.identifiers
+@typechecked
+def compile_population_coding_plan(
+    *,
+    snn_graph: nx.DiGraph,
+    redundancy: int,
+    selected_nodes: Optional[Set[str]] = None,
+    stage: int = 0,
+) -> Adaptation_plan:
+    """Returns which redundant neurons and synapses population coding creates
+    for the topology of the snn_graph.
 
-    red_neuron_props: Dict[str, float] = get_population_neuron_properties(
-        adaptation_graph=adaptation_graph,
-        node_name=node_name,
-        max_redundancy=max_redundancy,
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    :param selected_nodes: The original neurons that become a population,
+    all neurons if None.
+    :param stage: The index of the adaptation stage, which prefixes the names
+    of the redundant neurons of later stages.
+    """
+    plan = Adaptation_plan("population", redundancy, snn_graph, stage)
+    add_population_coding_operations(
+        plan=plan,
+        adapted_nodes=[
+            node_name
+            for node_name in plan.original_nodes
+            if is_adaptable(node_name=node_name, adaptation_type="population")
+            and (selected_nodes is None or node_name in selected_nodes)
+        ],
+        original_edges=list(snn_graph.edges),
     )
+    return plan
+
+
+@typechecked
+def add_population_coding_operations(
+    *,
+    plan: Operation_sink,
+    adapted_nodes: List[str],
+    original_edges: Iterable[Tuple[str, str]],
+) -> None:
+    """Adds the redundant neurons and synapses of population coding to the
+    plan, for the adapted nodes.
 
-    # pylint: disable=R0801
-    lif_neuron = LIF_neuron(
-        name=f"r_{red_level}_{bare_node_name}",
-        bias=red_neuron_props["bias"],
-        du=red_neuron_props["du"],
-        dv=red_neuron_props["dv"],
-        vth=red_neuron_props["vth"],
-        pos=(
-            float(
-                adaptation_graph.nodes[node_name]["nx_lif"][0].pos[0]
-                + get_xy_point_on_circle(
-                    radius=plot_config.redundancy_radius,
-                    n=red_level,
-                    total_points=max_redundancy + 1,
-                )[0]
-            ),
-            float(
-                adaptation_graph.nodes[node_name]["nx_lif"][0].pos[1]
-                + get_xy_point_on_circle(
-                    radius=plot_config.redundancy_radius,
-                    n=red_level,
-                    total_points=max_redundancy + 1,
-                )[1]
-            ),
-        ),
-        identifiers=identifiers,
+    :param plan: Receives the operations of the adaptation.
+    :param adapted_nodes: The original neurons that become a population.
+    :param original_edges: The edges of the original graph.
+    """
+    redundancy: int = plan.redundancy
+    for node_name in adapted_nodes:
+        for red_level in range(1, redundancy + 1):
+            # Create redundant neurons.
+            plan.add_neuron(node_name, red_level)
+
+    for node_name in adapted_nodes:
+        # Overwrite original neuron with the population properties.
+        plan.add_overridden_neuron(node_name)
+
+    add_population_synapses(
+        plan=plan,
+        original_edges=original_edges,
+        redundancy=redundancy,
     )
-    adaptation_graph.add_node(lif_neuron.full_name)
-    adaptation_graph.nodes[lif_neuron.full_name]["nx_lif"] = [lif_neuron]
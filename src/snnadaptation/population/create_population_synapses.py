@@ -2,87 +2,155 @@
 
 TODO: check multiplies with 0, e.g. vth*red_level with vth =0.
 """
+from typing import Iterable, Tuple
 
-import networkx as nx
-from snnbackends.networkx.LIF_neuron import Synapse
 from typeguard import typechecked
 
+from snnadaptation.plan.Adaptation_plan import (
+    Operation_sink,
+    Synapse_operation,
+)
+from snnadaptation.selection.select_neurons import is_adaptable
+
 
 @typechecked
 def add_population_synapses(
     *,
-    adaptation_graph: nx.DiGraph,
-    original_edges: nx.classes.reportviews.OutEdgeView,
+    plan: Operation_sink,
+    original_edges: Iterable[Tuple[str, str]],
     redundancy: int,
 ) -> None:
     """Creates fully connected synapses.
 
-    :param adaptation_graph: Graph with the MDSA SNN approximation solution.
-    :param node_name: Node of the name of a networkx graph.
+    :param plan: Adaptation plan to which the synapses are added.
+    :param original_edges: The edges of the original graph.
     """
-    # pylint: disable=R1702
     # Loop through original edges:
     for original_edge in original_edges:
-        original_weight: float = adaptation_graph[original_edge[0]][
-            original_edge[1]
-        ]["synapse"].weight
         if (  # Else: recurrent edges do not need to be fully connected.
             original_edge[0] != original_edge[1]
         ):
             if "connector" not in original_edge[1]:
-                for left_red_level in range(0, redundancy + 1):
-                    for right_red_level in range(0, redundancy + 1):
-                        # else: original synapse already exists.
-                        if not (left_red_level == 0 and right_red_level == 0):
-                            if left_red_level == 0:
-                                left_node_name = original_edge[0]
-                            else:
-                                left_node_name = (
-                                    f"r_{left_red_level}_{original_edge[0]}"
-                                )
-                            if right_red_level == 0:
-                                right_node_name = original_edge[1]
-                            else:
-                                right_node_name = (
-                                    f"r_{right_red_level}_{original_edge[1]}"
-                                )
-                            add_synapse(
-                                adaptation_graph=adaptation_graph,
-                                left_node_name=left_node_name,
-                                original_weight=original_weight,
-                                right_node_name=right_node_name,
-                            )
+                add_projection_synapses(
+                    plan=plan,
+                    original_edge=original_edge,
+                    redundancy=redundancy,
+                )
         else:
             for red_level in range(1, redundancy + 1):
-                red_node_name = f"r_{red_level}_{original_edge[0]}"
+                red_node_name = plan.get_redundant_name(
+                    original_edge[0], red_level
+                )
                 add_synapse(
-                    adaptation_graph=adaptation_graph,
+                    plan=plan,
                     left_node_name=red_node_name,
-                    original_weight=original_weight,
+                    original_edge=original_edge,
                     right_node_name=red_node_name,
                 )
 
 
+@typechecked
+def add_projection_synapses(
+    *,
+    plan: Operation_sink,
+    original_edge: Tuple[str, str],
+    redundancy: int,
+) -> None:
+    """Connects every neuron of the population of the left node of the
+    original edge to every neuron of the population of its right node."""
+    plan.add_projection(original_edge)
+    weight_scale: float = get_population_weight_scale(
+        plan=plan,
+        original_edge=original_edge,
+        redundancy=redundancy,
+    )
+    if weight_scale != 1:
+        # Scale the original synapse, like its redundant synapses.
+        plan.add_synapse(
+            Synapse_operation(
+                original_edge[0],
+                original_edge[1],
+                weight_edge=original_edge,
+                weight_scale=weight_scale,
+            )
+        )
+    for left_red_level in range(0, redundancy + 1):
+        for right_red_level in range(0, redundancy + 1):
+            # else: original synapse already exists.
+            if not (left_red_level == 0 and right_red_level == 0):
+                if left_red_level == 0:
+                    left_node_name = original_edge[0]
+                else:
+                    left_node_name = plan.get_redundant_name(
+                        original_edge[0], left_red_level
+                    )
+                if right_red_level == 0:
+                    right_node_name = original_edge[1]
+                else:
+                    right_node_name = plan.get_redundant_name(
+                        original_edge[1], right_red_level
+                    )
+                add_synapse(
+                    plan=plan,
+                    left_node_name=left_node_name,
+                    original_edge=original_edge,
+                    right_node_name=right_node_name,
+                    weight_scale=weight_scale,
+                )
+
+
 @typechecked
 def add_synapse(
     *,
-    adaptation_graph: nx.DiGraph,
+    plan: Operation_sink,
     left_node_name: str,
-    original_weight: float,
+    original_edge: Tuple[str, str],
     right_node_name: str,
-    # redundancy: int,
+    weight_scale: float = 1,
 ) -> None:
-    """Adds a synapse within the population."""
+    """Adds a synapse within the population, with the weight of the original
+    edge."""
 
-    # Else: skip r_x_connector.
-    if left_node_name in adaptation_graph.nodes:
-        # print(f"add:{left_node_name, right_node_name}: {original_weight}")
-        adaptation_graph.add_edges_from(
-            [(left_node_name, right_node_name)],
-            synapse=Synapse(
-                weight=original_weight,
-                delay=0,
-                change_per_t=0,
-            ),
-            is_redundant=True,
+    # Else: skip r_x_connector, or neurons that are not selected.
+    if plan.has_neuron(left_node_name) and plan.has_neuron(right_node_name):
+        plan.add_synapse(
+            Synapse_operation(
+                left_node_name,
+                right_node_name,
+                weight_edge=original_edge,
+                is_redundant=True,
+                weight_scale=weight_scale,
+            )
         )
+
+
+@typechecked
+def get_population_weight_scale(
+    *,
+    plan: Operation_sink,
+    original_edge: Tuple[str, str],
+    redundancy: int,
+) -> float:
+    """Returns the factor with which the synapses of an original edge are
+    scaled, if only some neurons are adapted.
+
+    The properties of an adapted neuron assume it receives input from
+    every neuron of the population of its input neuron, and an unadapted
+    neuron assumes it receives input from a single neuron. So the total
+    input of a spike of the (population of the) left neuron is kept equal
+    to that of the fully adapted network.
+    """
+    left_size: int = 1
+    if plan.has_neuron(plan.get_redundant_name(original_edge[0], 1)):
+        left_size = redundancy + 1
+
+    expected_left_size: int = 1
+    if plan.has_neuron(
+        plan.get_redundant_name(original_edge[1], 1)
+    ) and is_adaptable(
+        node_name=original_edge[0], adaptation_type="population"
+    ):
+        expected_left_size = redundancy + 1
+    if left_size == expected_left_size:
+        return 1
+    return expected_left_size / left_size
@@ -1,13 +1,34 @@
 """Applies brain adaptation to a MDSA SNN graph."""
 import copy
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 import networkx as nx
-from snnbackends.networkx.LIF_neuron import Identifier, LIF_neuron, Synapse
 from snncompare.export_plots.Plot_config import Plot_config
 from typeguard import typechecked
 
-from snnadaptation.Adaptation import get_xy_point_on_circle
+from snnadaptation.plan.Adaptation_delta import Adaptation_delta
+from snnadaptation.plan.Adaptation_plan import (
+    Adaptation_plan,
+    Operation_sink,
+    Synapse_operation,
+)
+from snnadaptation.plan.apply_adaptation_plan import (
+    apply_adaptation_delta,
+    get_adaptation_delta,
+)
+from snnadaptation.plan.integer_ids import (
+    apply_adaptation_delta_with_integer_ids,
+)
+from snnadaptation.selection.select_neurons import select_neurons
+from snnadaptation.selection.Selection_policy import Selection_policy
+
+# The weight of the synapses that inhibit the redundant neurons.
+inhibition_weight: float = -100
+# The weight of the self-loops of the redundant selector neurons.
+selector_recurrent_weight: float = 4
+# The weight of the synapses from the next_round neurons into the redundant
+# selector neurons.
+next_round_selector_weight: float = 1
 
 
 @typechecked
@@ -16,396 +37,311 @@ def apply_sparse_redundancy(
     adaptation_graph: nx.DiGraph,
     redundancy: int,
     plot_config: Plot_config,
+    selection: Optional[Selection_policy] = None,
+    integer_ids: bool = False,
     # m,
 ) -> nx.DiGraph:
     """
     :param adaptation_graph: Graph with the MDSA SNN approximation solution.
     :param m: The amount of approximation iterations used in the MDSA
     approximation.
+    :param selection: Policy that selects the neurons that get redundant
+    neurons. All neurons are adapted if no selection is given.
+    :param integer_ids: If True, the adapted graph has dense integer node
+    ids, with the node names in the node_names graph attribute, see
+    plan.integer_ids.
+
+    The adaptation_graph is not changed, the adapted graph is a copy.
     """
-    adaptation_graph.graph["red_level"] = redundancy
-
-    # Create a copy of the original list of nodes of the input graph.
-    original_nodes = copy.deepcopy(adaptation_graph.nodes)
-    for node_name in original_nodes:
-        # Get input synapses as dictionaries, one per node, store as node
-        # attribute.
-        store_input_synapses(
-            adaptation_graph=adaptation_graph, node_name=node_name
+    delta: Adaptation_delta = get_sparse_redundancy_delta(
+        snn_graph=adaptation_graph,
+        redundancy=redundancy,
+        plot_config=plot_config,
+        selection=selection,
+    )
+    if integer_ids:
+        return apply_adaptation_delta_with_integer_ids(
+            snn_graph=adaptation_graph, delta=delta
         )
+    return apply_adaptation_delta(
+        adaptation_graph=copy.deepcopy(adaptation_graph), delta=delta
+    )
+
 
-        # Get output synapses as dictionaries, one per node, store as node
-        # attribute.
-        store_output_synapses(
-            adaptation_graph=adaptation_graph, node_name=node_name
+@typechecked
+def get_sparse_redundancy_delta(
+    *,
+    snn_graph: nx.DiGraph,
+    redundancy: int,
+    plot_config: Plot_config,
+    selection: Optional[Selection_policy] = None,
+) -> Adaptation_delta:
+    """Returns only the neurons and synapses that sparse redundancy adds or
+    changes, without changing or copying the snn_graph. Apply it with
+    apply_adaptation_delta, or with apply_adaptation_delta_with_integer_ids
+    for integer node ids.
+
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    :param selection: Policy that selects the neurons that get redundant
+    neurons. All neurons are adapted if no selection is given.
+    """
+    selected_nodes: Optional[Set[str]] = None
+    if selection is not None:
+        selected_nodes = select_neurons(
+            snn_graph=snn_graph,
+            adaptation_type="redundancy",
+            redundancy=redundancy,
+            selection=selection,
         )
+    plan: Adaptation_plan = compile_sparse_redundancy_plan(
+        snn_graph=snn_graph,
+        redundancy=redundancy,
+        selected_nodes=selected_nodes,
+    )
+    return get_adaptation_delta(
+        snn_graph=snn_graph, plan=plan, plot_config=plot_config
+    )
+
+
+@typechecked
+def compile_sparse_redundancy_plan(
+    *,
+    snn_graph: nx.DiGraph,
+    redundancy: int,
+    selected_nodes: Optional[Set[str]] = None,
+    stage: int = 0,
+) -> Adaptation_plan:
+    """Returns which redundant neurons and synapses sparse redundancy creates
+    for the topology of the snn_graph.
+
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    :param selected_nodes: The original neurons that get redundant neurons,
+    all neurons if None.
+    :param stage: The index of the adaptation stage, which prefixes the names
+    of the redundant neurons of later stages.
+    """
+    plan = Adaptation_plan("redundancy", redundancy, snn_graph, stage)
+    input_edges, output_edges = get_input_and_output_edges(snn_graph=snn_graph)
+    add_sparse_redundancy_operations(
+        plan=plan,
+        adapted_nodes=[
+            node_name
+            for node_name in plan.original_nodes
+            if selected_nodes is None or node_name in selected_nodes
+        ],
+        get_input_edges=input_edges.__getitem__,
+        get_output_edges=output_edges.__getitem__,
+    )
+    return plan
+
+
+@typechecked
+def add_sparse_redundancy_operations(
+    *,
+    plan: Operation_sink,
+    adapted_nodes: List[str],
+    get_input_edges: Callable[[str], List[Tuple[str, str]]],
+    get_output_edges: Callable[[str], List[Tuple[str, str]]],
+) -> None:
+    """Adds the redundant neurons and synapses of sparse redundancy to the
+    plan, for the adapted nodes.
+
+    :param plan: Receives the operations of the adaptation.
+    :param adapted_nodes: The original neurons that get redundant neurons.
+    :param get_input_edges: Returns the incoming edges of an original node.
+    :param get_output_edges: Returns the outgoing edges of an original node.
+    """
+    redundancy: int = plan.redundancy
+    for node_name in adapted_nodes:
         for red_level in range(1, redundancy + 1):
             # Create redundant neurons.
-            create_redundant_node(
-                adaptation_graph=adaptation_graph,
-                node_name=node_name,
-                plot_config=plot_config,
-                red_level=red_level,
-                max_redundancy=redundancy,
-            )
+            plan.add_neuron(node_name, red_level)
 
     for red_level in range(1, redundancy + 1):
         # Start new loop before adding edges, because all redundant neurons
         # need to exist before creating synapses.
-        for node_name in original_nodes:
+        for node_name in adapted_nodes:
             # Add input synapses to redundant node.
             add_input_synapses(
-                adaptation_graph=adaptation_graph,
+                plan=plan,
+                input_edges=get_input_edges(node_name),
                 node_name=node_name,
                 red_level=red_level,
             )
 
             # Add output synapses to redundant node.
             add_output_synapses(
-                adaptation_graph=adaptation_graph,
+                plan=plan,
+                output_edges=get_output_edges(node_name),
                 node_name=node_name,
                 red_level=red_level,
             )
-            add_inhibitory_outgoing_synapses(
-                adaptation_graph=adaptation_graph,
-                node_name=node_name,
-                max_red_level=redundancy,
-            )
-
-            # Add inhibitory synapse from node to redundant node.
-            # add_inhibitory_synapse(
-            #    adaptation_graph=adaptation_graph,
-            #    node_name=node_name,
-            #    red_level=red_level,
-            # )
+            if red_level == 1:
+                add_inhibitory_outgoing_synapses(
+                    plan=plan,
+                    node_name=node_name,
+                    max_red_level=redundancy,
+                )
 
             add_recurrent_inhibitiory_synapses(
-                adaptation_graph=adaptation_graph,
+                plan=plan,
                 node_name=node_name,
                 red_level=red_level,
             )
-    return adaptation_graph
-
-
-@typechecked
-def store_input_synapses(
-    *, adaptation_graph: nx.DiGraph, node_name: str
-) -> None:
-    """
 
-    :param adaptation_graph: Graph with the MDSA SNN approximation solution.
-    :param node_name: Node of the name of a networkx graph.
-
-    """
-    input_edges = []
-    for edge in adaptation_graph.edges:
-        if edge[1] == node_name:
-            input_edges.append(edge)
-    adaptation_graph.nodes[node_name]["input_edges"] = input_edges
-
-
-@typechecked
-def store_output_synapses(
-    *, adaptation_graph: nx.DiGraph, node_name: str
-) -> None:
-    """
-
-    :param adaptation_graph: Graph with the MDSA SNN approximation solution.
-    :param node_name: Node of the name of a networkx graph.
-
-    """
-    output_edges = []
-    for edge in adaptation_graph.edges:
-        if edge[0] == node_name:
-            output_edges.append(edge)
-    adaptation_graph.nodes[node_name]["output_edges"] = output_edges
-
-
-@typechecked
-def create_redundant_node(
-    *,
-    adaptation_graph: nx.DiGraph,
-    max_redundancy: int,
-    node_name: str,
-    plot_config: Plot_config,
-    red_level: int,
-) -> None:
-    """Create neuron and set coordinate position.
-
-    :param d: Unit length of the spacing used in the positions of the nodes for
-    plotting.
-    :param adaptation_graph: Graph with the MDSA SNN approximation solution.
-    :param node_name: Node of the name of a networkx graph.
-    """
-
-    # TODO: include spike={}, is_redundant=True,
-    ori_lif = adaptation_graph.nodes[node_name]["nx_lif"][0]
-    bare_node_name = ori_lif.name
-    identifiers = ori_lif.identifiers
-
-    redundant_neuron_properties: Dict[
-        str, float
-    ] = computer_red_neuron_properties(
-        adaptation_graph=adaptation_graph,
-        node_name=node_name,
-        red_level=red_level,
-    )
-    lif_neuron = LIF_neuron(
-        name=f"r_{red_level}_{bare_node_name}",
-        bias=redundant_neuron_properties["bias"],
-        du=redundant_neuron_properties["du"],
-        dv=redundant_neuron_properties["dv"],
-        vth=redundant_neuron_properties["vth"],
-        pos=(
-            float(
-                adaptation_graph.nodes[node_name]["nx_lif"][0].pos[0]
-                + get_xy_point_on_circle(
-                    radius=plot_config.redundancy_radius,
-                    n=red_level,
-                    total_points=max_redundancy + 1,
-                )[0]
-            ),
-            float(
-                adaptation_graph.nodes[node_name]["nx_lif"][0].pos[1]
-                + get_xy_point_on_circle(
-                    radius=plot_config.redundancy_radius,
-                    n=red_level,
-                    total_points=max_redundancy + 1,
-                )[1]
-            ),
-        ),
-        identifiers=identifiers,
-    )
-
-    adaptation_graph.add_node(lif_neuron.full_name)
-    adaptation_graph.nodes[lif_neuron.full_name]["nx_lif"] = [lif_neuron]
-
-
-@typechecked
-def computer_red_neuron_properties(
-    *, adaptation_graph: nx.DiGraph, node_name: str, red_level: int
-) -> Dict[str, float]:
-    """Computes the redundant neuron properties such that they take over in the
-    right settings."""
-    if node_name[:9] != "selector_" and node_name[:11] != "next_round_":
-        # if node_name[:9] != "selector_":
-        bias = adaptation_graph.nodes[node_name]["nx_lif"][0].bias.get()
-        du = adaptation_graph.nodes[node_name]["nx_lif"][0].du.get()
-        dv = adaptation_graph.nodes[node_name]["nx_lif"][0].dv.get()
-        vth = compute_vth_for_delay(  # Different vals for different neurons.
-            adaptation_graph=adaptation_graph,
+    # The inhibitory synapses overwrite the input synapses of a redundant node
+    # from its own original node (of a recurrent edge) at each red_level.
+    for node_name in adapted_nodes:
+        add_inhibitory_outgoing_synapses(
+            plan=plan,
             node_name=node_name,
-            red_level=red_level,
+            max_red_level=redundancy,
         )
-    elif node_name[:11] == "next_round_":
-        bias = adaptation_graph.nodes[node_name]["nx_lif"][0].bias.get()
-        du = adaptation_graph.nodes[node_name]["nx_lif"][0].du.get()
-        dv = adaptation_graph.nodes[node_name]["nx_lif"][0].dv.get()
-        vth = adaptation_graph.nodes[node_name]["nx_lif"][0].vth.get()
-    else:
-        m_val_identifier: Identifier = adaptation_graph.nodes[node_name][
-            "nx_lif"
-        ][0].identifiers[1]
-        if m_val_identifier.description == "m_val":
-            if m_val_identifier.value == 0:
-                bias = 1.0
-                du = 0.1
-                dv = 0.0
-                vth = float(red_level)
-            else:
-                # Designed using neuron discovery grid search. Limited to a
-                # redundancy of max 4, because after that adding +1 to vth
-                # does not result in the selector neuron spiking 1 timestep
-                # later (w.r.t. an incoming spike at fixed arbitrary time t).
-                bias = 0.0
-                du = 0.1
-                dv = 0.0
-                vth = float(red_level)  # Add delay in when redundant redundant
-                # etc. neurons take over.
-        else:
-            raise ValueError(
-                "Error, node identifier was not m_val for selector node."
-            )
-
-    return {
-        "bias": bias,
-        "du": du,
-        "dv": dv,
-        "vth": vth,
-    }
 
 
 @typechecked
-def compute_vth_for_delay(
-    *, adaptation_graph: nx.DiGraph, node_name: str, red_level: int
-) -> float:
-    """Increases vth with 1 to realise a delay of t=1 for the redundant
-    spike_once neurons, rand neurons and selector neurons.
+def get_input_and_output_edges(
+    *, snn_graph: nx.DiGraph
+) -> Tuple[Dict[str, List[Tuple[str, str]]], Dict[str, List[Tuple[str, str]]]]:
+    """Returns the input and output edges per node, in a single pass over the
+    edges.
 
-    Returns dv of default node otherwise.
-
-    :param adaptation_graph: Graph with the MDSA SNN approximation solution.
-    :param node_name: Node of the name of a networkx graph.
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
     """
-    if node_name[:11] == "next_round_":
-        vth = adaptation_graph.nodes[node_name]["nx_lif"][0].vth.get() + 1
-    elif (
-        node_name[:16] == "degree_receiver_"
-        or node_name[:11] == "spike_once_"
-        or node_name[:5] == "rand_"
-    ):
-        vth = (
-            adaptation_graph.nodes[node_name]["nx_lif"][0].vth.get()
-            + red_level
-        )
-    else:
-        vth = adaptation_graph.nodes[node_name]["nx_lif"][0].vth.get()
-    return vth
+    input_edges: Dict[str, List[Tuple[str, str]]] = {
+        node_name: [] for node_name in snn_graph.nodes
+    }
+    output_edges: Dict[str, List[Tuple[str, str]]] = {
+        node_name: [] for node_name in snn_graph.nodes
+    }
+    for edge in snn_graph.edges:
+        output_edges[edge[0]].append(edge)
+        input_edges[edge[1]].append(edge)
+    return input_edges, output_edges
 
 
 @typechecked
 def add_input_synapses(
-    *, adaptation_graph: nx.DiGraph, node_name: str, red_level: int
+    *,
+    plan: Operation_sink,
+    input_edges: List[Tuple[str, str]],
+    node_name: str,
+    red_level: int,
 ) -> None:
     """
 
-    :param adaptation_graph: Graph with the MDSA SNN approximation solution.
+    :param plan: Adaptation plan to which the synapses are added.
+    :param input_edges: The incoming edges of the original node.
     :param node_name: Node of the name of a networkx graph.
 
     """
-    for edge in adaptation_graph.nodes[node_name]["input_edges"]:
+    for edge in input_edges:
         # Compute set edge weight
         left_node_name = edge[0]
-        right_node_name = f"r_{red_level}_{node_name}"
-
-        if node_name[:9] == "selector_" and edge[0][:11] == "next_round_":
-            # The redundant selector neurons only start firing n seconds after
-            # the next_round neuron has fired.
-            weight = 1
-        else:
-            weight = adaptation_graph[edge[0]][edge[1]]["synapse"].weight
+        right_node_name = plan.get_redundant_name(node_name, red_level)
 
         edges: List[Tuple[str, str]] = [(left_node_name, right_node_name)]
-        if left_node_name[:11] == "next_round_":
-            # print(f'add:{(left_node_name, right_node_name)}')
-            edges.append((f"r_{red_level}_{left_node_name}", right_node_name))
-
-        # Create edge
-        adaptation_graph.add_edges_from(
-            edges,
-            synapse=Synapse(
-                weight=weight,
-                delay=0,
-                change_per_t=0,
-            ),
-            is_redundant=True,
-        )
-    # if node_name == "selector_0_1":
-    # exit()
+        red_left_node_name = plan.get_redundant_name(left_node_name, red_level)
+        if left_node_name[:11] == "next_round_" and plan.has_neuron(
+            red_left_node_name
+        ):
+            edges.append((red_left_node_name, right_node_name))
+
+        for left, right in edges:
+            if node_name[:9] == "selector_" and edge[0][:11] == "next_round_":
+                # The redundant selector neurons only start firing n seconds
+                # after the next_round neuron has fired.
+                synapse_operation = Synapse_operation(
+                    left,
+                    right,
+                    weight=next_round_selector_weight,
+                    is_redundant=True,
+                )
+            else:
+                synapse_operation = Synapse_operation(
+                    left, right, weight_edge=edge, is_redundant=True
+                )
+            plan.add_synapse(synapse_operation)
 
 
 @typechecked
 def add_output_synapses(
-    *, adaptation_graph: nx.DiGraph, node_name: str, red_level: int
+    *,
+    plan: Operation_sink,
+    output_edges: List[Tuple[str, str]],
+    node_name: str,
+    red_level: int,
 ) -> None:
     """
 
-    :param adaptation_graph: Graph with the MDSA SNN approximation solution.
+    :param plan: Adaptation plan to which the synapses are added.
+    :param output_edges: The outgoing edges of the original node.
     :param node_name: Node of the name of a networkx graph.
 
     """
-    adaptation_graph.add_edges_from(
-        adaptation_graph.nodes[node_name]["output_edges"]
-    )
-    for edge in adaptation_graph.nodes[node_name]["output_edges"]:
-        # Compute set edge weight
-        left_node_name = f"r_{red_level}_{node_name}"
-        right_node_name = edge[1]
-        weight = adaptation_graph[edge[0]][edge[1]]["synapse"].weight
-
-        adaptation_graph.add_edges_from(
-            [(left_node_name, right_node_name)],
-            synapse=Synapse(
-                weight=weight,
-                delay=0,
-                change_per_t=0,
-            ),
-            is_redundant=True,
+    for edge in output_edges:
+        plan.add_synapse(
+            Synapse_operation(
+                plan.get_redundant_name(node_name, red_level),
+                edge[1],
+                weight_edge=edge,
+                is_redundant=True,
+            )
         )
 
 
 @typechecked
 def add_inhibitory_outgoing_synapses(
-    *, adaptation_graph: nx.DiGraph, node_name: str, max_red_level: int
+    *, plan: Operation_sink, node_name: str, max_red_level: int
 ) -> None:
     """Adds inhibitory synapse for selector neuron."""
+    if "counter" in node_name:
+        return
 
-    edges = []
     # Add edge from selector into redundant selectors
     for red_level in range(1, max_red_level + 1):
-        if "counter" not in node_name:
-            edges.append((node_name, f"r_{red_level}_{node_name}"))
+        plan.add_synapse(
+            Synapse_operation(
+                node_name,
+                plan.get_redundant_name(node_name, red_level),
+                weight=inhibition_weight,
+                is_redundant=True,
+            )
+        )
 
         # Add edge from redundant selector to remaining redundant selectors
         for right_red_level in range(red_level + 1, max_red_level + 1):
-            # if "counter" in node_name:
-            # print(f'recurrent counter edge!')
-            # exit()
-            if "counter" not in node_name:
-                edges.append(
-                    (
-                        f"r_{red_level}_{node_name}",
-                        f"r_{right_red_level}_{node_name}",
-                    )
+            plan.add_synapse(
+                Synapse_operation(
+                    plan.get_redundant_name(node_name, red_level),
+                    plan.get_redundant_name(node_name, right_red_level),
+                    weight=inhibition_weight,
+                    is_redundant=True,
                 )
-    adaptation_graph.add_edges_from(
-        edges,
-        synapse=Synapse(
-            weight=-100,
-            delay=0,
-            change_per_t=0,
-        ),
-        is_redundant=True,
-    )
+            )
 
 
 @typechecked
 def add_recurrent_inhibitiory_synapses(
-    *, adaptation_graph: nx.DiGraph, node_name: str, red_level: int
+    *, plan: Operation_sink, node_name: str, red_level: int
 ) -> None:
     """
 
-    :param adaptation_graph: Graph with the MDSA SNN approximation solution.
+    :param plan: Adaptation plan to which the synapses are added.
     :param node_name: Node of the name of a networkx graph.
 
     """
-
-    if "recur" in adaptation_graph.nodes[node_name].keys():
+    red_node_name = plan.get_redundant_name(node_name, red_level)
+    if node_name in plan.recurrent_nodes:
         if "counter" not in node_name:
-            adaptation_graph.add_edges_from(
-                [
-                    (
-                        f"r_{red_level}_{node_name}",
-                        f"r_{red_level}_{node_name}",
-                    )
-                ],
-                synapse=Synapse(
-                    weight=adaptation_graph.nodes[node_name]["recur"],
-                    delay=0,
-                    change_per_t=0,
-                ),
+            plan.add_synapse(
+                Synapse_operation(
+                    red_node_name, red_node_name, weight_recur=node_name
+                )
             )
     if node_name[:9] == "selector_":
-        adaptation_graph.add_edges_from(
-            [
-                (
-                    f"r_{red_level}_{node_name}",
-                    f"r_{red_level}_{node_name}",
-                )
-            ],
-            synapse=Synapse(
-                weight=4,
-                delay=0,
-                change_per_t=0,
-            ),
+        plan.add_synapse(
+            Synapse_operation(
+                red_node_name, red_node_name, weight=selector_recurrent_weight
+            )
         )
@@ -0,0 +1,88 @@
+"""Creates the redundant sparse neuron properties, per neuron type."""
+from typing import Dict
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import Identifier
+from typeguard import typechecked
+
+
+@typechecked
+def computer_red_neuron_properties(
+    *, adaptation_graph: nx.DiGraph, node_name: str, red_level: int
+) -> Dict[str, float]:
+    """Computes the redundant neuron properties such that they take over in the
+    right settings."""
+    if node_name[:9] != "selector_" and node_name[:11] != "next_round_":
+        # if node_name[:9] != "selector_":
+        bias = adaptation_graph.nodes[node_name]["nx_lif"][0].bias.get()
+        du = adaptation_graph.nodes[node_name]["nx_lif"][0].du.get()
+        dv = adaptation_graph.nodes[node_name]["nx_lif"][0].dv.get()
+        vth = compute_vth_for_delay(  # Different vals for different neurons.
+            adaptation_graph=adaptation_graph,
+            node_name=node_name,
+            red_level=red_level,
+        )
+    elif node_name[:11] == "next_round_":
+        bias = adaptation_graph.nodes[node_name]["nx_lif"][0].bias.get()
+        du = adaptation_graph.nodes[node_name]["nx_lif"][0].du.get()
+        dv = adaptation_graph.nodes[node_name]["nx_lif"][0].dv.get()
+        vth = adaptation_graph.nodes[node_name]["nx_lif"][0].vth.get()
+    else:
+        m_val_identifier: Identifier = adaptation_graph.nodes[node_name][
+            "nx_lif"
+        ][0].identifiers[1]
+        if m_val_identifier.description == "m_val":
+            if m_val_identifier.value == 0:
+                bias = 1.0
+                du = 0.1
+                dv = 0.0
+                vth = float(red_level)
+            else:
+                # Designed using neuron discovery grid search. Limited to a
+                # redundancy of max 4, because after that adding +1 to vth
+                # does not result in the selector neuron spiking 1 timestep
+                # later (w.r.t. an incoming spike at fixed arbitrary time t).
+                bias = 0.0
+                du = 0.1
+                dv = 0.0
+                vth = float(red_level)  # Add delay in when redundant redundant
+                # etc. neurons take over.
+        else:
+            raise ValueError(
+                "Error, node identifier was not m_val for selector node."
+            )
+
+    return {
+        "bias": bias,
+        "du": du,
+        "dv": dv,
+        "vth": vth,
+    }
+
+
+@typechecked
+def compute_vth_for_delay(
+    *, adaptation_graph: nx.DiGraph, node_name: str, red_level: int
+) -> float:
+    """Increases vth with 1 to realise a delay of t=1 for the redundant
+    spike_once neurons, rand neurons and selector neurons.
+
+    Returns dv of default node otherwise.
+
+    :param adaptation_graph: Graph with the MDSA SNN approximation solution.
+    :param node_name: Node of the name of a networkx graph.
+    """
+    if node_name[:11] == "next_round_":
+        vth = adaptation_graph.nodes[node_name]["nx_lif"][0].vth.get() + 1
+    elif (
+        node_name[:16] == "degree_receiver_"
+        or node_name[:11] == "spike_once_"
+        or node_name[:5] == "rand_"
+    ):
+        vth = (
+            adaptation_graph.nodes[node_name]["nx_lif"][0].vth.get()
+            + red_level
+        )
+    else:
+        vth = adaptation_graph.nodes[node_name]["nx_lif"][0].vth.get()
+    return vth
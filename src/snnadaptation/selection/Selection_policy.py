@@ -0,0 +1,63 @@
+"""Contains the selection of the neurons that are adapted."""
+# pylint: disable=R0903
+from typing import List, Optional
+
+from typeguard import typechecked
+
+from snnadaptation.neuron_roles import neuron_roles
+
+criticality_scores: List[str] = ["fan_out", "fan_in", "degree"]
+
+
+class Selection_policy:
+    """Specification of which neurons get redundant neurons. Neurons can be
+    selected by role and/or by an explicit set of node names. Optionally, the
+    selected neurons are ranked by a criticality score, and only the most
+    critical neurons that fit within a neuron and/or synapse budget are
+    adapted."""
+
+    @typechecked
+    def __init__(
+        self,
+        roles: Optional[List[str]] = None,
+        node_names: Optional[List[str]] = None,
+        max_neurons: Optional[int] = None,
+        max_synapses: Optional[int] = None,
+        criticality: str = "fan_out",
+    ) -> None:
+        self.roles: Optional[List[str]] = roles
+        if self.roles is not None:
+            for role in self.roles:
+                if role not in neuron_roles:
+                    raise NotImplementedError(
+                        f"Error, role:{role} not supported."
+                    )
+        self.node_names: Optional[List[str]] = node_names
+        self.max_neurons: Optional[int] = max_neurons
+        self.max_synapses: Optional[int] = max_synapses
+        for budget in [self.max_neurons, self.max_synapses]:
+            if budget is not None and budget < 0:
+                raise ValueError("Error, a budget can not be negative.")
+        self.criticality: str = criticality
+        if self.criticality not in criticality_scores:
+            raise NotImplementedError(
+                f"Error, {self.criticality} not supported."
+            )
+
+    @typechecked
+    def get_name(
+        self,
+    ) -> str:
+        """Returns a name that identifies the selection."""
+        name_parts: List[str] = []
+        if self.roles is not None:
+            name_parts.append(f"roles={'+'.join(sorted(self.roles))}")
+        if self.node_names is not None:
+            name_parts.append(f"nodes={'+'.join(sorted(self.node_names))}")
+        if self.max_neurons is not None:
+            name_parts.append(f"max_neurons={self.max_neurons}")
+        if self.max_synapses is not None:
+            name_parts.append(f"max_synapses={self.max_synapses}")
+        if self.max_neurons is not None or self.max_synapses is not None:
+            name_parts.append(f"criticality={self.criticality}")
+        return "_".join(name_parts)
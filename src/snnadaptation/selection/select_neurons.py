@@ -0,0 +1,197 @@
+"""Selects the neurons that get redundant neurons, based on a selection
+policy."""
+from typing import List, Set
+
+import networkx as nx
+from typeguard import typechecked
+
+from snnadaptation.neuron_roles import get_neuron_role
+from snnadaptation.selection.Selection_policy import Selection_policy
+
+
+@typechecked
+def select_neurons(
+    *,
+    snn_graph: nx.DiGraph,
+    adaptation_type: str,
+    redundancy: int,
+    selection: Selection_policy,
+) -> Set[str]:
+    """Returns the names of the original neurons that are adapted.
+
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    :param adaptation_type: The adaptation type that is applied.
+    :param redundancy: The amount of redundant neurons per adapted neuron.
+    :param selection: The policy that determines which neurons are adapted.
+    """
+    if selection.node_names is not None:
+        for node_name in selection.node_names:
+            if node_name not in snn_graph.nodes:
+                raise ValueError(f"Error, {node_name} is not in the graph.")
+
+    candidates: List[str] = [
+        node_name
+        for node_name in snn_graph.nodes
+        if is_adaptable(node_name=node_name, adaptation_type=adaptation_type)
+        and (
+            selection.roles is None
+            or get_neuron_role(node_name=node_name) in selection.roles
+        )
+        and (selection.node_names is None or node_name in selection.node_names)
+    ]
+    if selection.max_neurons is None and selection.max_synapses is None:
+        return set(candidates)
+
+    # Select the most critical neurons first, within the budget.
+    candidates.sort(
+        key=lambda node_name: -get_criticality(
+            snn_graph=snn_graph,
+            node_name=node_name,
+            criticality=selection.criticality,
+        )
+    )
+    selected_nodes: Set[str] = set()
+    nr_of_neurons: int = 0
+    nr_of_synapses: int = 0
+    for node_name in candidates:
+        added_synapses: int = get_nr_of_added_synapses(
+            snn_graph=snn_graph,
+            adaptation_type=adaptation_type,
+            node_name=node_name,
+            redundancy=redundancy,
+            selected_nodes=selected_nodes,
+        )
+        if (
+            selection.max_neurons is None
+            or nr_of_neurons + redundancy <= selection.max_neurons
+        ) and (
+            selection.max_synapses is None
+            or nr_of_synapses + added_synapses <= selection.max_synapses
+        ):
+            selected_nodes.add(node_name)
+            nr_of_neurons += redundancy
+            nr_of_synapses += added_synapses
+    return selected_nodes
+
+
+@typechecked
+def is_adaptable(*, node_name: str, adaptation_type: str) -> bool:
+    """Returns True if the adaptation type creates redundant neurons for the
+    node."""
+    if adaptation_type == "population":
+        return "connector_" not in node_name
+    return True
+
+
+@typechecked
+def get_criticality(
+    *, snn_graph: nx.DiGraph, node_name: str, criticality: str
+) -> int:
+    """Returns the criticality score of a neuron."""
+    if criticality == "fan_out":
+        return snn_graph.out_degree(node_name)
+    if criticality == "fan_in":
+        return snn_graph.in_degree(node_name)
+    if criticality == "degree":
+        return snn_graph.degree(node_name)
+    raise NotImplementedError(f"Error, {criticality} not supported.")
+
+
+@typechecked
+def get_nr_of_added_synapses(
+    *,
+    snn_graph: nx.DiGraph,
+    adaptation_type: str,
+    node_name: str,
+    redundancy: int,
+    selected_nodes: Set[str],
+) -> int:
+    """Returns the amount of synapses that are added if node_name is adapted,
+    given the neurons that are already selected."""
+    if adaptation_type == "redundancy":
+        return get_nr_of_added_sparse_synapses(
+            snn_graph=snn_graph,
+            node_name=node_name,
+            redundancy=redundancy,
+            selected_nodes=selected_nodes,
+        )
+    if adaptation_type == "population":
+        return get_nr_of_added_population_synapses(
+            snn_graph=snn_graph,
+            node_name=node_name,
+            redundancy=redundancy,
+            selected_nodes=selected_nodes,
+        )
+    raise NotImplementedError(f"Error, {adaptation_type} not supported.")
+
+
+@typechecked
+def get_nr_of_added_sparse_synapses(
+    *,
+    snn_graph: nx.DiGraph,
+    node_name: str,
+    redundancy: int,
+    selected_nodes: Set[str],
+) -> int:
+    """Returns the amount of synapses apply_sparse_redundancy adds for an
+    adapted neuron, given the neurons that are already adapted."""
+    nr_of_synapses: int = 0
+    for left, _ in snn_graph.in_edges(node_name):
+        if left != node_name:
+            nr_of_synapses += redundancy
+            if left[:11] == "next_round_" and left in selected_nodes:
+                nr_of_synapses += redundancy
+    for _, right in snn_graph.out_edges(node_name):
+        # Includes the synapse from a redundant neuron into its own original.
+        nr_of_synapses += redundancy
+        if (
+            right != node_name
+            and node_name[:11] == "next_round_"
+            and right in selected_nodes
+        ):
+            nr_of_synapses += redundancy
+
+    if "counter" not in node_name:
+        # Inhibition from the original and from the lower redundant neurons.
+        nr_of_synapses += redundancy + redundancy * (redundancy - 1) // 2
+    elif snn_graph.has_edge(node_name, node_name):
+        nr_of_synapses += redundancy
+
+    if (
+        (
+            node_name[:11] == "next_round_"
+            and snn_graph.has_edge(node_name, node_name)
+        )
+        or (
+            "recur" in snn_graph.nodes[node_name]
+            and "counter" not in node_name
+        )
+        or node_name[:9] == "selector_"
+    ):
+        # Recurrent synapse of each redundant neuron.
+        nr_of_synapses += redundancy
+    return nr_of_synapses
+
+
+@typechecked
+def get_nr_of_added_population_synapses(
+    *,
+    snn_graph: nx.DiGraph,
+    node_name: str,
+    redundancy: int,
+    selected_nodes: Set[str],
+) -> int:
+    """Returns the amount of synapses apply_population_coding adds for an
+    adapted neuron, given the neurons that are already adapted."""
+    nr_of_synapses: int = 0
+    for left, _ in snn_graph.in_edges(node_name):
+        if left != node_name and "connector" not in node_name:
+            left_size = 1 + redundancy * int(left in selected_nodes)
+            nr_of_synapses += left_size * (1 + redundancy) - left_size
+    for _, right in snn_graph.out_edges(node_name):
+        if right == node_name:
+            nr_of_synapses += redundancy
+        elif "connector" not in right:
+            right_size = 1 + redundancy * int(right in selected_nodes)
+            nr_of_synapses += (1 + redundancy) * right_size - right_size
+    return nr_of_synapses
@@ -0,0 +1,215 @@
+"""Converts SNN graphs from and to json in the node-link format of networkx,
+with the LIF neurons and synapses written as plain json objects."""
+import json
+import warnings
+from typing import Any, Dict, List, Optional, Tuple
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import Identifier, LIF_neuron, Synapse
+from typeguard import typechecked
+
+
+@typechecked
+def get_links_key() -> str:
+    """Returns the key of the links in nx.node_link_data, which is "links"
+    before networkx 3.4 and "edges" after, such that nx.node_link_graph
+    reads the json with its default arguments."""
+    with warnings.catch_warnings():
+        # networkx 3.4 and 3.5 warn about the upcoming default.
+        warnings.simplefilter("ignore", FutureWarning)
+        node_link: Dict[str, Any] = nx.node_link_data(nx.DiGraph())
+    return [
+        key
+        for key in node_link
+        if key not in ["directed", "multigraph", "graph", "nodes"]
+    ][0]
+
+
+links_key: str = get_links_key()
+# The keys of the links that are read, such that files that were written
+# with another networkx version can be read.
+read_links_keys: List[str] = ["links", "edges"]
+
+
+@typechecked
+def graph_to_node_link(*, snn_graph: nx.DiGraph) -> Dict[str, Any]:
+    """Returns the json serialisable node-link dict of a SNN graph. Graph
+    attributes that are not json serialisable are skipped.
+
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    """
+    return {
+        "directed": True,
+        "multigraph": False,
+        "graph": get_json_graph_attributes(snn_graph=snn_graph),
+        "nodes": [
+            node_to_json(node_name=node_name, node_attributes=node_attributes)
+            for node_name, node_attributes in snn_graph.nodes.items()
+        ],
+        links_key: [
+            link_to_json(left=left, right=right, edge_attributes=attributes)
+            for left, right, attributes in snn_graph.edges(data=True)
+        ],
+    }
+
+
+@typechecked
+def get_json_graph_attributes(*, snn_graph: nx.DiGraph) -> Dict[str, Any]:
+    """Returns the graph attributes that are json serialisable."""
+    graph_attributes: Dict[str, Any] = {}
+    for key, value in snn_graph.graph.items():
+        if is_json_serialisable(value=value):
+            graph_attributes[key] = value
+    return graph_attributes
+
+
+@typechecked
+def is_json_serialisable(*, value: Any) -> bool:
+    """Returns True if the value can be written as json. The json is encoded
+    in parts that are dropped, such that the json text of a large value is
+    not held in memory."""
+    try:
+        for _ in json.JSONEncoder().iterencode(value):
+            pass
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+@typechecked
+def node_link_to_graph(*, node_link: Dict[str, Any]) -> nx.DiGraph:
+    """Returns the SNN graph of a node-link dict.
+
+    :param node_link: Node-link dict created by graph_to_node_link.
+    """
+    snn_graph = nx.DiGraph()
+    snn_graph.graph.update(node_link["graph"])
+    for node in node_link["nodes"]:
+        add_json_node(snn_graph=snn_graph, node=node)
+    for key in read_links_keys:
+        for link in node_link.get(key, []):
+            add_json_link(snn_graph=snn_graph, link=link)
+    return snn_graph
+
+
+@typechecked
+def write_graph_to_json(*, snn_graph: nx.DiGraph, json_path: str) -> None:
+    """Writes a SNN graph into a node-link json file."""
+    with open(json_path, "w", encoding="utf-8") as json_file:
+        json.dump(graph_to_node_link(snn_graph=snn_graph), json_file)
+
+
+@typechecked
+def read_graph_from_json(*, json_path: str) -> nx.DiGraph:
+    """Reads a SNN graph from a node-link json file."""
+    with open(json_path, encoding="utf-8") as json_file:
+        return node_link_to_graph(node_link=json.load(json_file))
+
+
+@typechecked
+def node_to_json(
+    *, node_name: str, node_attributes: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Returns the node-link entry of a node."""
+    node: Dict[str, Any] = {"id": node_name}
+    for key, value in node_attributes.items():
+        if key == "nx_lif":
+            node[key] = [
+                lif_neuron_to_json(lif_neuron=lif_neuron)
+                for lif_neuron in value
+            ]
+        else:
+            node[key] = value
+    return node
+
+
+@typechecked
+def link_to_json(
+    *, left: str, right: str, edge_attributes: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Returns the node-link entry of an edge."""
+    link: Dict[str, Any] = {"source": left, "target": right}
+    for key, value in edge_attributes.items():
+        if key == "synapse":
+            link[key] = {
+                "weight": value.weight,
+                "delay": value.delay,
+                "change_per_t": value.change_per_t,
+            }
+        else:
+            link[key] = value
+    return link
+
+
+@typechecked
+def add_json_node(*, snn_graph: nx.DiGraph, node: Dict[str, Any]) -> None:
+    """Adds the node of a node-link entry to the graph."""
+    snn_graph.add_node(node["id"])
+    for key, value in node.items():
+        if key == "nx_lif":
+            snn_graph.nodes[node["id"]][key] = [
+                lif_neuron_from_json(lif_json=lif_json) for lif_json in value
+            ]
+        elif key != "id":
+            snn_graph.nodes[node["id"]][key] = value
+
+
+@typechecked
+def add_json_link(*, snn_graph: nx.DiGraph, link: Dict[str, Any]) -> None:
+    """Adds the edge of a node-link entry to the graph."""
+    snn_graph.add_edge(link["source"], link["target"])
+    for key, value in link.items():
+        if key == "synapse":
+            snn_graph.edges[link["source"], link["target"]][key] = Synapse(
+                weight=value["weight"],
+                delay=value["delay"],
+                change_per_t=value["change_per_t"],
+            )
+        elif key not in ["source", "target"]:
+            snn_graph.edges[link["source"], link["target"]][key] = value
+
+
+@typechecked
+def lif_neuron_to_json(*, lif_neuron: LIF_neuron) -> Dict[str, Any]:
+    """Returns the json object of a LIF neuron."""
+    identifiers: Optional[List[List[Any]]] = None
+    if lif_neuron.identifiers is not None:
+        identifiers = [
+            [identifier.description, identifier.position, identifier.value]
+            for identifier in lif_neuron.identifiers
+        ]
+    pos: Optional[List[float]] = None
+    if lif_neuron.pos is not None:
+        pos = list(lif_neuron.pos)
+    return {
+        "name": lif_neuron.name,
+        "bias": lif_neuron.bias.get(),
+        "du": lif_neuron.du.get(),
+        "dv": lif_neuron.dv.get(),
+        "vth": lif_neuron.vth.get(),
+        "pos": pos,
+        "identifiers": identifiers,
+    }
+
+
+@typechecked
+def lif_neuron_from_json(*, lif_json: Dict[str, Any]) -> LIF_neuron:
+    """Returns the LIF neuron of a json object."""
+    identifiers: Optional[List[Identifier]] = None
+    if lif_json["identifiers"] is not None:
+        identifiers = [
+            Identifier(description=description, position=position, value=value)
+            for description, position, value in lif_json["identifiers"]
+        ]
+    pos: Optional[Tuple[float, float]] = None
+    if lif_json["pos"] is not None:
+        pos = (lif_json["pos"][0], lif_json["pos"][1])
+    return LIF_neuron(
+        name=lif_json["name"],
+        bias=lif_json["bias"],
+        du=lif_json["du"],
+        dv=lif_json["dv"],
+        vth=lif_json["vth"],
+        pos=pos,
+        identifiers=identifiers,
+    )
@@ -0,0 +1,353 @@
+"""Writes and reads SNN graphs as node-link json one node and link at a time,
+optionally through a gzip or zstd compressed file.
+
+The json is the same as that of write_graph_to_json: the nx.node_link_data
+layout of the installed networkx, with the LIF neurons and synapses written
+as plain json objects. So a decompressed file can be read by
+nx.node_link_graph, as load_json_to_nx_graph_from_file of snncompare does,
+and an uncompressed file by read_graph_from_json. Neither the node-link
+dict of the whole graph, nor the whole json text, is held in memory. The
+compression follows from the file extension: .gz for gzip, .zst for zstd,
+which requires the zstandard package, and no compression otherwise.
+"""
+import gzip
+import io
+import json
+import re
+from typing import IO, Any, Iterator, List, Optional, Tuple
+
+import networkx as nx
+from typeguard import typechecked
+
+from snnadaptation.serialization.node_link_json import (
+    add_json_link,
+    add_json_node,
+    get_json_graph_attributes,
+    link_to_json,
+    links_key,
+    node_to_json,
+    read_links_keys,
+)
+
+# The amount of characters that is decoded from the file at a time.
+chunk_size: int = 1 << 16
+# The node-link entries that are read one element at a time.
+streamed_keys: List[str] = ["nodes"] + read_links_keys
+# The characters that can continue a json number, which never follow a
+# complete json value.
+number_chars: str = "0123456789+-.eE"
+# The characters that change the nesting of a json value outside strings,
+# the characters that can end a string, and the first character after a
+# json number, true, false or null.
+container_chars: re.Pattern[str] = re.compile(r'["\[\]{}]')
+string_chars: re.Pattern[str] = re.compile(r'["\\]')
+scalar_end_chars: re.Pattern[str] = re.compile(r"[^0-9a-zA-Z+\-.]")
+
+
+class Json_value_scanner:
+    """Finds the end of a json value in consecutive chunks of its text,
+    without decoding it, such that a large value is decoded once."""
+
+    @typechecked
+    def __init__(self) -> None:
+        self.depth: int = 0
+        self.has_started: bool = False
+        self.in_string: bool = False
+        self.is_escaped: bool = False
+        self.is_scalar: bool = False
+        self.is_complete: bool = False
+
+    @typechecked
+    def scan(self, text: str) -> Optional[int]:
+        """Returns the position in the chunk right after the end of the
+        value, or None if the value continues in the next chunk.
+
+        :param text: The next chunk of the value, of which the first chunk
+        starts at the first character of the value.
+        """
+        position: Optional[int] = 0
+        while (
+            position is not None
+            and position < len(text)
+            and not self.is_complete
+        ):
+            position = self.scan_part(text=text, position=position)
+        if self.is_complete:
+            return position
+        return None
+
+    @typechecked
+    def scan_part(self, *, text: str, position: int) -> Optional[int]:
+        """Scans the chunk up to the next character that changes the state,
+        and returns the position after it, or None if the chunk has no such
+        character."""
+        if self.is_escaped:
+            self.is_escaped = False
+            return position + 1
+        if self.is_scalar:
+            match = scalar_end_chars.search(text, position)
+            if match is None:
+                return None
+            self.is_complete = True
+            return match.start()
+        if not self.has_started and text[position] not in '"[{':
+            self.is_scalar = True
+            return position
+        self.has_started = True
+        match = (string_chars if self.in_string else container_chars).search(
+            text, position
+        )
+        if match is None:
+            return None
+        char: str = match.group()
+        if char == "\\":
+            self.is_escaped = True
+        elif char == '"':
+            self.in_string = not self.in_string
+        elif char in "[{":
+            self.depth += 1
+        else:
+            self.depth -= 1
+        self.is_complete = not self.in_string and self.depth == 0
+        return match.end()
+
+
+class Json_stream:
+    """Decodes json values from a text stream, reading it in chunks."""
+
+    @typechecked
+    def __init__(
+        self,
+        text_file: IO[str],
+    ) -> None:
+        self.text_file: IO[str] = text_file
+        self.decoder: json.JSONDecoder = json.JSONDecoder()
+        self.buffer: str = ""
+        self.position: int = 0
+        self.is_exhausted: bool = False
+
+    @typechecked
+    def read_chunk(self) -> bool:
+        """Appends the next chunk of the file to the buffer, and drops the
+        decoded part of the buffer. Returns False at the end of the file."""
+        chunk: str = self.text_file.read(chunk_size)
+        decoded: int = self.position
+        self.buffer = self.buffer[decoded:] + chunk
+        self.position = 0
+        self.is_exhausted = not chunk
+        return bool(chunk)
+
+    @typechecked
+    def skip_whitespace(self) -> None:
+        """Moves the position to the next character that is not whitespace,
+        or to the end of the file."""
+        while True:
+            while (
+                self.position < len(self.buffer)
+                and self.buffer[self.position].isspace()
+            ):
+                self.position += 1
+            if self.position < len(self.buffer) or not self.read_chunk():
+                return
+
+    @typechecked
+    def next_char_is(self, char: str) -> bool:
+        """Consumes the next non-whitespace character, if it is char."""
+        self.skip_whitespace()
+        if self.buffer.startswith(char, self.position):
+            self.position += 1
+            return True
+        return False
+
+    @typechecked
+    def expect(self, char: str) -> None:
+        """Consumes the next non-whitespace character, which must be char."""
+        if not self.next_char_is(char):
+            position: int = self.position
+            raise ValueError(
+                f"Error, expected {char} in the node-link json, found: "
+                + f"{self.buffer[position:][:20]}"
+            )
+
+    @typechecked
+    def decode_value(self) -> Any:
+        """Decodes the next json value. A value that ends at the end of the
+        buffer, or before a character that can continue a number, e.g. 1.5
+        of 1.5e3, may continue in the next chunk, so then its text is
+        collected with decode_long_value first."""
+        self.skip_whitespace()
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, self.position)
+            if self.is_exhausted or (
+                end < len(self.buffer) and self.buffer[end] not in number_chars
+            ):
+                self.position = end
+                return value
+        except json.JSONDecodeError:
+            if self.is_exhausted:
+                raise
+        return self.decode_long_value()
+
+    @typechecked
+    def decode_long_value(self) -> Any:
+        """Collects the chunks of the next json value until its end, and
+        decodes their joined text once. This takes time linear in the length
+        of the value, instead of decoding the buffer again per chunk."""
+        scanner = Json_value_scanner()
+        value_chunks: List[str] = []
+        position: int = self.position
+        chunk: str = self.buffer[position:]
+        while True:
+            end: Optional[int] = scanner.scan(chunk)
+            if end is not None:
+                value_chunks.append(chunk[:end])
+                self.buffer, self.position = chunk[end:], 0
+                break
+            value_chunks.append(chunk)
+            chunk = self.text_file.read(chunk_size)
+            if not chunk:
+                self.buffer, self.position = "", 0
+                self.is_exhausted = True
+                break
+        value_text: str = "".join(value_chunks)
+        value, end = self.decoder.raw_decode(value_text)
+        if end < len(value_text):
+            raise ValueError(
+                "Error, unexpected json after a value in the node-link json: "
+                + f"{value_text[end:][:20]}"
+            )
+        return value
+
+
+@typechecked
+def open_graph_file(*, json_path: str, mode: str) -> IO[str]:
+    """Returns the text stream of a (compressed) json file.
+
+    :param json_path: Path of the file, ending in .gz or .zst if it is
+    compressed.
+    :param mode: Either "r" or "w".
+    """
+    if mode not in ["r", "w"]:
+        raise ValueError(f"Error, mode:{mode} is not supported.")
+    if json_path.endswith(".gz"):
+        return io.TextIOWrapper(
+            gzip.GzipFile(json_path, f"{mode}b"), encoding="utf-8"
+        )
+    if json_path.endswith(".zst"):
+        try:
+            # pylint: disable=C0415
+            import zstandard
+        except ImportError as error:
+            raise ImportError(
+                "Error, zstd compressed graphs require the zstandard package."
+            ) from error
+        # pylint: disable=R1732
+        binary_file = open(json_path, f"{mode}b")
+        if mode == "r":
+            binary_stream = zstandard.ZstdDecompressor().stream_reader(
+                binary_file, closefd=True
+            )
+        else:
+            binary_stream = zstandard.ZstdCompressor().stream_writer(
+                binary_file, closefd=True
+            )
+        return io.TextIOWrapper(binary_stream, encoding="utf-8")
+    return open(json_path, mode, encoding="utf-8")
+
+
+@typechecked
+def stream_graph_to_json(*, snn_graph: nx.DiGraph, json_path: str) -> None:
+    """Writes a SNN graph into a (compressed) node-link json file, one node
+    and link at a time.
+
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    :param json_path: Path of the file, ending in .gz or .zst to compress
+    it.
+    """
+    with open_graph_file(json_path=json_path, mode="w") as json_file:
+        # The separators and key order of json.dump(graph_to_node_link()).
+        json_file.write('{"directed": true, "multigraph": false, "graph": ')
+        for chunk in json.JSONEncoder().iterencode(
+            get_json_graph_attributes(snn_graph=snn_graph)
+        ):
+            json_file.write(chunk)
+        json_file.write(', "nodes": [')
+        for node_index, (node_name, node_attributes) in enumerate(
+            snn_graph.nodes.items()
+        ):
+            if node_index:
+                json_file.write(", ")
+            json_file.write(
+                json.dumps(
+                    node_to_json(
+                        node_name=node_name, node_attributes=node_attributes
+                    )
+                )
+            )
+        json_file.write(f"], {json.dumps(links_key)}: [")
+        for link_index, (left, right, edge_attributes) in enumerate(
+            snn_graph.edges(data=True)
+        ):
+            if link_index:
+                json_file.write(", ")
+            json_file.write(
+                json.dumps(
+                    link_to_json(
+                        left=left, right=right, edge_attributes=edge_attributes
+                    )
+                )
+            )
+        json_file.write("]}")
+
+
+@typechecked
+def stream_graph_from_json(*, json_path: str) -> nx.DiGraph:
+    """Reads a SNN graph from a (compressed) node-link json file, one node
+    and link at a time.
+
+    :param json_path: Path of the file, ending in .gz or .zst if it is
+    compressed.
+    """
+    snn_graph = nx.DiGraph()
+    for key, value in iterate_node_link(json_path=json_path):
+        if key == "nodes":
+            add_json_node(snn_graph=snn_graph, node=value)
+        elif key in read_links_keys:
+            add_json_link(snn_graph=snn_graph, link=value)
+        elif key == "graph":
+            snn_graph.graph.update(value)
+    return snn_graph
+
+
+@typechecked
+def iterate_node_link(*, json_path: str) -> Iterator[Tuple[str, Any]]:
+    """Yields the entries of a (compressed) node-link json file, in file
+    order, as (key, value) pairs. The nodes and links are yielded per
+    element, as ("nodes", node) and ("links", link), or ("edges", link) for
+    the layout of networkx 3.4 and later, and the other entries, e.g. the
+    graph attributes, as a whole.
+
+    :param json_path: Path of the file, ending in .gz or .zst if it is
+    compressed.
+    """
+    with open_graph_file(json_path=json_path, mode="r") as json_file:
+        json_stream = Json_stream(json_file)
+        json_stream.expect("{")
+        if json_stream.next_char_is("}"):
+            return
+        while True:
+            key: str = json_stream.decode_value()
+            json_stream.expect(":")
+            if key in streamed_keys:
+                json_stream.expect("[")
+                if not json_stream.next_char_is("]"):
+                    while True:
+                        yield key, json_stream.decode_value()
+                        if json_stream.next_char_is("]"):
+                            break
+                        json_stream.expect(",")
+            else:
+                yield key, json_stream.decode_value()
+            if json_stream.next_char_is("}"):
+                return
+            json_stream.expect(",")
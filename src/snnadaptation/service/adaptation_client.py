@@ -0,0 +1,64 @@
+"""Sends adaptation requests to a running adaptation service."""
+import socket
+import time
+from typing import Any, Dict, Optional
+
+import networkx as nx
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.serialization.node_link_json import (
+    graph_to_node_link,
+    node_link_to_graph,
+)
+from snnadaptation.service.protocol import (
+    adaptation_to_json,
+    receive_message,
+    send_message,
+)
+
+
+# pylint: disable=R0913
+@typechecked
+def adapt_with_service(
+    *,
+    snn_graph: nx.DiGraph,
+    adaptation: Adaptation,
+    socket_path: Optional[str] = None,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    max_busy_retries: int = 10,
+) -> nx.DiGraph:
+    """Returns the adapted graph, as adapted by the service. If the service
+    is busy, the request is retried with an exponential back-off.
+
+    :param snn_graph: Graph with the MDSA SNN approximation solution.
+    :param adaptation: The adaptation, with optional next stages.
+    :param socket_path: The unix socket of the service. If None, the
+    service is reached on host and port.
+    :param max_busy_retries: Amount of retries before an error is raised.
+    """
+    request: Dict[str, Any] = {
+        "graph": graph_to_node_link(snn_graph=snn_graph),
+        "adaptation": adaptation_to_json(adaptation=adaptation),
+    }
+    connection: socket.socket
+    if socket_path is not None:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(socket_path)
+    else:
+        connection = socket.create_connection((host, port))
+    with connection:
+        for retry in range(max_busy_retries + 1):
+            send_message(connection=connection, message=request)
+            response: Dict[str, Any] = receive_message(connection=connection)
+            if response["status"] != "busy":
+                break
+            time.sleep(0.01 * 2**retry)
+    if response["status"] == "busy":
+        raise TimeoutError("Error, the adaptation service stays busy.")
+    if response["status"] != "ok":
+        raise ValueError(
+            f"Error, the adaptation service failed: {response['message']}"
+        )
+    return node_link_to_graph(node_link=response["graph"])
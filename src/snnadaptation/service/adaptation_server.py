@@ -0,0 +1,277 @@
+"""Runs a local adaptation service, such that many short experiment processes
+on one host share a warm pool of adaptation worker processes and a cache of
+adapted graphs, instead of each paying the start-up costs."""
+import argparse
+import asyncio
+import functools
+import hashlib
+import os
+import stat
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.serialization.node_link_json import (
+    graph_to_node_link,
+    node_link_to_graph,
+)
+from snnadaptation.service.protocol import (
+    adaptation_from_json,
+    decode_payload,
+    encode_payload,
+    frame_payload,
+    read_payload,
+)
+
+# The Plot_config of a worker process, created once by warm_up_worker.
+worker_plot_config: Optional[Plot_config] = None
+
+
+@typechecked
+def warm_up_worker() -> None:
+    """Prepares a worker process, such that its first adaptation does not pay
+    the set-up costs."""
+    # pylint: disable=W0603
+    global worker_plot_config
+    if worker_plot_config is None:
+        worker_plot_config = Plot_config()
+
+
+@typechecked
+def adapt_request_payload(*, payload: bytes) -> Tuple[str, bytes]:
+    """Returns the status and the compressed response of a compressed
+    adaptation request, such that the server does not need to decode the
+    response to read its status. Runs in a worker process."""
+    warm_up_worker()
+    try:
+        request: Dict[str, Any] = decode_payload(payload=payload)
+        adapted_graph = apply_fused_adaptation(
+            adaptation_graph=node_link_to_graph(node_link=request["graph"]),
+            adaptation=adaptation_from_json(
+                adaptation_json=request["adaptation"]
+            ),
+            plot_config=worker_plot_config,
+        )
+    # Any error of the adaptation of a request, e.g. of an invalid graph, is
+    # sent to its client, instead of ending the connection of the client.
+    except Exception as error:  # pylint: disable=W0718
+        return "error", encode_payload(
+            message={"status": "error", "message": repr(error)}
+        )
+    return "ok", encode_payload(
+        message={
+            "status": "ok",
+            "graph": graph_to_node_link(snn_graph=adapted_graph),
+        }
+    )
+
+
+class Adaptation_server:
+    """Adapts the graphs of requests in a pool of worker processes. Identical
+    requests are answered from an in-memory cache, or share the adaptation
+    that is in progress. At most max_concurrent requests are adapted at a
+    time, and at most max_queued wait for a worker. Further requests are
+    answered with status busy, such that clients can retry later."""
+
+    # pylint: disable=R0902
+    @typechecked
+    def __init__(
+        self,
+        workers: int,
+        max_queued: int,
+        max_cached: int,
+        max_concurrent: Optional[int] = None,
+    ) -> None:
+        self.workers: int = workers
+        self.max_queued: int = max_queued
+        self.max_cached: int = max_cached
+        self.max_concurrent: int = (
+            workers if max_concurrent is None else max_concurrent
+        )
+        self.executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=workers, initializer=warm_up_worker
+        )
+        # Maps the hash of a request payload to its response payload, in
+        # order of use.
+        self.cache: OrderedDict[str, bytes] = OrderedDict()
+        self.in_progress: Dict[str, asyncio.Future] = {}
+        self.nr_of_queued: int = 0
+        # Binds to the event loop of the first request that waits for it.
+        self.semaphore: asyncio.Semaphore = asyncio.Semaphore(
+            self.max_concurrent
+        )
+
+    @typechecked
+    async def start_workers(self) -> None:
+        """Starts and warms up all worker processes."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self.executor, warm_up_worker)
+                for _ in range(self.workers)
+            )
+        )
+
+    @typechecked
+    async def get_response(self, payload: bytes) -> bytes:
+        """Returns the response payload of a request payload."""
+        key: str = hashlib.sha256(payload).hexdigest()
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        if key in self.in_progress:
+            return await asyncio.shield(self.in_progress[key])
+        if self.nr_of_queued >= self.max_queued:
+            return encode_payload(message={"status": "busy"})
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self.in_progress[key] = future
+        self.nr_of_queued += 1
+        try:
+            async with self.semaphore:
+                self.nr_of_queued -= 1
+                status, response = await loop.run_in_executor(
+                    self.executor,
+                    functools.partial(adapt_request_payload, payload=payload),
+                )
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        finally:
+            del self.in_progress[key]
+        if status == "ok":
+            self.cache[key] = response
+            if len(self.cache) > self.max_cached:
+                self.cache.popitem(last=False)
+        future.set_result(response)
+        return response
+
+    @typechecked
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answers the requests of a connection, in order, until the client
+        closes it."""
+        try:
+            while True:
+                payload: Optional[bytes] = await read_payload(reader=reader)
+                if payload is None:
+                    break
+                writer.write(
+                    frame_payload(payload=await self.get_response(payload))
+                )
+                # Waits until the client reads the response.
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @typechecked
+    async def serve(
+        self,
+        socket_path: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+    ) -> None:
+        """Serves requests on a unix socket if socket_path is given, else on
+        host and port, until cancelled. A socket that is left at socket_path,
+        e.g. by a crashed service, is replaced, any other file is not."""
+        if socket_path is not None:
+            remove_socket(socket_path=socket_path)
+        await self.start_workers()
+        if socket_path is not None:
+            server = await asyncio.start_unix_server(
+                self.handle_connection, path=socket_path
+            )
+        else:
+            server = await asyncio.start_server(
+                self.handle_connection, host=host, port=port
+            )
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False)
+            if socket_path is not None:
+                remove_socket(socket_path=socket_path)
+
+
+@typechecked
+def remove_socket(*, socket_path: str) -> None:
+    """Removes the unix socket at socket_path, if it exists. Raises an error
+    if the path is another kind of file, such that it is not removed."""
+    try:
+        mode: int = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(
+            f"Error, {socket_path} exists and is not a unix socket."
+        )
+    os.remove(socket_path)
+
+
+@typechecked
+def parse_service_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    """Reads the command line arguments of the adaptation service."""
+    parser = argparse.ArgumentParser(
+        prog="snnadaptation-service",
+        description=(
+            "Runs a local adaptation service with a warm pool of worker "
+            + "processes."
+        ),
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        dest="socket_path",
+        help="Unix socket path. If not given, localhost --port is used.",
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Amount of worker processes, the amount of CPUs by default.",
+    )
+    parser.add_argument(
+        "--max-queued",
+        type=int,
+        default=64,
+        help="Requests that may wait for a worker before clients get busy.",
+    )
+    parser.add_argument(
+        "--max-cached",
+        type=int,
+        default=128,
+        help="Amount of adapted graphs that is kept in memory.",
+    )
+    return parser.parse_args(args)
+
+
+@typechecked
+def main(args: Optional[List[str]] = None) -> None:
+    """Runs the adaptation service until it is interrupted."""
+    service_args = parse_service_args(args)
+    server = Adaptation_server(
+        service_args.workers, service_args.max_queued, service_args.max_cached
+    )
+    try:
+        asyncio.run(
+            server.serve(
+                socket_path=service_args.socket_path,
+                host=service_args.host,
+                port=service_args.port,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,137 @@
+"""Contains the binary message format of the adaptation service: a 4 byte
+big-endian payload length, followed by the zlib compressed json of the
+message. Graphs are sent in the node-link format of
+serialization.node_link_json."""
+import asyncio
+import json
+import socket
+import struct
+import zlib
+from typing import Any, Dict, Optional
+
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.selection.Selection_policy import Selection_policy
+
+header = struct.Struct(">I")
+# Messages with a larger payload are refused, before they are read.
+max_payload_bytes: int = 1 << 30
+
+
+@typechecked
+def encode_payload(*, message: Dict[str, Any]) -> bytes:
+    """Returns the compressed payload of a message."""
+    return zlib.compress(
+        json.dumps(message, separators=(",", ":")).encode("utf-8"), 1
+    )
+
+
+@typechecked
+def decode_payload(*, payload: bytes) -> Dict[str, Any]:
+    """Returns the message of a compressed payload."""
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+@typechecked
+def frame_payload(*, payload: bytes) -> bytes:
+    """Returns the payload, prefixed with its length."""
+    return header.pack(len(payload)) + payload
+
+
+@typechecked
+def get_payload_size(*, message_header: bytes) -> int:
+    """Returns the payload length of a message header, and raises an error if
+    the payload is too large."""
+    payload_size: int = header.unpack(message_header)[0]
+    if payload_size > max_payload_bytes:
+        raise ValueError(
+            f"Error, message of {payload_size} bytes exceeds the maximum of "
+            + f"{max_payload_bytes} bytes."
+        )
+    return payload_size
+
+
+@typechecked
+async def read_payload(*, reader: asyncio.StreamReader) -> Optional[bytes]:
+    """Returns the payload of the next message of a stream, or None if the
+    stream was closed."""
+    try:
+        message_header: bytes = await reader.readexactly(header.size)
+    except asyncio.IncompleteReadError:
+        return None
+    return await reader.readexactly(
+        get_payload_size(message_header=message_header)
+    )
+
+
+@typechecked
+def send_message(
+    *, connection: socket.socket, message: Dict[str, Any]
+) -> None:
+    """Sends a message over a blocking socket."""
+    connection.sendall(frame_payload(payload=encode_payload(message=message)))
+
+
+@typechecked
+def receive_message(*, connection: socket.socket) -> Dict[str, Any]:
+    """Receives a message from a blocking socket."""
+    payload_size: int = get_payload_size(
+        message_header=receive_bytes(connection=connection, size=header.size)
+    )
+    return decode_payload(
+        payload=receive_bytes(connection=connection, size=payload_size)
+    )
+
+
+@typechecked
+def receive_bytes(*, connection: socket.socket, size: int) -> bytes:
+    """Receives exactly size bytes from a blocking socket."""
+    chunks = bytearray()
+    while len(chunks) < size:
+        chunk: bytes = connection.recv(min(size - len(chunks), 1 << 20))
+        if not chunk:
+            raise ConnectionError("Error, the connection was closed.")
+        chunks.extend(chunk)
+    return bytes(chunks)
+
+
+@typechecked
+def adaptation_to_json(*, adaptation: Adaptation) -> Dict[str, Any]:
+    """Returns the json serialisable specification of an adaptation."""
+    selection: Optional[Dict[str, Any]] = None
+    if adaptation.selection is not None:
+        selection = {
+            "roles": adaptation.selection.roles,
+            "node_names": adaptation.selection.node_names,
+            "max_neurons": adaptation.selection.max_neurons,
+            "max_synapses": adaptation.selection.max_synapses,
+            "criticality": adaptation.selection.criticality,
+        }
+    return {
+        "adaptation_type": adaptation.adaptation_type,
+        "redundancy": adaptation.redundancy,
+        "selection": selection,
+        "next_stages": [
+            adaptation_to_json(adaptation=next_stage)
+            for next_stage in adaptation.next_stages
+        ],
+    }
+
+
+@typechecked
+def adaptation_from_json(*, adaptation_json: Dict[str, Any]) -> Adaptation:
+    """Returns the adaptation of a specification created by
+    adaptation_to_json."""
+    selection: Optional[Selection_policy] = None
+    if adaptation_json["selection"] is not None:
+        selection = Selection_policy(**adaptation_json["selection"])
+    return Adaptation(
+        adaptation_json["adaptation_type"],
+        adaptation_json["redundancy"],
+        selection,
+        [
+            adaptation_from_json(adaptation_json=next_stage)
+            for next_stage in adaptation_json["next_stages"]
+        ],
+    )
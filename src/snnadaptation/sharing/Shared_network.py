@@ -0,0 +1,246 @@
+"""Exports the neuron and synapse arrays of a SNN graph into a shared memory
+segment, such that many simulator worker processes read the same network
+without receiving their own copy of it.
+
+The segment starts with a reference count, followed by the arrays. The
+descriptor of the segment is a small json serialisable dict, which is sent
+to the workers together with a multiprocessing lock, e.g. as initializer
+arguments of a process pool. The segment is removed when the last process
+that attached it, including the exporting process, detaches. So the
+exporting process should stay attached until the workers have attached.
+"""
+from multiprocessing import Lock, resource_tracker, shared_memory, util
+from typing import Any, Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+from typeguard import typechecked
+
+from snnadaptation.plan.integer_ids import get_node_names
+
+# Arrays are aligned to 8 bytes within the segment.
+alignment: int = 8
+# The recur array is NaN for neurons without a recur attribute.
+neuron_arrays: List[str] = ["bias", "du", "dv", "vth", "recur"]
+synapse_arrays: List[Tuple[str, str]] = [
+    ("left", "int64"),
+    ("right", "int64"),
+    ("weight", "float64"),
+    ("delay", "float64"),
+    ("change_per_t", "float64"),
+    ("is_redundant", "bool"),
+]
+
+
+class Shared_network:
+    """A read-only attachment of a network in a shared memory segment. The
+    arrays are numpy views of the segment: neurons are indexed by their
+    neuron id, synapses by their position, with the neuron ids of their
+    endpoints in left and right."""
+
+    @typechecked
+    def __init__(
+        self,
+        descriptor: Dict[str, Any],
+        lock: Any,
+    ) -> None:
+        self.descriptor: Dict[str, Any] = descriptor
+        self.lock: Any = lock
+        self.segment: shared_memory.SharedMemory = open_segment(
+            name=descriptor["segment"]
+        )
+        # Runs release_segment once: on detach, garbage collection, or exit.
+        self.finalizer: util.Finalize = util.Finalize(
+            self,
+            release_segment,
+            kwargs={"segment": self.segment, "lock": lock},
+            exitpriority=10,
+        )
+        self.arrays: Dict[str, np.ndarray] = {}
+        for array_name, (offset, dtype, length) in descriptor[
+            "arrays"
+        ].items():
+            array: np.ndarray = np.ndarray(
+                (length,),
+                dtype=np.dtype(dtype),
+                buffer=self.segment.buf,
+                offset=offset,
+            )
+            array.flags.writeable = False
+            self.arrays[array_name] = array
+
+    @typechecked
+    def get_node_names(self) -> List[str]:
+        """Returns the node names, ordered by neuron id."""
+        if not self.descriptor["nr_of_neurons"]:
+            # The empty names of an empty graph would split into [""].
+            return []
+        return self.arrays["node_names"].tobytes().decode("utf-8").split("\n")
+
+    @typechecked
+    def detach(self) -> None:
+        """Detaches this process from the segment, and removes the segment
+        if no process is attached anymore. The arrays of this attachment can
+        not be used afterwards. A process detaches automatically when the
+        attachment is garbage collected, or when the process exits."""
+        self.arrays = {}
+        self.finalizer()
+
+
+@typechecked
+def release_segment(*, segment: shared_memory.SharedMemory, lock: Any) -> None:
+    """Decrements the reference count of the segment, and removes the segment
+    if it reaches 0."""
+    with lock:
+        reference_count = np.ndarray((1,), dtype=np.int64, buffer=segment.buf)
+        reference_count[0] -= 1
+        is_last: bool = bool(reference_count[0] == 0)
+        del reference_count
+    try:
+        segment.close()
+    except BufferError:
+        # Arrays of the attachment are still referenced, the memory is
+        # released when the process exits.
+        pass
+    if is_last:
+        # unlink also unregisters the segment from the resource tracker.
+        resource_tracker.register(
+            getattr(segment, "_name", segment.name), "shared_memory"
+        )
+        segment.unlink()
+
+
+@typechecked
+def export_shared_network(
+    *, snn_graph: nx.DiGraph, lock: Optional[Any] = None
+) -> Shared_network:
+    """Copies the neuron and synapse arrays of the graph into a new shared
+    memory segment, and returns the attachment of the exporting process.
+    Workers attach with attach_shared_network, using the descriptor and lock
+    of the returned attachment.
+
+    :param snn_graph: Graph with node names, e.g. an adapted graph. The
+    neuron ids follow its neuron_ids graph attribute, if it has them.
+    :param lock: Lock of the reference count, a new multiprocessing lock by
+    default.
+    """
+    neuron_ids: Dict[str, int] = snn_graph.graph.get(
+        "neuron_ids",
+        {node_name: node_id for node_id, node_name in enumerate(snn_graph)},
+    )
+    node_names: List[str] = get_node_names(neuron_ids=neuron_ids)
+    values: Dict[str, np.ndarray] = get_network_arrays(
+        snn_graph=snn_graph, neuron_ids=neuron_ids, node_names=node_names
+    )
+
+    layout: Dict[str, List[Any]] = {}
+    # The reference count is stored at offset 0.
+    size: int = alignment
+    for array_name, array in values.items():
+        layout[array_name] = [size, array.dtype.str, len(array)]
+        size += -(-array.nbytes // alignment) * alignment
+    segment = shared_memory.SharedMemory(create=True, size=size)
+    # The reference count, not the exporting process, decides when the
+    # segment is removed.
+    resource_tracker.unregister(
+        getattr(segment, "_name", segment.name), "shared_memory"
+    )
+    np.ndarray((1,), dtype=np.int64, buffer=segment.buf)[0] = 1
+    for array_name, array in values.items():
+        offset, dtype, length = layout[array_name]
+        np.ndarray(
+            (length,), dtype=np.dtype(dtype), buffer=segment.buf, offset=offset
+        )[:] = array
+    descriptor: Dict[str, Any] = {
+        "segment": segment.name,
+        "nr_of_neurons": len(node_names),
+        "nr_of_synapses": snn_graph.number_of_edges(),
+        "arrays": layout,
+    }
+    segment.close()
+    return Shared_network(descriptor, Lock() if lock is None else lock)
+
+
+@typechecked
+def attach_shared_network(
+    *, descriptor: Dict[str, Any], lock: Any
+) -> Shared_network:
+    """Attaches a process to an exported network, read-only and without
+    copying its arrays. Call Shared_network.detach when done.
+
+    :param descriptor: The descriptor of the exported Shared_network.
+    :param lock: The lock of the exported Shared_network.
+    """
+    try:
+        segment: shared_memory.SharedMemory = open_segment(
+            name=descriptor["segment"]
+        )
+    except FileNotFoundError as error:
+        raise ValueError(
+            "Error, the shared network was already freed."
+        ) from error
+    with lock:
+        reference_count = np.ndarray((1,), dtype=np.int64, buffer=segment.buf)
+        if reference_count[0] < 1:
+            raise ValueError("Error, the shared network was already freed.")
+        reference_count[0] += 1
+        del reference_count
+    segment.close()
+    return Shared_network(descriptor, lock)
+
+
+@typechecked
+def open_segment(*, name: str) -> shared_memory.SharedMemory:
+    """Opens an existing segment, without registering it at the resource
+    tracker of this process, which would remove it when this process exits
+    while other processes still use it."""
+    segment = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(
+        getattr(segment, "_name", segment.name), "shared_memory"
+    )
+    return segment
+
+
+@typechecked
+def get_network_arrays(
+    *,
+    snn_graph: nx.DiGraph,
+    neuron_ids: Dict[str, int],
+    node_names: List[str],
+) -> Dict[str, np.ndarray]:
+    """Returns the neuron properties and recur values by neuron id, the
+    synapses, and the utf-8 encoded newline separated node names."""
+    arrays: Dict[str, np.ndarray] = {
+        array_name: np.empty(len(node_names), dtype=np.float64)
+        for array_name in neuron_arrays
+    }
+    for node_id, node_name in enumerate(node_names):
+        lif_neuron = snn_graph.nodes[node_name]["nx_lif"][0]
+        arrays["bias"][node_id] = lif_neuron.bias.get()
+        arrays["du"][node_id] = lif_neuron.du.get()
+        arrays["dv"][node_id] = lif_neuron.dv.get()
+        arrays["vth"][node_id] = lif_neuron.vth.get()
+        arrays["recur"][node_id] = snn_graph.nodes[node_name].get(
+            "recur", np.nan
+        )
+
+    nr_of_synapses: int = snn_graph.number_of_edges()
+    for array_name, dtype in synapse_arrays:
+        arrays[array_name] = np.empty(nr_of_synapses, dtype=np.dtype(dtype))
+    for position, (left, right, edge_attributes) in enumerate(
+        snn_graph.edges(data=True)
+    ):
+        arrays["left"][position] = neuron_ids[left]
+        arrays["right"][position] = neuron_ids[right]
+        arrays["weight"][position] = edge_attributes["synapse"].weight
+        arrays["delay"][position] = edge_attributes["synapse"].delay
+        arrays["change_per_t"][position] = edge_attributes[
+            "synapse"
+        ].change_per_t
+        arrays["is_redundant"][position] = bool(
+            edge_attributes.get("is_redundant", False)
+        )
+    arrays["node_names"] = np.frombuffer(
+        "\n".join(node_names).encode("utf-8"), dtype=np.uint8
+    )
+    return arrays
@@ -0,0 +1,264 @@
+"""Simulates the LIF neurons of a SNN graph event-driven: per timestep, only
+the neurons that receive a spike, carry a bias, or still have a state that
+can make them spike, are updated.
+
+In a fault-free run of a sparse redundancy adapted graph, most redundant
+neurons are silent, and the -100 synapses of the original and lower level
+neurons keep them inhibited. Such neurons are suspended until they receive
+a positive net input, or until their inhibition has decayed enough for
+their bias to make them spike, so the simulation time scales with the
+activity of the network instead of its number of neurons. Further
+inhibition is stored, and the state of a suspended neuron is computed with
+it when the neuron resumes, such that the spikes and states are those of a
+time-stepped simulation.
+
+The neurons follow the LIF model of snnbackends, starting from u=v=0:
+u = u*(1-du) + a_in, v = v*(1-dv) + u + bias, and a neuron spikes and
+resets v to 0 if v > vth. The spikes of timestep t are the a_in of
+timestep t+1.
+"""
+import heapq
+import math
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+import networkx as nx
+from typeguard import typechecked
+
+
+class Event_driven_simulator:
+    """Simulates a SNN graph, starting at timestep 0. Neurons are indexed by
+    their position in the graph, and their out synapses are stored in the
+    edge order of the graph, such that the input of a neuron is summed in
+    the same order as a time-stepped simulation of the graph sums it."""
+
+    # pylint: disable=R0902
+    @typechecked
+    def __init__(
+        self,
+        snn_graph: nx.DiGraph,
+    ) -> None:
+        self.node_names: List[Hashable] = list(snn_graph.nodes)
+        node_indices: Dict[Hashable, int] = {
+            node_name: node_index
+            for node_index, node_name in enumerate(self.node_names)
+        }
+        self.bias: List[float] = []
+        self.du: List[float] = []
+        self.dv: List[float] = []
+        self.vth: List[float] = []
+        for node_name in self.node_names:
+            lif_neuron = snn_graph.nodes[node_name]["nx_lif"][0]
+            self.bias.append(lif_neuron.bias.get())
+            self.du.append(lif_neuron.du.get())
+            self.dv.append(lif_neuron.dv.get())
+            self.vth.append(lif_neuron.vth.get())
+        self.out_synapses: List[List[Tuple[int, float]]] = [
+            [] for _ in self.node_names
+        ]
+        for left, right, edge_attributes in snn_graph.edges(data=True):
+            if edge_attributes["synapse"].delay != 0:
+                raise NotImplementedError(
+                    "Error, synaptic delays are not supported."
+                )
+            self.out_synapses[node_indices[left]].append(
+                (node_indices[right], edge_attributes["synapse"].weight)
+            )
+
+        self.timestep: int = 0
+        self.u: List[float] = [0.0] * len(self.node_names)
+        self.v: List[float] = [0.0] * len(self.node_names)
+        # The timestep up to which the state of a suspended neuron is
+        # computed.
+        self.updated_until: List[int] = [0] * len(self.node_names)
+        # The timestep at which a suspended neuron resumes without input, if
+        # its bias can make it spike once its inhibition has decayed.
+        self.wake_timesteps: List[Optional[int]] = [None] * len(
+            self.node_names
+        )
+        self.wake_queue: List[Tuple[int, int]] = []
+        # The timesteps and non-positive inputs that suspended neurons
+        # received, which are applied when they resume.
+        self.pending_inputs: Dict[int, List[Tuple[int, float]]] = {}
+        self.active: Set[int] = set()
+        for node_index in range(len(self.node_names)):
+            self.suspend_or_activate(node_index)
+        self.spiking: List[int] = []
+        self.spike_times: Dict[int, List[int]] = {}
+        # The number of neuron updates, including those that compute the
+        # state of a suspended neuron when it resumes.
+        self.nr_of_updates: int = 0
+
+    @typechecked
+    def simulate(self, nr_of_timesteps: int) -> None:
+        """Simulates the next nr_of_timesteps timesteps."""
+        for _ in range(nr_of_timesteps):
+            self.simulate_timestep()
+
+    @typechecked
+    def simulate_timestep(self) -> None:
+        """Updates the neurons that are active, receive a positive net input,
+        or wake up. A suspended neuron with a non-positive net input stays
+        suspended: the input can only delay its spikes, so its wake up
+        timestep remains a safe bound, at which the wake up is recomputed."""
+        self.timestep += 1
+        a_in: Dict[int, float] = {}
+        # Sorted, such that the input is summed in the graph edge order.
+        for left in sorted(self.spiking):
+            for right, weight in self.out_synapses[left]:
+                a_in[right] = a_in.get(right, 0.0) + weight
+        updated: Set[int] = set(self.active)
+        while self.wake_queue and self.wake_queue[0][0] <= self.timestep:
+            wake_timestep, node_index = heapq.heappop(self.wake_queue)
+            # Else the neuron resumed earlier, and the wake up is outdated.
+            if self.wake_timesteps[node_index] == wake_timestep:
+                updated.add(node_index)
+        for node_index, node_input in a_in.items():
+            if node_input > 0 or node_index in updated:
+                updated.add(node_index)
+            else:
+                self.pending_inputs.setdefault(node_index, []).append(
+                    (self.timestep, node_input)
+                )
+
+        spiking: List[int] = []
+        for node_index in updated:
+            if node_index not in self.active:
+                self.resume(node_index, self.timestep - 1)
+            self.nr_of_updates += 1
+            self.u[node_index] = self.u[node_index] * (
+                1 - self.du[node_index]
+            ) + a_in.get(node_index, 0.0)
+            self.v[node_index] = (
+                self.v[node_index] * (1 - self.dv[node_index])
+                + self.u[node_index]
+                + self.bias[node_index]
+            )
+            if self.v[node_index] > self.vth[node_index]:
+                self.v[node_index] = 0.0
+                spiking.append(node_index)
+                self.spike_times.setdefault(node_index, []).append(
+                    self.timestep
+                )
+            self.suspend_or_activate(node_index)
+        self.spiking = spiking
+
+    # Not typechecked, it runs for every neuron update.
+    def suspend_or_activate(self, node_index: int) -> None:
+        """Suspends a neuron that has been updated up to the current
+        timestep, if it can not spike in the next timestep without input,
+        else keeps it active."""
+        silent_timesteps: Optional[int] = get_silent_timesteps(
+            u=self.u[node_index],
+            v=self.v[node_index],
+            bias=self.bias[node_index],
+            du=self.du[node_index],
+            dv=self.dv[node_index],
+            vth=self.vth[node_index],
+        )
+        if silent_timesteps == 0:
+            self.active.add(node_index)
+            return
+        self.active.discard(node_index)
+        self.updated_until[node_index] = self.timestep
+        if silent_timesteps is None:
+            self.wake_timesteps[node_index] = None
+        else:
+            wake_timestep: int = self.timestep + silent_timesteps + 1
+            self.wake_timesteps[node_index] = wake_timestep
+            heapq.heappush(self.wake_queue, (wake_timestep, node_index))
+
+    # Not typechecked, it runs for every resumed neuron.
+    def resume(self, node_index: int, timestep: int) -> None:
+        """Computes the state of a suspended neuron up to the timestep, with
+        the inputs it received while it was suspended. A suspended neuron
+        does not spike in that time, so only its decay and inputs are
+        simulated, which is a no-op for a neuron at rest without bias."""
+        u: float = self.u[node_index]
+        v: float = self.v[node_index]
+        bias: float = self.bias[node_index]
+        inputs: List[Tuple[int, float]] = self.pending_inputs.pop(
+            node_index, []
+        )
+        if u == 0 and v == 0 and bias == 0 and inputs:
+            # The neuron stays at rest until its first input.
+            self.updated_until[node_index] = inputs[0][0] - 1
+        if u != 0 or v != 0 or bias != 0 or inputs:
+            u_decay: float = 1 - self.du[node_index]
+            v_decay: float = 1 - self.dv[node_index]
+            input_index: int = 0
+            for input_timestep in range(
+                self.updated_until[node_index] + 1, timestep + 1
+            ):
+                node_input: float = 0.0
+                if (
+                    input_index < len(inputs)
+                    and inputs[input_index][0] == input_timestep
+                ):
+                    node_input = inputs[input_index][1]
+                    input_index += 1
+                u = u * u_decay + node_input
+                v = v * v_decay + u + bias
+            self.nr_of_updates += max(
+                timestep - self.updated_until[node_index], 0
+            )
+        self.u[node_index] = u
+        self.v[node_index] = v
+        self.updated_until[node_index] = timestep
+
+    @typechecked
+    def get_spike_times(self) -> Dict[Hashable, List[int]]:
+        """Returns the timesteps at which each node spiked, for all nodes."""
+        return {
+            node_name: list(self.spike_times.get(node_index, []))
+            for node_index, node_name in enumerate(self.node_names)
+        }
+
+    @typechecked
+    def get_state(self, node_name: Hashable) -> Tuple[float, float]:
+        """Returns the u and v of a node at the current timestep."""
+        node_index: int = self.node_names.index(node_name)
+        if node_index not in self.active:
+            self.resume(node_index, self.timestep)
+        return self.u[node_index], self.v[node_index]
+
+
+# Not typechecked, it runs for every neuron update.
+def get_silent_timesteps(
+    *, u: float, v: float, bias: float, du: float, dv: float, vth: float
+) -> Optional[int]:
+    """Returns the number of next timesteps in which a neuron can not spike
+    without input, or None if it never spikes without input.
+
+    With 0 <= du, dv <= 1, vth >= 0 and v <= vth, the neuron does not spike
+    as long as u + bias <= 0, because v then does not grow above max(v, 0).
+    Without input, u decays towards 0, so u + bias stays <= 0 if bias <= 0,
+    or if u does not decay. Else u + bias becomes positive after
+    log(bias / -u) / log(1 - du) timesteps, of which one is kept as margin
+    for the rounding of the decay.
+    """
+    # pylint: disable=R0911,R0913
+    if not (0 <= du <= 1 and 0 <= dv <= 1 and 0 <= vth and v <= vth):
+        return 0
+    if u + bias > 0:
+        return 0
+    if bias <= 0 or du == 0:
+        return None
+    if du == 1:
+        return 0
+    return max(math.floor(math.log(bias / -u) / math.log(1 - du)) - 1, 0)
+
+
+@typechecked
+def simulate_event_driven(
+    *, snn_graph: nx.DiGraph, nr_of_timesteps: int
+) -> Event_driven_simulator:
+    """Simulates the graph for nr_of_timesteps timesteps, and returns the
+    simulator with the spike times and states of the neurons.
+
+    :param snn_graph: Graph with nx_lif neurons, e.g. an adapted graph with
+    node names or integer node ids.
+    :param nr_of_timesteps: The number of timesteps that are simulated.
+    """
+    simulator = Event_driven_simulator(snn_graph)
+    simulator.simulate(nr_of_timesteps)
+    return simulator
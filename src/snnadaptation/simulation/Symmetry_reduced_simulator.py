@@ -0,0 +1,279 @@
+"""Simulates a SNN graph with one representative neuron per class of
+identical neurons, e.g. the copies of a population coded neuron.
+
+Two neurons are identical if they have the same properties and state,
+and receive the same summed synapse weight from each class. Starting
+from u=v=0, the neurons of such a class evolve identically, so a class is
+simulated as one neuron, whose spike is the summed weight of its class
+to each receiving class. The classes are the coarsest partition with that
+property, found by refining the partition by neuron properties until it is
+stable. A perturbation of a neuron, e.g. a fault during the simulation,
+splits its class and refines the partition again from the current
+classes, such that only the neurons whose symmetry it breaks are
+simulated individually.
+
+The neurons follow the LIF model of the Event_driven_simulator. The input
+of a class is summed per sending class, so it can differ from that of a
+time-stepped simulation by rounding.
+"""
+from typing import Dict, Hashable, List, Tuple
+
+import networkx as nx
+from typeguard import typechecked
+
+neuron_property_names: List[str] = ["bias", "du", "dv", "vth"]
+
+
+class Symmetry_reduced_simulator:
+    """Simulates the classes of identical neurons of a SNN graph, starting at
+    timestep 0. Neurons are indexed by their position in the graph."""
+
+    # pylint: disable=R0902
+    @typechecked
+    def __init__(
+        self,
+        snn_graph: nx.DiGraph,
+    ) -> None:
+        self.node_names: List[Hashable] = list(snn_graph.nodes)
+        self.node_indices: Dict[Hashable, int] = {
+            node_name: node_index
+            for node_index, node_name in enumerate(self.node_names)
+        }
+        # The properties bias, du, dv and vth of each neuron.
+        self.neuron_properties: List[List[float]] = []
+        for node_name in self.node_names:
+            lif_neuron = snn_graph.nodes[node_name]["nx_lif"][0]
+            self.neuron_properties.append(
+                [
+                    getattr(lif_neuron, property_name).get()
+                    for property_name in neuron_property_names
+                ]
+            )
+        self.in_synapses: List[List[Tuple[int, float]]] = [
+            [] for _ in self.node_names
+        ]
+        for left, right, edge_attributes in snn_graph.edges(data=True):
+            if edge_attributes["synapse"].delay != 0:
+                raise NotImplementedError(
+                    "Error, synaptic delays are not supported."
+                )
+            self.in_synapses[self.node_indices[right]].append(
+                (self.node_indices[left], edge_attributes["synapse"].weight)
+            )
+
+        self.timestep: int = 0
+        self.nr_of_updates: int = 0
+        self.node_classes: List[int] = refine_classes(
+            colours=[
+                tuple(neuron_properties)
+                for neuron_properties in self.neuron_properties
+            ],
+            in_synapses=self.in_synapses,
+        )
+        nr_of_classes: int = max(self.node_classes, default=-1) + 1
+        self.u: List[float] = [0.0] * nr_of_classes
+        self.v: List[float] = [0.0] * nr_of_classes
+        self.spiking: List[bool] = [False] * nr_of_classes
+        self.spike_times: List[List[int]] = [[] for _ in range(nr_of_classes)]
+        self.set_class_synapses()
+
+    @typechecked
+    def set_class_synapses(self) -> None:
+        """Stores the representative neuron of each class, and the summed
+        weight of the synapses from each class to each representative."""
+        self.representatives: List[int] = [0] * len(self.u)
+        for node_index in reversed(range(len(self.node_names))):
+            self.representatives[self.node_classes[node_index]] = node_index
+        self.class_out_synapses: List[List[Tuple[int, float]]] = [
+            [] for _ in self.representatives
+        ]
+        for right_class, representative in enumerate(self.representatives):
+            for left_class, weight in get_class_weights(
+                in_synapses=self.in_synapses[representative],
+                node_classes=self.node_classes,
+            ).items():
+                self.class_out_synapses[left_class].append(
+                    (right_class, weight)
+                )
+
+    @typechecked
+    def get_nr_of_classes(self) -> int:
+        """Returns the number of neurons that are simulated per timestep."""
+        return len(self.representatives)
+
+    @typechecked
+    def simulate(self, nr_of_timesteps: int) -> None:
+        """Simulates the next nr_of_timesteps timesteps."""
+        for _ in range(nr_of_timesteps):
+            self.simulate_timestep()
+
+    @typechecked
+    def simulate_timestep(self) -> None:
+        """Updates the representative neuron of each class."""
+        self.timestep += 1
+        a_in: List[float] = [0.0] * len(self.representatives)
+        for left_class, is_spiking in enumerate(self.spiking):
+            if is_spiking:
+                for right_class, weight in self.class_out_synapses[left_class]:
+                    a_in[right_class] += weight
+        for node_class, representative in enumerate(self.representatives):
+            bias, du, dv, vth = self.neuron_properties[representative]
+            self.u[node_class] = (
+                self.u[node_class] * (1 - du) + a_in[node_class]
+            )
+            self.v[node_class] = (
+                self.v[node_class] * (1 - dv) + self.u[node_class] + bias
+            )
+            self.spiking[node_class] = self.v[node_class] > vth
+            if self.spiking[node_class]:
+                self.v[node_class] = 0.0
+                self.spike_times[node_class].append(self.timestep)
+        self.nr_of_updates += len(self.representatives)
+
+    @typechecked
+    def perturb_neuron(
+        self,
+        node_name: Hashable,
+        perturbation: Dict[str, float],
+    ) -> None:
+        """Changes the properties or state of a single neuron, e.g. to inject
+        a fault during the simulation. The neuron leaves its class, and the
+        classes of the neurons whose input it changes are split as well.
+
+        :param node_name: The neuron that is perturbed.
+        :param perturbation: The new values of any of bias, du, dv, vth, u
+        and v.
+        """
+        for property_name in perturbation:
+            if property_name not in neuron_property_names + ["u", "v"]:
+                raise KeyError(
+                    f"Error, {property_name} is not a neuron property."
+                )
+        node_index: int = self.node_indices[node_name]
+        old_classes: List[int] = self.node_classes
+        for property_index, property_name in enumerate(neuron_property_names):
+            if property_name in perturbation:
+                self.neuron_properties[node_index][
+                    property_index
+                ] = perturbation[property_name]
+        colours: List[Hashable] = list(old_classes)
+        # The perturbed neuron gets a colour that no class has.
+        colours[node_index] = -1
+        self.node_classes = refine_classes(
+            colours=colours, in_synapses=self.in_synapses
+        )
+
+        # A new class continues the state of the class it is split from.
+        nr_of_classes: int = max(self.node_classes) + 1
+        old_class_of: List[int] = [0] * nr_of_classes
+        for old_class, node_class in zip(old_classes, self.node_classes):
+            old_class_of[node_class] = old_class
+        self.u = [self.u[old_class] for old_class in old_class_of]
+        self.v = [self.v[old_class] for old_class in old_class_of]
+        self.spiking = [self.spiking[old_class] for old_class in old_class_of]
+        self.spike_times = [
+            list(self.spike_times[old_class]) for old_class in old_class_of
+        ]
+        self.u[self.node_classes[node_index]] = perturbation.get(
+            "u", self.u[self.node_classes[node_index]]
+        )
+        self.v[self.node_classes[node_index]] = perturbation.get(
+            "v", self.v[self.node_classes[node_index]]
+        )
+        self.set_class_synapses()
+
+    @typechecked
+    def get_spike_times(self) -> Dict[Hashable, List[int]]:
+        """Returns the timesteps at which each node spiked, for all nodes."""
+        return {
+            node_name: list(self.spike_times[self.node_classes[node_index]])
+            for node_index, node_name in enumerate(self.node_names)
+        }
+
+    @typechecked
+    def get_state(self, node_name: Hashable) -> Tuple[float, float]:
+        """Returns the u and v of a node at the current timestep."""
+        node_class: int = self.node_classes[self.node_indices[node_name]]
+        return self.u[node_class], self.v[node_class]
+
+
+@typechecked
+def refine_classes(
+    *,
+    colours: List[Hashable],
+    in_synapses: List[List[Tuple[int, float]]],
+) -> List[int]:
+    """Returns the class of each neuron, in the coarsest partition that
+    refines the colours, in which the neurons of a class receive the same
+    summed weight from each class. Classes are numbered in the order of
+    their first neuron.
+
+    :param colours: The initial colour of each neuron.
+    :param in_synapses: The left neuron and weight of the incoming synapses
+    of each neuron.
+    """
+    node_classes: List[int] = number_colours(colours=colours)
+    nr_of_classes: int = len(set(node_classes))
+    while True:
+        node_classes = number_colours(
+            colours=[
+                (
+                    node_class,
+                    tuple(
+                        sorted(
+                            get_class_weights(
+                                in_synapses=in_synapses[node_index],
+                                node_classes=node_classes,
+                            ).items()
+                        )
+                    ),
+                )
+                for node_index, node_class in enumerate(node_classes)
+            ]
+        )
+        if len(set(node_classes)) == nr_of_classes:
+            return node_classes
+        nr_of_classes = len(set(node_classes))
+
+
+@typechecked
+def number_colours(*, colours: List[Hashable]) -> List[int]:
+    """Returns the colours as consecutive integers, in order of appearance."""
+    colour_numbers: Dict[Hashable, int] = {}
+    return [
+        colour_numbers.setdefault(colour, len(colour_numbers))
+        for colour in colours
+    ]
+
+
+# Not typechecked, it runs for every neuron in every refinement.
+def get_class_weights(
+    *,
+    in_synapses: List[Tuple[int, float]],
+    node_classes: List[int],
+) -> Dict[int, float]:
+    """Returns the summed weight of the incoming synapses of a neuron per
+    class of their left neuron."""
+    class_weights: Dict[int, float] = {}
+    for left, weight in in_synapses:
+        class_weights[node_classes[left]] = (
+            class_weights.get(node_classes[left], 0.0) + weight
+        )
+    return class_weights
+
+
+@typechecked
+def simulate_symmetry_reduced(
+    *, snn_graph: nx.DiGraph, nr_of_timesteps: int
+) -> Symmetry_reduced_simulator:
+    """Simulates the graph for nr_of_timesteps timesteps, with one
+    representative neuron per class of identical neurons, and returns the
+    simulator with the spike times and states of the neurons.
+
+    :param snn_graph: Graph with nx_lif neurons, e.g. a population coded
+    graph with node names or integer node ids.
+    :param nr_of_timesteps: The number of timesteps that are simulated.
+    """
+    simulator = Symmetry_reduced_simulator(snn_graph)
+    simulator.simulate(nr_of_timesteps)
+    return simulator
@@ -0,0 +1,393 @@
+"""Checks the structural invariants of the graph that a single adaptation
+creates from an unadapted graph, in a single pass over its neurons and
+synapses, such that a malformed adaptation is found without simulating it."""
+from typing import Dict, Iterable, List, Tuple
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import LIF_neuron
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.neuron_roles import get_neuron_role, redundant_prefix
+from snnadaptation.plan.Adaptation_delta import (
+    Adaptation_delta,
+    reverse_index_key,
+)
+from snnadaptation.plan.apply_adaptation_plan import (
+    get_neuron_graph,
+    get_redundant_neuron_properties,
+)
+from snnadaptation.redundancy.apply_sparse_redundancy import (
+    inhibition_weight,
+    next_round_selector_weight,
+    selector_recurrent_weight,
+)
+from snnadaptation.selection.select_neurons import is_adaptable
+
+
+@typechecked
+def verify_adapted_graph(
+    *, adapted_graph: nx.DiGraph, adaptation: Adaptation
+) -> None:
+    """Raises an error that lists the violated invariants, if the adapted
+    graph does not have the structure that the adaptation creates."""
+    violations: List[str] = get_invariant_violations(
+        adapted_graph=adapted_graph, adaptation=adaptation
+    )
+    if violations:
+        raise ValueError(
+            f"Error, the adapted graph violates {len(violations)} "
+            + "invariants, e.g.:\n"
+            + "\n".join(violations[:10])
+        )
+
+
+@typechecked
+def get_invariant_violations(
+    *, adapted_graph: nx.DiGraph, adaptation: Adaptation
+) -> List[str]:
+    """Returns a description of each violated invariant of the adapted graph,
+    in time linear in the amount of neurons and synapses.
+
+    :param adapted_graph: The output of apply_sparse_redundancy or
+    apply_population_coding for an unadapted graph.
+    :param adaptation: The single stage adaptation of the adapted graph.
+    """
+    if adaptation.next_stages:
+        raise NotImplementedError(
+            "Error, only single stage adaptations can be checked."
+        )
+    violations: List[str] = []
+    if adapted_graph.graph.get("red_level") != adaptation.redundancy:
+        violations.append(
+            f"red_level is {adapted_graph.graph.get('red_level')}, expected "
+            + f"{adaptation.redundancy}"
+        )
+    copies: Dict[str, Dict[int, str]] = get_copies(
+        adapted_graph=adapted_graph,
+        adaptation=adaptation,
+        violations=violations,
+    )
+    if adaptation.adaptation_type == "redundancy":
+        expected_weights: Dict[Tuple[str, str], float] = {}
+        for original_node_name, red_levels in copies.items():
+            expected_weights.update(
+                get_sparse_redundancy_weights(
+                    adapted_graph=adapted_graph,
+                    original_node_name=original_node_name,
+                    red_levels=red_levels,
+                    copies=copies,
+                )
+            )
+        check_neuron_properties(
+            adapted_graph=adapted_graph,
+            adaptation=adaptation,
+            copies=copies,
+            original_properties=Adaptation_delta("redundancy", 0),
+            violations=violations,
+        )
+    else:
+        expected_weights = get_population_weights(
+            adapted_graph=adapted_graph, copies=copies
+        )
+        if adapted_graph.graph.get(reverse_index_key):
+            # The reverse index stores the properties of the original neurons
+            # before population coding overrode them.
+            original_properties = Adaptation_delta("population", 0)
+            original_properties.neuron_overrides = adapted_graph.graph[
+                reverse_index_key
+            ][-1]["neuron_overrides"]
+            check_neuron_properties(
+                adapted_graph=adapted_graph,
+                adaptation=adaptation,
+                copies=copies,
+                original_properties=original_properties,
+                violations=violations,
+            )
+        else:
+            check_population_neuron_properties(
+                adapted_graph=adapted_graph,
+                adaptation=adaptation,
+                copies=copies,
+                violations=violations,
+            )
+    check_synapses(
+        adapted_graph=adapted_graph,
+        copies=copies,
+        expected_weights=expected_weights,
+        violations=violations,
+    )
+    return violations
+
+
+@typechecked
+def get_copies(
+    *,
+    adapted_graph: nx.DiGraph,
+    adaptation: Adaptation,
+    violations: List[str],
+) -> Dict[str, Dict[int, str]]:
+    """Returns the redundant neurons of each adapted original neuron, by
+    red_level, and adds the violations of their names and amounts."""
+    copies: Dict[str, Dict[int, str]] = {}
+    for node_name in adapted_graph.nodes:
+        match = redundant_prefix.match(node_name)
+        if match is None:
+            continue
+        original_node_name: str = redundant_prefix.sub("", node_name, count=1)
+        red_level: int = int(match.group(1))
+        if node_name.startswith("s"):
+            violations.append(f"{node_name} has a stage prefix")
+        elif original_node_name not in adapted_graph:
+            violations.append(f"{node_name} has no original neuron")
+        elif not 1 <= red_level <= adaptation.redundancy:
+            violations.append(f"{node_name} has red_level {red_level}")
+        elif not is_adaptable(
+            node_name=original_node_name,
+            adaptation_type=adaptation.adaptation_type,
+        ):
+            violations.append(
+                f"{node_name} copies a neuron that is not adapted by "
+                + adaptation.adaptation_type
+            )
+        else:
+            copies.setdefault(original_node_name, {})[red_level] = node_name
+    for original_node_name, red_levels in copies.items():
+        if len(red_levels) != adaptation.redundancy:
+            violations.append(
+                f"{original_node_name} has {len(red_levels)} redundant "
+                + f"neurons, expected {adaptation.redundancy}"
+            )
+    return copies
+
+
+@typechecked
+def check_synapses(
+    *,
+    adapted_graph: nx.DiGraph,
+    copies: Dict[str, Dict[int, str]],
+    expected_weights: Dict[Tuple[str, str], float],
+    violations: List[str],
+) -> None:
+    """Adds the violations of the synapses into and out of the redundant
+    neurons: each expected synapse must exist with its expected weight, and
+    a redundant neuron may not have any other synapse."""
+    for (left, right), weight in expected_weights.items():
+        check_weight(
+            adapted_graph=adapted_graph,
+            left=left,
+            right=right,
+            weight=weight,
+            violations=violations,
+        )
+    unexpected: Dict[Tuple[str, str], None] = {}
+    for red_levels in copies.values():
+        for node_name in red_levels.values():
+            for edge in list(adapted_graph.in_edges(node_name)) + list(
+                adapted_graph.out_edges(node_name)
+            ):
+                if edge not in expected_weights:
+                    unexpected[edge] = None
+    for left, right in unexpected:
+        violations.append(f"synapse {left}->{right} is unexpected")
+
+
+@typechecked
+def get_sparse_redundancy_weights(
+    *,
+    adapted_graph: nx.DiGraph,
+    original_node_name: str,
+    red_levels: Dict[int, str],
+    copies: Dict[str, Dict[int, str]],
+) -> Dict[Tuple[str, str], float]:
+    """Returns the expected weight of each synapse into and out of the
+    redundant neurons of an original neuron. Each redundant neuron mirrors
+    the synapses of its original neuron, also from the redundant next_round
+    neurons of its red_level, is inhibited by its original neuron and the
+    redundant neurons of lower red_level, and recurrent and selector neurons
+    excite themselves. Later entries overwrite earlier ones, in the order of
+    apply_sparse_redundancy."""
+    weights: Dict[Tuple[str, str], float] = {}
+    for red_level, node_name in sorted(red_levels.items()):
+        for left in get_original_neighbours(
+            neighbours=adapted_graph.pred[original_node_name]
+        ):
+            weight: float = adapted_graph.edges[left, original_node_name][
+                "synapse"
+            ].weight
+            if original_node_name.startswith("selector_") and left.startswith(
+                "next_round_"
+            ):
+                weight = next_round_selector_weight
+            weights[left, node_name] = weight
+            if left.startswith("next_round_") and red_level in copies.get(
+                left, {}
+            ):
+                weights[copies[left][red_level], node_name] = weight
+        for right in get_original_neighbours(
+            neighbours=adapted_graph.succ[original_node_name]
+        ):
+            weights[node_name, right] = adapted_graph.edges[
+                original_node_name, right
+            ]["synapse"].weight
+        if "counter" not in original_node_name:
+            if "recur" in adapted_graph.nodes[original_node_name]:
+                weights[node_name, node_name] = adapted_graph.nodes[
+                    original_node_name
+                ]["recur"]
+            for inhibitor in [original_node_name] + [
+                red_levels[lower_red_level]
+                for lower_red_level in range(1, red_level)
+                if lower_red_level in red_levels
+            ]:
+                weights[inhibitor, node_name] = inhibition_weight
+        if original_node_name.startswith("selector_"):
+            weights[node_name, node_name] = selector_recurrent_weight
+    return weights
+
+
+@typechecked
+def get_population_weights(
+    *,
+    adapted_graph: nx.DiGraph,
+    copies: Dict[str, Dict[int, str]],
+) -> Dict[Tuple[str, str], float]:
+    """Returns the expected weight of each synapse of population coding: the
+    populations of the neurons of an original synapse are fully connected
+    with the weight of the original synapse, except for synapses into
+    connectors, and the redundant neurons of a recurrent neuron have its
+    self-loop."""
+    weights: Dict[Tuple[str, str], float] = {}
+    for left, right, synapse in adapted_graph.edges(data="synapse"):
+        if redundant_prefix.match(left) or redundant_prefix.match(right):
+            continue
+        if left == right:
+            for node_name in copies.get(left, {}).values():
+                weights[node_name, node_name] = synapse.weight
+        elif "connector" not in right:
+            for left_node_name in [left] + list(copies.get(left, {}).values()):
+                for right_node_name in [right] + list(
+                    copies.get(right, {}).values()
+                ):
+                    weights[left_node_name, right_node_name] = synapse.weight
+    return weights
+
+
+# pylint: disable=R0913
+@typechecked
+def check_neuron_properties(
+    *,
+    adapted_graph: nx.DiGraph,
+    adaptation: Adaptation,
+    copies: Dict[str, Dict[int, str]],
+    original_properties: Adaptation_delta,
+    violations: List[str],
+) -> None:
+    """Adds the violations of the bias, du, dv and vth of the redundant
+    neurons and of the overridden original neurons, e.g. the scaled
+    population thresholds.
+
+    :param original_properties: Contains the properties of the original
+    neurons that the adaptation overrode.
+    """
+    for original_node_name, red_levels in copies.items():
+        original_graph: nx.DiGraph = get_neuron_graph(
+            snn_graph=adapted_graph,
+            base_delta=original_properties,
+            node_name=original_node_name,
+        )
+        node_names: Dict[int, str] = dict(red_levels)
+        if adaptation.adaptation_type == "population":
+            # The original neuron gets the properties of red_level 1.
+            node_names[0] = original_node_name
+        for red_level, node_name in node_names.items():
+            expected: Dict[str, float] = get_redundant_neuron_properties(
+                adaptation_type=adaptation.adaptation_type,
+                snn_graph=original_graph,
+                node_name=original_node_name,
+                red_level=max(red_level, 1),
+                redundancy=adaptation.redundancy,
+            )
+            found: Dict[str, float] = get_neuron_properties(
+                lif_neuron=adapted_graph.nodes[node_name]["nx_lif"][0]
+            )
+            if found != expected:
+                violations.append(
+                    f"{node_name} has properties {found}, expected {expected}"
+                )
+
+
+@typechecked
+def check_population_neuron_properties(
+    *,
+    adapted_graph: nx.DiGraph,
+    adaptation: Adaptation,
+    copies: Dict[str, Dict[int, str]],
+    violations: List[str],
+) -> None:
+    """Adds the violations of the neuron properties of population coding, for
+    a graph without reverse index: every neuron of a population must have
+    the properties of its original neuron, and the counters a vth of the
+    redundancy. The scaled thresholds of the other original neurons can not
+    be checked without their unadapted properties."""
+    for original_node_name, red_levels in copies.items():
+        expected: Dict[str, float] = get_neuron_properties(
+            lif_neuron=adapted_graph.nodes[original_node_name]["nx_lif"][0]
+        )
+        if get_neuron_role(node_name=original_node_name) == "counter" and (
+            expected["vth"] != adaptation.redundancy
+        ):
+            violations.append(
+                f"{original_node_name} has vth {expected['vth']}, expected "
+                + f"{float(adaptation.redundancy)}"
+            )
+        for node_name in red_levels.values():
+            found: Dict[str, float] = get_neuron_properties(
+                lif_neuron=adapted_graph.nodes[node_name]["nx_lif"][0]
+            )
+            if found != expected:
+                violations.append(
+                    f"{node_name} has properties {found}, expected {expected}"
+                )
+
+
+@typechecked
+def get_neuron_properties(*, lif_neuron: LIF_neuron) -> Dict[str, float]:
+    """Returns the bias, du, dv and vth of a neuron."""
+    return {
+        "bias": lif_neuron.bias.get(),
+        "du": lif_neuron.du.get(),
+        "dv": lif_neuron.dv.get(),
+        "vth": lif_neuron.vth.get(),
+    }
+
+
+@typechecked
+def get_original_neighbours(*, neighbours: Iterable[str]) -> List[str]:
+    """Returns the neighbours that are original neurons, in graph order."""
+    return [
+        node_name
+        for node_name in neighbours
+        if not redundant_prefix.match(node_name)
+    ]
+
+
+@typechecked
+def check_weight(
+    *,
+    adapted_graph: nx.DiGraph,
+    left: str,
+    right: str,
+    weight: float,
+    violations: List[str],
+) -> None:
+    """Adds a violation if the synapse does not exist or has another
+    weight."""
+    if not adapted_graph.has_edge(left, right):
+        violations.append(f"synapse {left}->{right} is missing")
+    elif adapted_graph.edges[left, right]["synapse"].weight != weight:
+        violations.append(
+            f"synapse {left}->{right} has weight "
+            + f"{adapted_graph.edges[left, right]['synapse'].weight}, "
+            + f"expected {weight}"
+        )
@@ -0,0 +1,74 @@
+"""Tests whether adapting one shared base graph from several threads yields the
+same graphs as serial adaptation, and leaves the base graph unchanged."""
+import copy
+import unittest
+from typing import List
+
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.parallel.adapt_concurrently import adapt_concurrently
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from tests.test_helper_synthetic_mdsa_graph import (
+    get_graph_snapshot,
+    get_synthetic_mdsa_graph,
+)
+
+
+class Test_adapt_concurrently(unittest.TestCase):
+    """Stress tests the concurrent adaptation of a shared base graph."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def test_concurrent_adaptations_equal_serial_adaptations(self) -> None:
+        """Adapts the same base graph many times from a thread pool, and
+        compares each result with the serial adaptation."""
+        plot_config = Plot_config()
+        snn_graph = get_synthetic_mdsa_graph(size=3, m_val=1)
+        original_snapshot = copy.deepcopy(
+            get_graph_snapshot(snn_graph=snn_graph)
+        )
+        adaptations: List[Adaptation] = [
+            Adaptation(adaptation_type, redundancy)
+            for adaptation_type in ["redundancy", "population"]
+            for redundancy in [1, 2, 3]
+        ] + [
+            Adaptation(
+                "population", 2, next_stages=[Adaptation("redundancy", 1)]
+            )
+        ]
+        serial_snapshots = [
+            get_graph_snapshot(
+                snn_graph=apply_fused_adaptation(
+                    adaptation_graph=snn_graph,
+                    adaptation=adaptation,
+                    plot_config=plot_config,
+                )
+            )
+            for adaptation in adaptations
+        ]
+        self.assertEqual(
+            get_graph_snapshot(snn_graph=snn_graph), original_snapshot
+        )
+
+        # Repeat each adaptation such that the threads overlap.
+        repeats: int = 8
+        adapted_graphs = adapt_concurrently(
+            snn_graph=snn_graph,
+            adaptations=adaptations * repeats,
+            plot_config=plot_config,
+            max_workers=8,
+        )
+        for index, adapted_graph in enumerate(adapted_graphs):
+            self.assertEqual(
+                get_graph_snapshot(snn_graph=adapted_graph),
+                serial_snapshots[index % len(adaptations)],
+            )
+        self.assertEqual(
+            get_graph_snapshot(snn_graph=snn_graph), original_snapshot
+        )
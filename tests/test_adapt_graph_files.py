@@ -0,0 +1,198 @@
+"""Tests whether the batch command adapts every graph file with every
+adaptation, skips graphs that were already adapted, and reports the graph
+files that fail."""
+import contextlib
+import csv
+import io
+import os
+import tempfile
+import unittest
+from typing import List
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.cli.adapt_graph_files import main
+from snnadaptation.compaction.compact_graph import compact_graph
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.serialization.stream_node_link_json import (
+    stream_graph_from_json,
+    stream_graph_to_json,
+)
+from tests.test_helper_synthetic_mdsa_graph import (
+    get_graph_snapshot,
+    get_synthetic_mdsa_graph,
+)
+
+
+@typechecked
+def get_timings(*, output_dir: str) -> List[List[str]]:
+    """Returns the rows of timings.csv in the output directory."""
+    with open(
+        os.path.join(output_dir, "timings.csv"), encoding="utf-8", newline=""
+    ) as timings_file:
+        return list(csv.reader(timings_file))
+
+
+class Test_adapt_graph_files(unittest.TestCase):
+    """Runs the batch command on graph files in a temporary directory."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        self.snn_graphs = {
+            "small": get_synthetic_mdsa_graph(size=3, m_val=1),
+            "large": get_synthetic_mdsa_graph(size=4, m_val=2),
+        }
+
+    @typechecked
+    def write_graphs(self, *, input_dir: str) -> None:
+        """Writes the unadapted graphs into the input directory."""
+        for stem, snn_graph in self.snn_graphs.items():
+            stream_graph_to_json(
+                snn_graph=snn_graph,
+                json_path=os.path.join(input_dir, f"{stem}.json"),
+            )
+
+    @typechecked
+    def run_main(self, args: List[str]) -> str:
+        """Runs the batch command, and returns what it printed."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main(args)
+        return output.getvalue()
+
+    @typechecked
+    def test_adapt_and_skip(self) -> None:
+        """Writes one verified, compressed graph per graph file and
+        adaptation, skips them in the next run, and recreates them with
+        --overwrite."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_dir = os.path.join(tmp_dir, "adapted")
+            self.write_graphs(input_dir=tmp_dir)
+            args: List[str] = [
+                tmp_dir,
+                "-a",
+                "redundancy_2",
+                "-a",
+                "population_1",
+                "-o",
+                output_dir,
+                "-j",
+                "2",
+                "--verify",
+                "--compression",
+                "gzip",
+            ]
+            self.run_main(args)
+            for stem, snn_graph in self.snn_graphs.items():
+                for adaptation in [
+                    Adaptation("redundancy", 2),
+                    Adaptation("population", 1),
+                ]:
+                    self.assertEqual(
+                        get_graph_snapshot(
+                            snn_graph=stream_graph_from_json(
+                                json_path=os.path.join(
+                                    output_dir,
+                                    f"{stem}_{adaptation.get_name()}.json.gz",
+                                )
+                            )
+                        ),
+                        get_graph_snapshot(
+                            snn_graph=apply_fused_adaptation(
+                                adaptation_graph=snn_graph,
+                                adaptation=adaptation,
+                                plot_config=Plot_config(),
+                            )
+                        ),
+                    )
+            timings = get_timings(output_dir=output_dir)
+            self.assertEqual(
+                timings[0], ["input", "adaptation", "output", "seconds"]
+            )
+            self.assertEqual(len(timings), 5)
+            self.assertEqual(len(os.listdir(output_dir)), 5)
+
+            self.assertIn("skipped, already adapted", self.run_main(args))
+            self.assertEqual(len(get_timings(output_dir=output_dir)), 5)
+            self.run_main(args + ["--overwrite"])
+            self.assertEqual(len(get_timings(output_dir=output_dir)), 9)
+            self.assertEqual(len(os.listdir(output_dir)), 5)
+
+    @typechecked
+    def test_compact(self) -> None:
+        """Writes the compacted adapted graph."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.write_graphs(input_dir=tmp_dir)
+            output_dir = os.path.join(tmp_dir, "adapted")
+            self.run_main(
+                [
+                    os.path.join(tmp_dir, "small.json"),
+                    "-a",
+                    "redundancy_1",
+                    "-o",
+                    output_dir,
+                    "--compact",
+                ]
+            )
+            adapted_graph: nx.DiGraph = apply_fused_adaptation(
+                adaptation_graph=self.snn_graphs["small"],
+                adaptation=Adaptation("redundancy", 1),
+                plot_config=Plot_config(),
+            )
+            compact_graph(snn_graph=adapted_graph)
+            self.assertEqual(
+                get_graph_snapshot(
+                    snn_graph=stream_graph_from_json(
+                        json_path=os.path.join(
+                            output_dir, "small_redundancy_1.json"
+                        )
+                    )
+                ),
+                get_graph_snapshot(snn_graph=adapted_graph),
+            )
+
+    @typechecked
+    def test_failures(self) -> None:
+        """Adapts the other graph files when one fails, and exits with code
+        1. Invalid adaptations and inputs are rejected before any work is
+        started."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.write_graphs(input_dir=tmp_dir)
+            with open(
+                os.path.join(tmp_dir, "broken.json"), "w", encoding="utf-8"
+            ) as broken_file:
+                broken_file.write('{"nodes": [')
+            output_dir = os.path.join(tmp_dir, "adapted")
+            output = io.StringIO()
+            with self.assertRaises(SystemExit) as exit_context:
+                with contextlib.redirect_stdout(output):
+                    main([tmp_dir, "-a", "redundancy_1", "-o", output_dir])
+            self.assertEqual(exit_context.exception.code, 1)
+            self.assertIn("broken.json: failed", output.getvalue())
+            self.assertEqual(
+                sorted(os.listdir(output_dir)),
+                [
+                    "large_redundancy_1.json",
+                    "small_redundancy_1.json",
+                    "timings.csv",
+                ],
+            )
+            self.assertEqual(len(get_timings(output_dir=output_dir)), 3)
+
+            with self.assertRaises(ValueError):
+                main([tmp_dir, "-a", "redundancy", "-o", output_dir])
+            with self.assertRaises(FileNotFoundError):
+                main(
+                    [
+                        os.path.join(tmp_dir, "*.graphml"),
+                        "-a",
+                        "redundancy_1",
+                        "-o",
+                        output_dir,
+                    ]
+                )
@@ -0,0 +1,86 @@
+"""Tests whether the out-of-core adaptation of a graph in an SQLite store
+yields the same adapted graph as the in-memory adaptation, with chunks that
+are much smaller than the graph."""
+import os
+import tempfile
+import unittest
+
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.out_of_core.adapt_out_of_core import adapt_out_of_core
+from snnadaptation.out_of_core.Sqlite_graph_store import (
+    read_graph_from_store,
+    write_graph_to_store,
+)
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from tests.test_helper_synthetic_mdsa_graph import (
+    get_graph_snapshot,
+    get_synthetic_mdsa_graph,
+)
+
+chunk_size: int = 16
+
+
+class Test_adapt_out_of_core(unittest.TestCase):
+    """Compares the out-of-core adaptation with the in-memory adaptation."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def test_equals_in_memory_adaptation(self) -> None:
+        """Compares the neurons and synapses of both adapted graphs. The
+        group metadata is only created in memory."""
+        for adaptation in [
+            Adaptation("redundancy", 1),
+            Adaptation("redundancy", 3),
+            Adaptation("population", 2),
+        ]:
+            with self.subTest(
+                adaptation=adaptation.get_name()
+            ), tempfile.TemporaryDirectory() as tmp_dir:
+                input_store_path = os.path.join(tmp_dir, "input.db")
+                output_store_path = os.path.join(tmp_dir, "output.db")
+                write_graph_to_store(
+                    snn_graph=get_synthetic_mdsa_graph(size=4, m_val=2),
+                    store_path=input_store_path,
+                    chunk_size=chunk_size,
+                )
+                adapt_out_of_core(
+                    input_store_path=input_store_path,
+                    output_store_path=output_store_path,
+                    adaptation=adaptation,
+                    plot_config=Plot_config(),
+                    chunk_size=chunk_size,
+                )
+                nodes, edges, _ = get_graph_snapshot(
+                    snn_graph=read_graph_from_store(
+                        store_path=output_store_path
+                    )
+                )
+                (
+                    expected_nodes,
+                    expected_edges,
+                    expected_graph_attributes,
+                ) = get_graph_snapshot(
+                    snn_graph=apply_fused_adaptation(
+                        adaptation_graph=get_synthetic_mdsa_graph(
+                            size=4, m_val=2
+                        ),
+                        adaptation=adaptation,
+                        plot_config=Plot_config(),
+                    )
+                )
+                self.assertGreater(len(expected_edges), 10 * chunk_size)
+                self.assertEqual(nodes, expected_nodes)
+                self.assertEqual(edges, expected_edges)
+                self.assertEqual(
+                    read_graph_from_store(store_path=output_store_path).graph[
+                        "red_level"
+                    ],
+                    expected_graph_attributes["red_level"],
+                )
@@ -0,0 +1,225 @@
+"""Tests whether the pipelined adaptation yields the adapted graphs in input
+order, adapts at most prefetch graphs ahead, and cancels the pending
+adaptations when the consumer stops early."""
+import threading
+import time
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+from unittest import mock
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.parallel import adapt_pipelined
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from tests.test_helper_synthetic_mdsa_graph import (
+    get_graph_snapshot,
+    get_synthetic_mdsa_graph,
+)
+
+
+class Single_worker_executor(ThreadPoolExecutor):
+    """Runs the adaptations on a single thread, and keeps their futures."""
+
+    executors: List["Single_worker_executor"] = []
+
+    @typechecked
+    def __init__(self, max_workers: int) -> None:
+        super().__init__(max_workers=1)
+        self.max_workers: int = max_workers
+        self.futures: List[Future] = []
+        Single_worker_executor.executors.append(self)
+
+    def submit(  # type:ignore[override]
+        self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any
+    ) -> Future:
+        """Submits the adaptation, and keeps its future."""
+        future: Future = super().submit(fn, *args, **kwargs)
+        self.futures.append(future)
+        return future
+
+
+class Test_adapt_pipelined(unittest.TestCase):
+    """Tests the order, the prefetch bound and the cancellation of the
+    pipelined adaptation."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        self.plot_config = Plot_config()
+        self.graph_adaptations: List[Tuple[nx.DiGraph, Adaptation]] = [
+            (get_synthetic_mdsa_graph(size=size, m_val=1), adaptation)
+            for size in [2, 3]
+            for adaptation in [
+                Adaptation("redundancy", 1),
+                Adaptation("population", 2),
+                Adaptation("redundancy", 3),
+            ]
+        ]
+
+    @typechecked
+    def get_expected_snapshots(self) -> List[Any]:
+        """Returns the snapshots of the serially adapted graphs."""
+        return [
+            get_graph_snapshot(
+                snn_graph=apply_fused_adaptation(
+                    adaptation_graph=snn_graph,
+                    adaptation=adaptation,
+                    plot_config=self.plot_config,
+                )
+            )
+            for snn_graph, adaptation in self.graph_adaptations
+        ]
+
+    @typechecked
+    def test_input_order(self) -> None:
+        """Yields the adapted graphs in input order, with processes, and with
+        threads of which the earlier adaptations finish last."""
+        expected_snapshots = self.get_expected_snapshots()
+        self.assertEqual(
+            [
+                get_graph_snapshot(snn_graph=adapted_graph)
+                for adapted_graph in adapt_pipelined.adapt_pipelined(
+                    graph_adaptations=self.graph_adaptations,
+                    plot_config=self.plot_config,
+                    prefetch=3,
+                )
+            ],
+            expected_snapshots,
+        )
+
+        # The adaptations of each group of three finish in reverse order.
+        delays: Dict[int, float] = {
+            id(adaptation): 0.03 * (2 - index % 3)
+            for index, (_, adaptation) in enumerate(self.graph_adaptations)
+        }
+
+        def delayed_adaptation(**kwargs: Any) -> nx.DiGraph:
+            """Adapts the graph after the delay of its adaptation."""
+            time.sleep(delays[id(kwargs["adaptation"])])
+            return apply_fused_adaptation(**kwargs)
+
+        with mock.patch.object(
+            adapt_pipelined, "apply_fused_adaptation", delayed_adaptation
+        ):
+            self.assertEqual(
+                [
+                    get_graph_snapshot(snn_graph=adapted_graph)
+                    for adapted_graph in adapt_pipelined.adapt_pipelined(
+                        graph_adaptations=self.graph_adaptations,
+                        plot_config=self.plot_config,
+                        prefetch=3,
+                        use_processes=False,
+                    )
+                ],
+                expected_snapshots,
+            )
+
+    @typechecked
+    def test_prefetch_bound(self) -> None:
+        """Runs at most prefetch adaptations at once, and takes at most
+        prefetch graphs from the input ahead of the consumer."""
+        lock = threading.Lock()
+        running: List[int] = [0, 0]
+
+        def counted_adaptation(**kwargs: Any) -> nx.DiGraph:
+            """Adapts the graph, and keeps the maximum amount of concurrent
+            adaptations."""
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return apply_fused_adaptation(**kwargs)
+
+        nr_of_inputs: List[int] = [0]
+
+        def counted_inputs() -> Iterator[Tuple[nx.DiGraph, Adaptation]]:
+            """Yields the graphs and adaptations, and counts them."""
+            for graph_adaptation in self.graph_adaptations:
+                nr_of_inputs[0] += 1
+                yield graph_adaptation
+
+        for prefetch in [1, 2, 4]:
+            with self.subTest(prefetch=prefetch):
+                running[1] = 0
+                nr_of_inputs[0] = 0
+                nr_of_outputs: int = 0
+                with mock.patch.object(
+                    adapt_pipelined,
+                    "apply_fused_adaptation",
+                    counted_adaptation,
+                ):
+                    for _ in adapt_pipelined.adapt_pipelined(
+                        graph_adaptations=counted_inputs(),
+                        plot_config=self.plot_config,
+                        prefetch=prefetch,
+                        use_processes=False,
+                    ):
+                        nr_of_outputs += 1
+                        self.assertLessEqual(
+                            nr_of_inputs[0], nr_of_outputs + prefetch
+                        )
+                self.assertEqual(nr_of_outputs, len(self.graph_adaptations))
+                self.assertLessEqual(running[1], prefetch)
+                if prefetch > 1:
+                    self.assertGreater(running[1], 1)
+        with self.assertRaises(ValueError):
+            next(
+                adapt_pipelined.adapt_pipelined(
+                    graph_adaptations=self.graph_adaptations,
+                    plot_config=self.plot_config,
+                    prefetch=0,
+                )
+            )
+
+    @typechecked
+    def test_cancel_on_early_stop(self) -> None:
+        """Cancels the adaptations that have not started when the consumer
+        stops after the first graph, and waits for the running one. The
+        single worker is blocked by the second adaptation, such that the
+        later ones are still queued."""
+        release = threading.Event()
+        nr_of_calls: List[int] = [0]
+
+        def blocking_adaptation(**kwargs: Any) -> nx.DiGraph:
+            """Adapts the first graph, and blocks the next adaptation until
+            it is released."""
+            nr_of_calls[0] += 1
+            if nr_of_calls[0] == 2:
+                release.wait(timeout=10)
+            return apply_fused_adaptation(**kwargs)
+
+        Single_worker_executor.executors.clear()
+        with mock.patch.object(
+            adapt_pipelined, "apply_fused_adaptation", blocking_adaptation
+        ), mock.patch.object(
+            adapt_pipelined, "ThreadPoolExecutor", Single_worker_executor
+        ):
+            adapted_graphs = adapt_pipelined.adapt_pipelined(
+                graph_adaptations=self.graph_adaptations,
+                plot_config=self.plot_config,
+                prefetch=3,
+                use_processes=False,
+            )
+            next(adapted_graphs)
+            closer = threading.Thread(target=adapted_graphs.close)
+            closer.start()
+            # The consumer stops while the second adaptation blocks.
+            closer.join(timeout=0.5)
+            self.assertTrue(closer.is_alive())
+            futures: List[Future] = Single_worker_executor.executors[0].futures
+            self.assertEqual(len(futures), 4)
+            self.assertEqual(
+                [future.cancelled() for future in futures],
+                [False, False, True, True],
+            )
+            release.set()
+            closer.join()
+        self.assertTrue(futures[1].done())
+        self.assertEqual(nr_of_calls[0], 2)
@@ -0,0 +1,88 @@
+"""Tests whether the deltas of sparse redundancy and population coding yield
+the adapted graphs, with node names and with integer node ids."""
+import copy
+import unittest
+
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.plan.apply_adaptation_plan import apply_adaptation_delta
+from snnadaptation.plan.integer_ids import (
+    apply_adaptation_delta_with_integer_ids,
+)
+from snnadaptation.population.apply_population_coding import (
+    apply_population_coding,
+    get_population_coding_delta,
+)
+from snnadaptation.redundancy.apply_sparse_redundancy import (
+    apply_sparse_redundancy,
+    get_sparse_redundancy_delta,
+)
+from snnadaptation.selection.Selection_policy import Selection_policy
+from tests.test_helper_synthetic_mdsa_graph import (
+    get_graph_snapshot,
+    get_synthetic_mdsa_graph,
+)
+
+
+class Test_adaptation_delta(unittest.TestCase):
+    """Compares the applied deltas with the adapted graphs."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def test_delta_yields_adapted_graph(self) -> None:
+        """Applies the delta to a copy of the input graph, and to integer
+        node ids, and checks the input graph is not changed."""
+        plot_config = Plot_config()
+        for apply_adaptation, get_delta in [
+            (apply_sparse_redundancy, get_sparse_redundancy_delta),
+            (apply_population_coding, get_population_coding_delta),
+        ]:
+            for redundancy in [1, 3]:
+                for selection in [None, Selection_policy(roles=["selector"])]:
+                    with self.subTest(
+                        adaptation=apply_adaptation.__name__,
+                        redundancy=redundancy,
+                        selection=selection is not None,
+                    ):
+                        snn_graph = get_synthetic_mdsa_graph(size=4, m_val=2)
+                        input_snapshot = get_graph_snapshot(
+                            snn_graph=snn_graph
+                        )
+                        delta = get_delta(
+                            snn_graph=snn_graph,
+                            redundancy=redundancy,
+                            plot_config=plot_config,
+                            selection=selection,
+                        )
+                        self.assertEqual(
+                            get_graph_snapshot(snn_graph=snn_graph),
+                            input_snapshot,
+                        )
+                        for integer_ids in [False, True]:
+                            expected_graph = apply_adaptation(
+                                adaptation_graph=snn_graph,
+                                redundancy=redundancy,
+                                plot_config=plot_config,
+                                selection=selection,
+                                integer_ids=integer_ids,
+                            )
+                            if integer_ids:
+                                adapted_graph = (
+                                    apply_adaptation_delta_with_integer_ids(
+                                        snn_graph=snn_graph, delta=delta
+                                    )
+                                )
+                            else:
+                                adapted_graph = apply_adaptation_delta(
+                                    adaptation_graph=copy.deepcopy(snn_graph),
+                                    delta=delta,
+                                )
+                            self.assertEqual(
+                                get_graph_snapshot(snn_graph=adapted_graph),
+                                get_graph_snapshot(snn_graph=expected_graph),
+                            )
@@ -0,0 +1,138 @@
+"""Tests whether a compiled adaptation plan, replayed on a graph with the same
+topology but other neuron properties and weights, yields a fresh adaptation
+of that graph, and whether other topologies are rejected."""
+import copy
+import unittest
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import Synapse
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.apply_adaptation_plan import (
+    apply_adaptation_plan,
+    set_neuron_properties,
+)
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.plan.compile_adaptation_plan import compile_adaptation_plan
+from tests.test_helper_synthetic_mdsa_graph import (
+    get_graph_snapshot,
+    get_synthetic_mdsa_graph,
+)
+
+
+@typechecked
+def get_reweighted_graph(*, snn_graph: nx.DiGraph) -> nx.DiGraph:
+    """Returns a copy of the graph with the same topology, and other neuron
+    properties, recur values and synapse weights."""
+    reweighted_graph: nx.DiGraph = copy.deepcopy(snn_graph)
+    for node_index, node_name in enumerate(reweighted_graph):
+        lif_neuron = reweighted_graph.nodes[node_name]["nx_lif"][0]
+        set_neuron_properties(
+            lif_neuron=lif_neuron,
+            neuron_properties={
+                "bias": lif_neuron.bias.get() + node_index % 3,
+                "du": 0.25,
+                "dv": 0.5,
+                "vth": lif_neuron.vth.get() + 0.5,
+            },
+        )
+        if "recur" in reweighted_graph.nodes[node_name]:
+            reweighted_graph.nodes[node_name]["recur"] -= 2
+    for edge_index, edge in enumerate(reweighted_graph.edges):
+        reweighted_graph.edges[edge]["synapse"] = Synapse(
+            weight=reweighted_graph.edges[edge]["synapse"].weight * 3
+            - edge_index % 5,
+            delay=0,
+            change_per_t=0,
+        )
+    return reweighted_graph
+
+
+class Test_adaptation_plan(unittest.TestCase):
+    """Tests the replay of compiled adaptation plans."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def test_replay_on_other_weights(self) -> None:
+        """Replays the plan of a graph on the graph itself, and on a graph
+        with the same topology and other neuron properties and weights."""
+        plot_config = Plot_config()
+        snn_graph = get_synthetic_mdsa_graph(size=4, m_val=2)
+        reweighted_graph = get_reweighted_graph(snn_graph=snn_graph)
+        for adaptation_type in ["redundancy", "population"]:
+            for redundancy in [1, 3]:
+                with self.subTest(
+                    adaptation_type=adaptation_type, redundancy=redundancy
+                ):
+                    adaptation = Adaptation(adaptation_type, redundancy)
+                    plan = compile_adaptation_plan(
+                        snn_graph=snn_graph, adaptation=adaptation
+                    )
+                    for graph in [reweighted_graph, snn_graph]:
+                        self.assertEqual(
+                            get_graph_snapshot(
+                                snn_graph=apply_adaptation_plan(
+                                    adaptation_graph=copy.deepcopy(graph),
+                                    plan=plan,
+                                    plot_config=plot_config,
+                                )
+                            ),
+                            get_graph_snapshot(
+                                snn_graph=apply_fused_adaptation(
+                                    adaptation_graph=graph,
+                                    adaptation=adaptation,
+                                    plot_config=plot_config,
+                                )
+                            ),
+                        )
+
+    @typechecked
+    def test_other_topology(self) -> None:
+        """Rejects graphs with other nodes, edges or recurrent nodes."""
+        snn_graph = get_synthetic_mdsa_graph(size=4, m_val=2)
+        plan = compile_adaptation_plan(
+            snn_graph=snn_graph, adaptation=Adaptation("redundancy", 2)
+        )
+        recurrent_node: str = next(
+            node_name
+            for node_name, node_attributes in snn_graph.nodes.items()
+            if "recur" in node_attributes
+        )
+        without_edge = copy.deepcopy(snn_graph)
+        without_edge.remove_edge(*list(snn_graph.edges)[3])
+        without_node = copy.deepcopy(snn_graph)
+        without_node.remove_node("rand_0")
+        without_recur = copy.deepcopy(snn_graph)
+        del without_recur.nodes[recurrent_node]["recur"]
+        with_edge = copy.deepcopy(snn_graph)
+        with_edge.add_edge(
+            "rand_0",
+            "rand_1",
+            synapse=Synapse(weight=1.0, delay=0, change_per_t=0),
+        )
+
+        self.assertTrue(plan.matches_topology(snn_graph=snn_graph))
+        self.assertTrue(
+            plan.matches_topology(
+                snn_graph=get_reweighted_graph(snn_graph=snn_graph)
+            )
+        )
+        for other_graph in [
+            without_edge,
+            without_node,
+            without_recur,
+            with_edge,
+        ]:
+            self.assertFalse(plan.matches_topology(snn_graph=other_graph))
+            with self.assertRaises(ValueError):
+                apply_adaptation_plan(
+                    adaptation_graph=other_graph,
+                    plan=plan,
+                    plot_config=Plot_config(),
+                )
@@ -0,0 +1,188 @@
+"""Tests whether the adaptation service returns the graphs of a direct
+adaptation, reports failed adaptations to the client, and only replaces
+unix sockets at its socket path."""
+import asyncio
+import functools
+import os
+import socket
+import tempfile
+import unittest
+from typing import List
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.serialization.node_link_json import graph_to_node_link
+from snnadaptation.service.adaptation_client import adapt_with_service
+from snnadaptation.service.adaptation_server import (
+    Adaptation_server,
+    adapt_request_payload,
+)
+from snnadaptation.service.protocol import (
+    adaptation_to_json,
+    decode_payload,
+    encode_payload,
+)
+from tests.test_helper_synthetic_mdsa_graph import (
+    get_graph_snapshot,
+    get_synthetic_mdsa_graph,
+)
+
+
+@typechecked
+async def wait_for_socket(*, socket_path: str) -> None:
+    """Waits until a unix socket accepts connections."""
+    while True:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            try:
+                connection.connect(socket_path)
+                return
+            except (FileNotFoundError, ConnectionRefusedError):
+                pass
+        await asyncio.sleep(0.01)
+
+
+@typechecked
+async def adapt_with_served_socket(
+    *,
+    server: Adaptation_server,
+    socket_path: str,
+    adaptation: Adaptation,
+    nr_of_requests: int,
+) -> List[nx.DiGraph]:
+    """Serves on the socket while a client sends the same request
+    nr_of_requests times, and stops the server. Returns the adapted graphs
+    of the requests."""
+    serve_task = asyncio.create_task(server.serve(socket_path=socket_path))
+    await wait_for_socket(socket_path=socket_path)
+    loop = asyncio.get_running_loop()
+    adapted_graphs: List[nx.DiGraph] = [
+        await loop.run_in_executor(
+            None,
+            functools.partial(
+                adapt_with_service,
+                snn_graph=get_synthetic_mdsa_graph(size=3, m_val=1),
+                adaptation=adaptation,
+                socket_path=socket_path,
+            ),
+        )
+        for _ in range(nr_of_requests)
+    ]
+    serve_task.cancel()
+    try:
+        await serve_task
+    except asyncio.CancelledError:
+        pass
+    return adapted_graphs
+
+
+class Test_adaptation_service(unittest.TestCase):
+    """Tests the adaptation service with a client on a unix socket."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def test_adapt_with_service(self) -> None:
+        """The service replaces a stale socket, answers a repeated request
+        from its cache, and removes its socket when it stops."""
+        adaptation = Adaptation("redundancy", 2)
+        expected_snapshot = get_graph_snapshot(
+            snn_graph=apply_fused_adaptation(
+                adaptation_graph=get_synthetic_mdsa_graph(size=3, m_val=1),
+                adaptation=adaptation,
+                plot_config=Plot_config(),
+            )
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            socket_path = os.path.join(tmp_dir, "service.sock")
+            # The socket of a service that did not remove it.
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+                stale.bind(socket_path)
+            server = Adaptation_server(1, 4, 4)
+            adapted_graphs = asyncio.run(
+                adapt_with_served_socket(
+                    server=server,
+                    socket_path=socket_path,
+                    adaptation=adaptation,
+                    nr_of_requests=2,
+                )
+            )
+            self.assertFalse(os.path.exists(socket_path))
+        self.assertEqual(len(server.cache), 1)
+        for adapted_graph in adapted_graphs:
+            self.assertEqual(
+                get_graph_snapshot(snn_graph=adapted_graph), expected_snapshot
+            )
+
+    @typechecked
+    def test_refuses_other_files(self) -> None:
+        """The service does not start if its socket path is another kind of
+        file, and leaves the file unchanged."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            socket_path = os.path.join(tmp_dir, "results.csv")
+            with open(socket_path, "w", encoding="utf-8") as results_file:
+                results_file.write("results")
+            server = Adaptation_server(1, 4, 4)
+            with self.assertRaises(FileExistsError):
+                asyncio.run(server.serve(socket_path=socket_path))
+            server.executor.shutdown()
+            with open(socket_path, encoding="utf-8") as results_file:
+                self.assertEqual(results_file.read(), "results")
+
+    @typechecked
+    def test_error_response(self) -> None:
+        """A request that can not be adapted gets an error response, and is
+        not cached."""
+        server = Adaptation_server(1, 4, 4)
+        response = asyncio.run(
+            server.get_response(
+                encode_payload(message={"graph": {}, "adaptation": {}})
+            )
+        )
+        server.executor.shutdown()
+        self.assertEqual(decode_payload(payload=response)["status"], "error")
+        self.assertEqual(len(server.cache), 0)
+
+    @typechecked
+    def test_response_status(self) -> None:
+        """The worker returns the status of its response next to the
+        payload, such that the server does not decode the payload."""
+        for request, expected_status in [
+            (
+                {
+                    "graph": graph_to_node_link(
+                        snn_graph=get_synthetic_mdsa_graph(size=2, m_val=1)
+                    ),
+                    "adaptation": adaptation_to_json(
+                        adaptation=Adaptation("redundancy", 1)
+                    ),
+                },
+                "ok",
+            ),
+            ({"graph": {}, "adaptation": {}}, "error"),
+        ]:
+            status, response = adapt_request_payload(
+                payload=encode_payload(message=request)
+            )
+            self.assertEqual(status, expected_status)
+            self.assertEqual(
+                decode_payload(payload=response)["status"], expected_status
+            )
+
+    @typechecked
+    def test_busy_response(self) -> None:
+        """Requests beyond max_queued are answered with status busy."""
+        server = Adaptation_server(1, 0, 4)
+        response = asyncio.run(
+            server.get_response(
+                encode_payload(message={"graph": {}, "adaptation": {}})
+            )
+        )
+        server.executor.shutdown()
+        self.assertEqual(decode_payload(payload=response), {"status": "busy"})
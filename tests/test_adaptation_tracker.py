@@ -0,0 +1,94 @@
+"""Tests whether re-adapting the local changes of an input graph yields the
+same graph as adapting the changed input graph again."""
+import copy
+import unittest
+from typing import List, Tuple
+
+from snnbackends.networkx.LIF_neuron import Synapse
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.Adaptation_tracker import track_adaptation
+from snnadaptation.plan.apply_adaptation_plan import set_neuron_properties
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.plan.strip_adaptation import strip_adaptation
+from tests.test_helper_synthetic_mdsa_graph import (
+    get_graph_snapshot,
+    get_synthetic_mdsa_graph,
+)
+
+
+class Test_adaptation_tracker(unittest.TestCase):
+    """Tests the incremental re-adaptation of changed neurons and synapses."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def test_readapt_equals_full_adaptation(self) -> None:
+        """Changes neurons, recur values and weights of the input graph, and
+        compares the re-adapted graph with a full adaptation of the changed
+        input graph. Stripping the re-adapted graph should give back the
+        changed input graph."""
+        plot_config = Plot_config()
+        for adaptation_type in ["redundancy", "population"]:
+            for redundancy in [1, 3]:
+                with self.subTest(
+                    adaptation_type=adaptation_type, redundancy=redundancy
+                ):
+                    adaptation = Adaptation(adaptation_type, redundancy)
+                    snn_graph = get_synthetic_mdsa_graph(size=4, m_val=2)
+                    tracker = track_adaptation(
+                        snn_graph=snn_graph,
+                        adaptation=adaptation,
+                        plot_config=plot_config,
+                    )
+                    modified_nodes: List[str] = list(snn_graph.nodes)[::5]
+                    modified_edges: List[Tuple[str, str]] = list(
+                        snn_graph.edges
+                    )[::4]
+                    for node_name in modified_nodes:
+                        lif_neuron = snn_graph.nodes[node_name]["nx_lif"][0]
+                        set_neuron_properties(
+                            lif_neuron=lif_neuron,
+                            neuron_properties={
+                                "bias": lif_neuron.bias.get() + 1,
+                                "du": lif_neuron.du.get(),
+                                "dv": 0.05,
+                                "vth": lif_neuron.vth.get() + 0.5,
+                            },
+                        )
+                        if "recur" in snn_graph.nodes[node_name]:
+                            snn_graph.nodes[node_name]["recur"] -= 1
+                    for edge in modified_edges:
+                        snn_graph.edges[edge]["synapse"] = Synapse(
+                            weight=snn_graph.edges[edge]["synapse"].weight * 2
+                            - 1,
+                            delay=0,
+                            change_per_t=0,
+                        )
+
+                    tracker.readapt(modified_nodes, modified_edges)
+                    self.assertEqual(
+                        get_graph_snapshot(snn_graph=tracker.adapted_graph),
+                        get_graph_snapshot(
+                            snn_graph=apply_fused_adaptation(
+                                adaptation_graph=snn_graph,
+                                adaptation=adaptation,
+                                plot_config=plot_config,
+                            )
+                        ),
+                    )
+                    self.assertEqual(
+                        get_graph_snapshot(
+                            snn_graph=strip_adaptation(
+                                adaptation_graph=copy.deepcopy(
+                                    tracker.adapted_graph
+                                )
+                            )
+                        ),
+                        get_graph_snapshot(snn_graph=snn_graph),
+                    )
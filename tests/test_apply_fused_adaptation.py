@@ -0,0 +1,91 @@
+"""Tests whether a fused multi-stage adaptation yields the graph of applying
+each stage to the adapted graph of the previous stage."""
+import copy
+import unittest
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.apply_adaptation_plan import apply_adaptation_plan
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.plan.compile_adaptation_plan import compile_adaptation_plan
+from tests.test_helper_synthetic_mdsa_graph import (
+    get_graph_snapshot,
+    get_synthetic_mdsa_graph,
+)
+
+
+@typechecked
+def apply_stages_in_sequence(
+    *, snn_graph: nx.DiGraph, adaptation: Adaptation, plot_config: Plot_config
+) -> nx.DiGraph:
+    """Applies each stage of the adaptation to a copy of the adapted graph of
+    the previous stage."""
+    adapted_graph: nx.DiGraph = snn_graph
+    for stage, stage_adaptation in enumerate(adaptation.get_stages()):
+        adapted_graph = apply_adaptation_plan(
+            adaptation_graph=copy.deepcopy(adapted_graph),
+            plan=compile_adaptation_plan(
+                snn_graph=adapted_graph,
+                adaptation=stage_adaptation,
+                stage=stage,
+            ),
+            plot_config=plot_config,
+        )
+    return adapted_graph
+
+
+class Test_apply_fused_adaptation(unittest.TestCase):
+    """Compares fused adaptations with their stages applied in sequence."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def test_fused_equals_sequence(self) -> None:
+        """The neurons, synapses and population projections of the fused
+        adaptation are those of the stages applied in sequence. The group
+        metadata differs, as the sequence groups the neurons of a later stage
+        by the neurons of the previous adapted graph."""
+        plot_config = Plot_config()
+        snn_graph = get_synthetic_mdsa_graph(size=3, m_val=1)
+        for first_type, second_type in [
+            ("redundancy", "population"),
+            ("population", "redundancy"),
+        ]:
+            for first_redundancy in [1, 2]:
+                for second_redundancy in [1, 2]:
+                    adaptation = Adaptation(
+                        first_type,
+                        first_redundancy,
+                        next_stages=[
+                            Adaptation(second_type, second_redundancy)
+                        ],
+                    )
+                    with self.subTest(adaptation=adaptation.get_name()):
+                        fused_graph = apply_fused_adaptation(
+                            adaptation_graph=snn_graph,
+                            adaptation=adaptation,
+                            plot_config=plot_config,
+                        )
+                        sequence_graph = apply_stages_in_sequence(
+                            snn_graph=snn_graph,
+                            adaptation=adaptation,
+                            plot_config=plot_config,
+                        )
+                        self.assertEqual(
+                            get_graph_snapshot(snn_graph=fused_graph)[:2],
+                            get_graph_snapshot(snn_graph=sequence_graph)[:2],
+                        )
+                        self.assertEqual(
+                            fused_graph.graph.get("population_projections"),
+                            sequence_graph.graph.get("population_projections"),
+                        )
+                        # The second stage adapts the neurons of the first.
+                        self.assertIn(
+                            "s1_r_1_r_1_rand_0", sequence_graph.nodes
+                        )
@@ -0,0 +1,197 @@
+"""Tests whether the invariant checker accepts adapted graphs, and finds
+changed neurons and synapses of adapted graphs."""
+import unittest
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import Synapse
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.Adaptation_delta import reverse_index_key
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.validation.check_adapted_graph import (
+    get_invariant_violations,
+    verify_adapted_graph,
+)
+from tests.test_helper_synthetic_mdsa_graph import get_synthetic_mdsa_graph
+
+
+@typechecked
+def set_weight(
+    *, snn_graph: nx.DiGraph, left: str, right: str, weight: float
+) -> None:
+    """Replaces the synapse of an edge with one of another weight."""
+    snn_graph.edges[left, right]["synapse"] = Synapse(
+        weight=weight, delay=0, change_per_t=0
+    )
+
+
+class Test_check_adapted_graph(unittest.TestCase):
+    """Tests the invariant checker of adapted graphs."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def get_adapted_graph(self, *, adaptation: Adaptation) -> nx.DiGraph:
+        """Returns the adapted synthetic graph."""
+        return apply_fused_adaptation(
+            adaptation_graph=get_synthetic_mdsa_graph(size=4, m_val=2),
+            adaptation=adaptation,
+            plot_config=Plot_config(),
+        )
+
+    @typechecked
+    def test_valid_graphs(self) -> None:
+        """Adapted graphs do not violate any invariant."""
+        for adaptation_type in ["redundancy", "population"]:
+            for redundancy in [1, 2, 3]:
+                adaptation = Adaptation(adaptation_type, redundancy)
+                with self.subTest(adaptation=adaptation.get_name()):
+                    verify_adapted_graph(
+                        adapted_graph=self.get_adapted_graph(
+                            adaptation=adaptation
+                        ),
+                        adaptation=adaptation,
+                    )
+
+    @typechecked
+    def test_mirrored_synapse_weights(self) -> None:
+        """Finds redundant synapses whose weight differs from the synapse
+        they mirror."""
+        adaptation = Adaptation("redundancy", 2)
+        adapted_graph = self.get_adapted_graph(adaptation=adaptation)
+        for left, right in [
+            ("r_1_rand_1", "degree_receiver_0_1_0"),
+            ("rand_1", "r_2_degree_receiver_0_1_0"),
+        ]:
+            set_weight(
+                snn_graph=adapted_graph, left=left, right=right, weight=123.0
+            )
+        self.assertEqual(
+            get_invariant_violations(
+                adapted_graph=adapted_graph, adaptation=adaptation
+            ),
+            [
+                "synapse r_1_rand_1->degree_receiver_0_1_0 has weight 123.0, "
+                + "expected 1.5",
+                "synapse rand_1->r_2_degree_receiver_0_1_0 has weight 123.0, "
+                + "expected 1.5",
+            ],
+        )
+
+    @typechecked
+    def test_mutated_graphs(self) -> None:
+        """Finds changed inhibition and self-loops, missing synapses and
+        neurons, and changed neuron properties."""
+        adaptation = Adaptation("redundancy", 2)
+        adapted_graph = self.get_adapted_graph(adaptation=adaptation)
+        set_weight(
+            snn_graph=adapted_graph,
+            left="r_1_selector_0_0",
+            right="r_2_selector_0_0",
+            weight=-1.0,
+        )
+        set_weight(
+            snn_graph=adapted_graph,
+            left="r_2_selector_0_0",
+            right="r_2_selector_0_0",
+            weight=5.0,
+        )
+        adapted_graph.remove_edge("r_1_rand_0", "degree_receiver_1_0_0")
+        adapted_graph.remove_node("r_2_spike_once_0")
+        adapted_graph.nodes["r_1_rand_2"]["nx_lif"][0].vth.set(7.0)
+        violations = get_invariant_violations(
+            adapted_graph=adapted_graph, adaptation=adaptation
+        )
+        for violation in [
+            "synapse r_1_selector_0_0->r_2_selector_0_0 has weight -1.0, "
+            + "expected -100",
+            "synapse r_2_selector_0_0->r_2_selector_0_0 has weight 5.0, "
+            + "expected 4",
+            "synapse r_1_rand_0->degree_receiver_1_0_0 is missing",
+            "spike_once_0 has 1 redundant neurons, expected 2",
+        ]:
+            self.assertIn(violation, violations)
+        self.assertTrue(
+            any(
+                violation.startswith("r_1_rand_2 has properties")
+                for violation in violations
+            )
+        )
+        with self.assertRaises(ValueError):
+            verify_adapted_graph(
+                adapted_graph=adapted_graph, adaptation=adaptation
+            )
+
+    @typechecked
+    def test_population_synapses(self) -> None:
+        """Finds missing synapses between populations, and population
+        synapses whose weight differs from their original synapse."""
+        adaptation = Adaptation("population", 2)
+        adapted_graph = self.get_adapted_graph(adaptation=adaptation)
+        adapted_graph.remove_edge("r_1_rand_1", "r_2_degree_receiver_0_1_0")
+        set_weight(
+            snn_graph=adapted_graph,
+            left="rand_1",
+            right="r_1_degree_receiver_0_1_0",
+            weight=123.0,
+        )
+        self.assertEqual(
+            get_invariant_violations(
+                adapted_graph=adapted_graph, adaptation=adaptation
+            ),
+            [
+                "synapse rand_1->r_1_degree_receiver_0_1_0 has weight 123.0, "
+                + "expected 1.5",
+                "synapse r_1_rand_1->r_2_degree_receiver_0_1_0 is missing",
+            ],
+        )
+
+    @typechecked
+    def test_unexpected_synapses(self) -> None:
+        """Finds synapses of redundant neurons that the adaptation does not
+        create."""
+        for adaptation_type in ["redundancy", "population"]:
+            adaptation = Adaptation(adaptation_type, 2)
+            with self.subTest(adaptation=adaptation.get_name()):
+                adapted_graph = self.get_adapted_graph(adaptation=adaptation)
+                adapted_graph.add_edge(
+                    "r_1_spike_once_0",
+                    "spike_once_0",
+                    synapse=Synapse(weight=1.0, delay=0, change_per_t=0),
+                )
+                self.assertEqual(
+                    get_invariant_violations(
+                        adapted_graph=adapted_graph, adaptation=adaptation
+                    ),
+                    ["synapse r_1_spike_once_0->spike_once_0 is unexpected"],
+                )
+
+    @typechecked
+    def test_population_properties_without_reverse_index(self) -> None:
+        """Without the reverse index, finds redundant neurons whose properties
+        differ from their original neuron, and counters with another vth than
+        the redundancy."""
+        adaptation = Adaptation("population", 2)
+        adapted_graph = self.get_adapted_graph(adaptation=adaptation)
+        adapted_graph.graph.pop(reverse_index_key)
+        self.assertEqual(
+            get_invariant_violations(
+                adapted_graph=adapted_graph, adaptation=adaptation
+            ),
+            [],
+        )
+        adapted_graph.nodes["r_2_selector_0_0"]["nx_lif"][0].vth.set(7.0)
+        adapted_graph.nodes["counter_0_0"]["nx_lif"][0].vth.set(5.0)
+        adapted_graph.nodes["r_1_counter_0_0"]["nx_lif"][0].vth.set(5.0)
+        adapted_graph.nodes["r_2_counter_0_0"]["nx_lif"][0].vth.set(5.0)
+        violations = get_invariant_violations(
+            adapted_graph=adapted_graph, adaptation=adaptation
+        )
+        self.assertEqual(len(violations), 2)
+        self.assertTrue(violations[0].startswith("r_2_selector_0_0 has"))
+        self.assertIn("counter_0_0 has vth 5.0, expected 2.0", violations)
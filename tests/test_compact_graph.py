@@ -0,0 +1,120 @@
+"""Tests whether compacting an adapted graph keeps the spikes and the u and v
+of every neuron that remains, in a time-stepped simulation."""
+import unittest
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import Synapse
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.compaction.compact_graph import compact_graph
+from snnadaptation.plan.apply_adaptation_plan import set_neuron_properties
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from tests.test_helper_synthetic_mdsa_graph import get_synthetic_mdsa_graph
+from tests.test_helper_time_stepped_simulation import simulate_time_stepped
+
+nr_of_timesteps: int = 40
+
+
+@typechecked
+def silence_neuron(*, snn_graph: nx.DiGraph, node_name: str) -> None:
+    """Gives a neuron decays and a threshold such that its input can never
+    make it spike."""
+    lif_neuron = snn_graph.nodes[node_name]["nx_lif"][0]
+    set_neuron_properties(
+        lif_neuron=lif_neuron,
+        neuron_properties={
+            "bias": lif_neuron.bias.get(),
+            "du": 0.5,
+            "dv": 0.5,
+            "vth": 1e9,
+        },
+    )
+
+
+@typechecked
+def get_node_with_inputs(*, snn_graph: nx.DiGraph, prefix: str) -> str:
+    """Returns the first neuron with the prefix that has input synapses from
+    other neurons."""
+    return next(
+        node_name
+        for node_name in snn_graph
+        if node_name.startswith(prefix)
+        and any(left != node_name for left in snn_graph.pred[node_name])
+    )
+
+
+class Test_compact_graph(unittest.TestCase):
+    """Simulates adapted graphs before and after compaction."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def test_compaction_keeps_behaviour(self) -> None:
+        """Silences redundant and original neurons and zeroes a weight, and
+        compares the simulations of the remaining neurons."""
+        for adaptation in [
+            Adaptation("redundancy", 2),
+            Adaptation("population", 2),
+        ]:
+            with self.subTest(adaptation=adaptation.get_name()):
+                adapted_graph = apply_fused_adaptation(
+                    adaptation_graph=get_synthetic_mdsa_graph(size=4, m_val=2),
+                    adaptation=adaptation,
+                    plot_config=Plot_config(),
+                )
+                redundant_node_name: str = get_node_with_inputs(
+                    snn_graph=adapted_graph, prefix="r_1_degree_receiver"
+                )
+                original_node_name: str = get_node_with_inputs(
+                    snn_graph=adapted_graph, prefix="degree_receiver"
+                )
+                for node_name in [redundant_node_name, original_node_name]:
+                    silence_neuron(
+                        snn_graph=adapted_graph, node_name=node_name
+                    )
+                left, right = next(iter(adapted_graph.edges))
+                adapted_graph.edges[left, right]["synapse"] = Synapse(
+                    weight=0, delay=0, change_per_t=0
+                )
+                spike_times, states = simulate_time_stepped(
+                    snn_graph=adapted_graph, nr_of_timesteps=nr_of_timesteps
+                )
+
+                report = compact_graph(snn_graph=adapted_graph)
+                self.assertNotIn(redundant_node_name, adapted_graph)
+                self.assertIn(original_node_name, adapted_graph)
+                self.assertGreater(
+                    adapted_graph.in_degree(original_node_name), 0
+                )
+                for reason in [
+                    "zero_weight",
+                    "silent_source",
+                    "silent_target",
+                ]:
+                    self.assertGreater(report.removed_synapses[reason], 0)
+                self.assertEqual(
+                    report.nr_of_synapses
+                    - report.get_nr_of_removed_synapses(),
+                    adapted_graph.number_of_edges(),
+                )
+
+                (
+                    compacted_spike_times,
+                    compacted_states,
+                ) = simulate_time_stepped(
+                    snn_graph=adapted_graph,
+                    nr_of_timesteps=nr_of_timesteps,
+                )
+                for node_name in adapted_graph:
+                    self.assertEqual(
+                        compacted_spike_times[node_name],
+                        spike_times[node_name],
+                    )
+                    self.assertEqual(
+                        compacted_states[node_name], states[node_name]
+                    )
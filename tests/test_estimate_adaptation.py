@@ -0,0 +1,92 @@
+"""Tests whether the closed-form estimate of an adapted graph has the amount
+of neurons and synapses of the adapted graph, and whether the cost model
+coefficients are fitted without negative values."""
+import unittest
+
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.estimation.Cost_model import fit_coefficients
+from snnadaptation.estimation.estimate_adaptation import estimate_adaptation
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.selection.Selection_policy import Selection_policy
+from tests.test_helper_synthetic_mdsa_graph import get_synthetic_mdsa_graph
+
+
+class Test_estimate_adaptation(unittest.TestCase):
+    """Compares the estimates with adapted graphs."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def test_counts_equal_adapted_graphs(self) -> None:
+        """The estimated amounts of neurons and synapses are exact, with and
+        without a selection."""
+        for adaptation_type in ["redundancy", "population"]:
+            for redundancy in [1, 2, 3]:
+                for selection in [
+                    None,
+                    Selection_policy(roles=["selector", "next_round"]),
+                ]:
+                    adaptation = Adaptation(
+                        adaptation_type, redundancy, selection=selection
+                    )
+                    with self.subTest(adaptation=adaptation.get_name()):
+                        for size, m_val in [(3, 1), (4, 2)]:
+                            snn_graph = get_synthetic_mdsa_graph(
+                                size=size, m_val=m_val
+                            )
+                            adapted_graph = apply_fused_adaptation(
+                                adaptation_graph=snn_graph,
+                                adaptation=adaptation,
+                                plot_config=Plot_config(),
+                            )
+                            estimate = estimate_adaptation(
+                                snn_graph=snn_graph, adaptation=adaptation
+                            )
+                            self.assertEqual(
+                                estimate.nr_of_neurons, len(adapted_graph)
+                            )
+                            self.assertEqual(
+                                estimate.nr_of_synapses,
+                                adapted_graph.number_of_edges(),
+                            )
+                            self.assertEqual(
+                                estimate.nr_of_added_synapses,
+                                adapted_graph.number_of_edges()
+                                - snn_graph.number_of_edges(),
+                            )
+
+    @typechecked
+    def test_fit_coefficients(self) -> None:
+        """Exact measurements are fitted exactly, and a fit with a negative
+        coefficient is replaced by the best fit of the other coefficient."""
+        sizes = [[10.0, 20.0], [20.0, 70.0], [40.0, 90.0]]
+        fitted = fit_coefficients(
+            sizes=sizes,
+            measurements=[
+                2 * neurons + 3 * synapses for neurons, synapses in sizes
+            ],
+        )
+        for coefficient, expected in zip(fitted, [2.0, 3.0]):
+            self.assertAlmostEqual(coefficient, expected)
+
+        # The unconstrained fit is about [1.98, -0.13].
+        measurements = [10.0, 30.0, 70.0]
+        neuron_coefficient, synapse_coefficient = fit_coefficients(
+            sizes=sizes, measurements=measurements
+        )
+        self.assertEqual(synapse_coefficient, 0.0)
+        neuron_sizes = [neurons for neurons, _ in sizes]
+        self.assertAlmostEqual(
+            neuron_coefficient,
+            sum(
+                neurons * measurement
+                for neurons, measurement in zip(neuron_sizes, measurements)
+            )
+            / sum(neurons**2 for neurons in neuron_sizes),
+        )
@@ -0,0 +1,154 @@
+"""Tests whether the event-driven simulation of adapted graphs, which
+suspends silent neurons, yields the spikes and states of a time-stepped
+simulation."""
+import unittest
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import LIF_neuron, Synapse
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.simulation.Event_driven_simulator import (
+    get_silent_timesteps,
+    simulate_event_driven,
+)
+from tests.test_helper_synthetic_mdsa_graph import get_synthetic_mdsa_graph
+from tests.test_helper_time_stepped_simulation import simulate_time_stepped
+
+nr_of_timesteps: int = 40
+
+
+class Test_event_driven_simulator(unittest.TestCase):
+    """Compares the event-driven simulator with a time-stepped simulation."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def assert_equal_simulation(self, *, snn_graph: nx.DiGraph) -> None:
+        """Asserts the event-driven and time-stepped simulations of the graph
+        have exactly the same spike times and final states."""
+        simulator = simulate_event_driven(
+            snn_graph=snn_graph, nr_of_timesteps=nr_of_timesteps
+        )
+        spike_times, states = simulate_time_stepped(
+            snn_graph=snn_graph, nr_of_timesteps=nr_of_timesteps
+        )
+        self.assertEqual(simulator.get_spike_times(), spike_times)
+        for node_name, state in states.items():
+            self.assertEqual(simulator.get_state(node_name), state)
+
+    @typechecked
+    def test_adapted_graphs(self) -> None:
+        """Simulates adapted graphs, and the same graphs with removed
+        neurons."""
+        for adaptation in [
+            Adaptation("redundancy", 1),
+            Adaptation("redundancy", 3),
+            Adaptation("population", 2),
+        ]:
+            with self.subTest(adaptation=adaptation.get_name()):
+                adapted_graph = apply_fused_adaptation(
+                    adaptation_graph=get_synthetic_mdsa_graph(size=4, m_val=2),
+                    adaptation=adaptation,
+                    plot_config=Plot_config(),
+                )
+                self.assert_equal_simulation(snn_graph=adapted_graph)
+                adapted_graph.remove_nodes_from(list(adapted_graph)[::7])
+                self.assert_equal_simulation(snn_graph=adapted_graph)
+
+    @typechecked
+    def test_suspended_neurons_skip_updates(self) -> None:
+        """Checks the inhibited redundant neurons stay suspended when they
+        receive inhibition, such that less than 60% of the neuron updates of
+        a time-stepped simulation are done. Their inputs are applied when
+        their states are read."""
+        adapted_graph = apply_fused_adaptation(
+            adaptation_graph=get_synthetic_mdsa_graph(size=4, m_val=2),
+            adaptation=Adaptation("redundancy", 3),
+            plot_config=Plot_config(),
+        )
+        simulator = simulate_event_driven(
+            snn_graph=adapted_graph, nr_of_timesteps=nr_of_timesteps
+        )
+        self.assertLess(
+            simulator.nr_of_updates,
+            0.6 * len(adapted_graph) * nr_of_timesteps,
+        )
+        self.assertTrue(
+            any(
+                str(simulator.node_names[node_index]).startswith("r_")
+                for node_index in simulator.pending_inputs
+            )
+        )
+        _, states = simulate_time_stepped(
+            snn_graph=adapted_graph, nr_of_timesteps=nr_of_timesteps
+        )
+        for node_name, state in states.items():
+            self.assertEqual(simulator.get_state(node_name), state)
+        self.assertEqual(simulator.pending_inputs, {})
+
+    @typechecked
+    def test_get_silent_timesteps(self) -> None:
+        """Tests the bound on the timesteps in which a neuron can not spike
+        without input."""
+        # Inhibited without bias, or with a bias that u does not decay to.
+        self.assertIsNone(
+            get_silent_timesteps(u=-1, v=0, bias=0, du=0.1, dv=0, vth=1)
+        )
+        self.assertIsNone(
+            get_silent_timesteps(u=-3, v=0, bias=2, du=0, dv=0, vth=1)
+        )
+        # Excited, or a threshold below the resting voltage.
+        self.assertEqual(
+            get_silent_timesteps(u=1, v=0, bias=0, du=0, dv=0, vth=1), 0
+        )
+        self.assertEqual(
+            get_silent_timesteps(u=0, v=0, bias=0, du=0, dv=0, vth=-1), 0
+        )
+        # u + bias becomes positive after log(1 / 100) / log(0.5) = 6.6
+        # timesteps, of which one is kept as margin.
+        self.assertEqual(
+            get_silent_timesteps(u=-100, v=0, bias=1, du=0.5, dv=0, vth=1), 5
+        )
+
+    @typechecked
+    def test_outdated_wake_up(self) -> None:
+        """A neuron that is scheduled to wake up when its inhibition decays,
+        but receives input earlier, is scheduled again. The target is
+        inhibited at timestep 2, and again by the pulse at timestep 5, after
+        which its first wake up is outdated."""
+        snn_graph = nx.DiGraph()
+        for name, bias, du, dv, vth in [
+            ("inhibitor", 2.0, 0.0, 0.0, 1.0),
+            ("pulse", 0.3, 0.0, 0.0, 1.0),
+            ("target", 1.0, 0.2, 1.0, 0.5),
+        ]:
+            snn_graph.add_node(
+                name,
+                nx_lif=[
+                    LIF_neuron(name=name, bias=bias, du=du, dv=dv, vth=vth)
+                ],
+            )
+        for left, right, weight in [
+            ("inhibitor", "inhibitor", -2.0),
+            ("inhibitor", "target", -40.0),
+            ("pulse", "pulse", -10.0),
+            ("pulse", "target", -20.0),
+        ]:
+            snn_graph.add_edge(
+                left,
+                right,
+                synapse=Synapse(weight=weight, delay=0, change_per_t=0),
+            )
+        self.assert_equal_simulation(snn_graph=snn_graph)
+        self.assertNotEqual(
+            simulate_event_driven(
+                snn_graph=snn_graph, nr_of_timesteps=nr_of_timesteps
+            ).get_spike_times()["target"],
+            [],
+        )
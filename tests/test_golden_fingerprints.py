@@ -0,0 +1,105 @@
+"""Compares the fingerprints of a matrix of adapted synthetic graphs with the
+stored golden fingerprints, such that refactors of the adaptations can be
+checked to produce exactly the same graphs without simulating them.
+
+Run this file as a script to regenerate the golden fingerprints after an
+intended change of the adaptation output:
+python -m tests.test_golden_fingerprints
+"""
+import json
+import os
+import unittest
+from typing import Any, Dict, List
+
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.fingerprint.graph_fingerprint import (
+    fingerprint_from_dict,
+    get_fingerprint_diff,
+    get_graph_fingerprint,
+)
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from tests.test_helper_synthetic_mdsa_graph import get_synthetic_mdsa_graph
+
+golden_fingerprints_filepath: str = os.path.join(
+    os.path.dirname(__file__), "golden_fingerprints.json"
+)
+
+
+@typechecked
+def get_adaptation_matrix() -> Dict[str, Adaptation]:
+    """Returns the adaptations of the golden snapshots, by name."""
+    adaptations: List[Adaptation] = [
+        Adaptation(adaptation_type, redundancy)
+        for adaptation_type in ["redundancy", "population"]
+        for redundancy in [1, 2, 3]
+    ] + [
+        Adaptation("population", 1, next_stages=[Adaptation("redundancy", 1)])
+    ]
+    return {adaptation.get_name(): adaptation for adaptation in adaptations}
+
+
+@typechecked
+def get_matrix_fingerprints() -> Dict[str, Dict[str, Any]]:
+    """Returns the fingerprints of the adapted synthetic graphs, of each size
+    and adaptation."""
+    plot_config = Plot_config()
+    fingerprints: Dict[str, Dict[str, Any]] = {}
+    for size, m_val in [(2, 1), (3, 1), (3, 2)]:
+        snn_graph = get_synthetic_mdsa_graph(size=size, m_val=m_val)
+        for name, adaptation in get_adaptation_matrix().items():
+            fingerprints[
+                f"size_{size}_m_{m_val}/{name}"
+            ] = get_graph_fingerprint(
+                snn_graph=apply_fused_adaptation(
+                    adaptation_graph=snn_graph,
+                    adaptation=adaptation,
+                    plot_config=plot_config,
+                )
+            ).to_dict()
+    return fingerprints
+
+
+class Test_golden_fingerprints(unittest.TestCase):
+    """Tests whether the adaptations still create the golden graphs."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def test_fingerprints_equal_golden_fingerprints(self) -> None:
+        """Adapts the matrix of synthetic graphs and compares each fingerprint
+        with its golden fingerprint, showing the changed neuron and synapse
+        classes."""
+        with open(golden_fingerprints_filepath, encoding="utf-8") as json_file:
+            golden_fingerprints: Dict[str, Dict[str, Any]] = json.load(
+                json_file
+            )
+        fingerprints = get_matrix_fingerprints()
+        self.assertEqual(set(fingerprints), set(golden_fingerprints))
+        diffs: List[str] = []
+        for key, fingerprint in fingerprints.items():
+            if fingerprint["digest"] != golden_fingerprints[key]["digest"]:
+                diffs.append(f"{key}:")
+                diffs.extend(
+                    f"  {line}"
+                    for line in get_fingerprint_diff(
+                        expected=fingerprint_from_dict(
+                            fingerprint_dict=golden_fingerprints[key]
+                        ),
+                        actual=fingerprint_from_dict(
+                            fingerprint_dict=fingerprint
+                        ),
+                    )
+                )
+        self.assertEqual(diffs, [], "\n" + "\n".join(diffs))
+
+
+if __name__ == "__main__":
+    with open(golden_fingerprints_filepath, "w", encoding="utf-8") as file:
+        json.dump(get_matrix_fingerprints(), file, indent=2)
+        file.write("\n")
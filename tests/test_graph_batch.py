@@ -0,0 +1,104 @@
+"""Tests whether the graphs extracted from a batch of graphs equal the graphs
+that were batched."""
+import unittest
+from typing import Any, Tuple
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.batching.Graph_batch import adapt_and_batch, batch_graphs
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.plan.integer_ids import relabel_to_integer_ids
+from tests.test_helper_synthetic_mdsa_graph import (
+    get_graph_snapshot,
+    get_synthetic_mdsa_graph,
+)
+
+
+@typechecked
+def get_unordered_snapshot(*, snn_graph: nx.DiGraph) -> Tuple[Any, ...]:
+    """Returns the graph snapshot with the nodes and edges sorted, as the
+    batch orders the nodes by their neuron ids."""
+    nodes, edges, graph_attributes = get_graph_snapshot(snn_graph=snn_graph)
+    return sorted(nodes), sorted(edges), graph_attributes
+
+
+class Test_graph_batch(unittest.TestCase):
+    """Tests the batching of graphs, and the extraction of each graph."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def test_extract_graph_equals_adaptation(self) -> None:
+        """Each extracted graph equals the direct adaptation of its input."""
+        snn_graphs = [
+            get_synthetic_mdsa_graph(size=3, m_val=1),
+            get_synthetic_mdsa_graph(size=4, m_val=2),
+        ]
+        adaptation = Adaptation("redundancy", 2)
+        graph_batch = adapt_and_batch(
+            snn_graphs=snn_graphs,
+            adaptation=adaptation,
+            plot_config=Plot_config(),
+        )
+        for graph_index, snn_graph in enumerate(snn_graphs):
+            adapted_graph = apply_fused_adaptation(
+                adaptation_graph=snn_graph,
+                adaptation=adaptation,
+                plot_config=Plot_config(),
+            )
+            self.assertEqual(
+                get_unordered_snapshot(
+                    snn_graph=graph_batch.extract_graph(graph_index)
+                ),
+                get_unordered_snapshot(snn_graph=adapted_graph),
+            )
+            start, stop = graph_batch.get_id_range(graph_index)
+            self.assertEqual(stop - start, len(adapted_graph))
+
+    @typechecked
+    def test_repeated_graph(self) -> None:
+        """A graph that is batched twice gets separate neurons, such that a
+        change in one copy does not change the other copy or the input."""
+        snn_graph = get_synthetic_mdsa_graph(size=3, m_val=1)
+        expected_snapshot = get_graph_snapshot(snn_graph=snn_graph)
+        graph_batch = batch_graphs(snn_graphs=[snn_graph, snn_graph])
+        for node_name in graph_batch.batch_graph:
+            if node_name.startswith(graph_batch.get_prefix(0)):
+                graph_batch.batch_graph.nodes[node_name]["nx_lif"][0].bias.set(
+                    100.0
+                )
+        self.assertEqual(
+            get_graph_snapshot(snn_graph=snn_graph), expected_snapshot
+        )
+        self.assertEqual(
+            get_graph_snapshot(snn_graph=graph_batch.extract_graph(1)),
+            expected_snapshot,
+        )
+
+    @typechecked
+    def test_integer_id_graphs(self) -> None:
+        """Graphs with integer node ids are batched with their node names."""
+        adapted_graph = apply_fused_adaptation(
+            adaptation_graph=get_synthetic_mdsa_graph(size=3, m_val=1),
+            adaptation=Adaptation("population", 2),
+            plot_config=Plot_config(),
+        )
+        graph_batch = batch_graphs(
+            snn_graphs=[
+                relabel_to_integer_ids(snn_graph=adapted_graph),
+                adapted_graph,
+            ]
+        )
+        for graph_index in range(2):
+            self.assertEqual(
+                get_unordered_snapshot(
+                    snn_graph=graph_batch.extract_graph(graph_index)
+                ),
+                get_unordered_snapshot(snn_graph=adapted_graph),
+            )
@@ -0,0 +1,181 @@
+"""Tests whether the adapted graphs give each original neuron and its
+redundant neurons a contiguous id range, and whether the population
+projections are exactly the fully connected populations."""
+import unittest
+from typing import Dict, List, Set, Tuple
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.neuron_roles import (
+    get_original_node_name,
+    get_redundant_node_name,
+)
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.selection.Selection_policy import Selection_policy
+from tests.test_helper_synthetic_mdsa_graph import get_synthetic_mdsa_graph
+
+
+@typechecked
+def get_fully_connected_edges(
+    *, snn_graph: nx.DiGraph, adapted_graph: nx.DiGraph
+) -> Set[Tuple[str, str]]:
+    """Returns the edges between two different neurons of the original graph,
+    of which every neuron of the population of the left neuron has a synapse
+    to every neuron of the population of the right neuron.
+
+    Edges into connectors are skipped: an unadapted neuron and a connector
+    are trivially fully connected, yet population coding does not project
+    them.
+    """
+    populations: Dict[str, List[str]] = {
+        node_name: [node_name] for node_name in snn_graph
+    }
+    for node_name in adapted_graph:
+        if node_name not in snn_graph:
+            populations[get_original_node_name(node_name=node_name)].append(
+                node_name
+            )
+    return {
+        (left, right)
+        for left, right in snn_graph.edges
+        if left != right
+        and "connector" not in right
+        and all(
+            adapted_graph.has_edge(left_member, right_member)
+            for left_member in populations[left]
+            for right_member in populations[right]
+        )
+    }
+
+
+class Test_group_metadata(unittest.TestCase):
+    """Tests the neuron_ids, neuron_groups and population_projections graph
+    attributes of adapted graphs."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        self.snn_graph = get_synthetic_mdsa_graph(size=3, m_val=1)
+        self.plot_config = Plot_config()
+
+    @typechecked
+    def test_contiguous_groups(self) -> None:
+        """Numbers the neurons 0 to N-1, such that each original neuron is
+        followed by its redundant neurons, in the order of the original
+        neurons."""
+        for adaptation in [
+            Adaptation("redundancy", 3),
+            Adaptation("population", 2),
+            Adaptation(
+                "population",
+                2,
+                selection=Selection_policy(roles=["selector", "counter"]),
+            ),
+            Adaptation(
+                "redundancy", 2, next_stages=[Adaptation("population", 1)]
+            ),
+        ]:
+            with self.subTest(adaptation=adaptation.get_name()):
+                adapted_graph = apply_fused_adaptation(
+                    adaptation_graph=self.snn_graph,
+                    adaptation=adaptation,
+                    plot_config=self.plot_config,
+                )
+                neuron_ids: Dict[str, int] = adapted_graph.graph["neuron_ids"]
+                self.assertEqual(set(neuron_ids), set(adapted_graph))
+                self.assertEqual(
+                    sorted(neuron_ids.values()),
+                    list(range(len(adapted_graph))),
+                )
+                node_names: List[str] = sorted(
+                    neuron_ids, key=neuron_ids.__getitem__
+                )
+                neuron_groups: Dict[str, List[int]] = adapted_graph.graph[
+                    "neuron_groups"
+                ]
+                self.assertEqual(list(neuron_groups), list(self.snn_graph))
+                stop: int = 0
+                for original_node_name, (
+                    start,
+                    group_stop,
+                ) in neuron_groups.items():
+                    self.assertEqual(start, stop)
+                    group: List[str] = node_names[start:group_stop]
+                    stop = group_stop
+                    self.assertEqual(group[0], original_node_name)
+                    self.assertEqual(
+                        {
+                            get_original_node_name(node_name=node_name)
+                            for node_name in group
+                        },
+                        {original_node_name},
+                    )
+                self.assertEqual(stop, len(adapted_graph))
+
+    @typechecked
+    def test_red_level_order(self) -> None:
+        """Orders the redundant neurons of a group by red_level."""
+        adapted_graph = apply_fused_adaptation(
+            adaptation_graph=self.snn_graph,
+            adaptation=Adaptation("redundancy", 3),
+            plot_config=self.plot_config,
+        )
+        neuron_ids: Dict[str, int] = adapted_graph.graph["neuron_ids"]
+        for original_node_name, (start, stop) in adapted_graph.graph[
+            "neuron_groups"
+        ].items():
+            self.assertEqual(
+                [
+                    neuron_ids[
+                        get_redundant_node_name(
+                            node_name=original_node_name, red_level=red_level
+                        )
+                    ]
+                    for red_level in range(1, 4)
+                ],
+                list(range(start + 1, stop)),
+            )
+
+    @typechecked
+    def test_population_projections(self) -> None:
+        """Lists each fully connected pair of populations once, and nothing
+        for sparse redundancy."""
+        for adaptation in [
+            Adaptation("population", 1),
+            Adaptation("population", 3),
+            Adaptation(
+                "population",
+                2,
+                selection=Selection_policy(roles=["selector", "counter"]),
+            ),
+        ]:
+            with self.subTest(adaptation=adaptation.get_name()):
+                adapted_graph = apply_fused_adaptation(
+                    adaptation_graph=self.snn_graph,
+                    adaptation=adaptation,
+                    plot_config=self.plot_config,
+                )
+                projections: List[Tuple[str, str]] = [
+                    (projection[0], projection[1])
+                    for projection in adapted_graph.graph[
+                        "population_projections"
+                    ]
+                ]
+                self.assertEqual(len(projections), len(set(projections)))
+                self.assertEqual(
+                    set(projections),
+                    get_fully_connected_edges(
+                        snn_graph=self.snn_graph, adapted_graph=adapted_graph
+                    ),
+                )
+
+        adapted_graph = apply_fused_adaptation(
+            adaptation_graph=self.snn_graph,
+            adaptation=Adaptation("redundancy", 2),
+            plot_config=self.plot_config,
+        )
+        self.assertNotIn("population_projections", adapted_graph.graph)
@@ -0,0 +1,283 @@
+"""Creates small synthetic graphs with the neuron roles and connectivity of the
+MDSA SNN, such that the adaptations can be tested without running the MDSA
+algorithm."""
+from typing import Any, List, Tuple
+
+import networkx as nx
+from snnbackends.networkx.LIF_neuron import Identifier, LIF_neuron, Synapse
+from typeguard import typechecked
+
+
+# pylint: disable=R0913
+@typechecked
+def add_neuron(
+    *,
+    snn_graph: nx.DiGraph,
+    name: str,
+    identifiers: List[Tuple[str, int]],
+    bias: float = 0.0,
+    du: float = 0.0,
+    dv: float = 0.0,
+    vth: float = 1.0,
+    pos: Tuple[float, float] = (0.0, 0.0),
+    recur: Any = None,
+) -> str:
+    """Adds a LIF neuron to the graph and returns its node name."""
+    lif_neuron = LIF_neuron(
+        name=name,
+        bias=bias,
+        du=du,
+        dv=dv,
+        vth=vth,
+        pos=pos,
+        identifiers=[
+            Identifier(description=description, position=position, value=value)
+            for position, (description, value) in enumerate(identifiers)
+        ],
+    )
+    snn_graph.add_node(lif_neuron.full_name, nx_lif=[lif_neuron])
+    if recur is not None:
+        snn_graph.nodes[lif_neuron.full_name]["recur"] = recur
+    return lif_neuron.full_name
+
+
+@typechecked
+def add_synapse(
+    *, snn_graph: nx.DiGraph, left: str, right: str, weight: float
+) -> None:
+    """Adds a synapse to the graph."""
+    snn_graph.add_edge(
+        left, right, synapse=Synapse(weight=weight, delay=0, change_per_t=0)
+    )
+
+
+# pylint: disable=R0914
+@typechecked
+def get_synthetic_mdsa_graph(*, size: int, m_val: int) -> nx.DiGraph:
+    """Returns a graph with the MDSA neuron roles for a complete input graph of
+    size nodes, with m_val rounds."""
+    snn_graph = nx.DiGraph()
+    spike_once: List[str] = []
+    rand: List[str] = []
+    for node_index in range(size):
+        spike_once.append(
+            add_neuron(
+                snn_graph=snn_graph,
+                name="spike_once",
+                identifiers=[("node_index", node_index)],
+                bias=2.0,
+                pos=(float(node_index), 0.0),
+            )
+        )
+        rand.append(
+            add_neuron(
+                snn_graph=snn_graph,
+                name="rand",
+                identifiers=[("node_index", node_index)],
+                bias=2.0,
+                pos=(float(node_index), 1.0),
+            )
+        )
+    next_round: List[str] = [
+        add_neuron(
+            snn_graph=snn_graph,
+            name="next_round",
+            identifiers=[("m_val", m_index)],
+            vth=float(size - 1),
+            pos=(5.0, float(m_index)),
+            recur=-5.0,
+        )
+        for m_index in range(1, m_val + 1)
+    ]
+    terminator: str = add_neuron(
+        snn_graph=snn_graph,
+        name="terminator_node",
+        identifiers=[],
+        vth=float(size - 1),
+        pos=(9.0, 9.0),
+    )
+    for m_index in range(m_val + 1):
+        selectors: List[str] = []
+        counters: List[str] = []
+        for node_index in range(size):
+            selectors.append(
+                add_neuron(
+                    snn_graph=snn_graph,
+                    name="selector",
+                    identifiers=[
+                        ("node_index", node_index),
+                        ("m_val", m_index),
+                    ],
+                    bias=5.0 if m_index == 0 else 0.0,
+                    du=0.1,
+                    vth=4.0,
+                    pos=(float(node_index), 2.0 + m_index),
+                )
+            )
+            counters.append(
+                add_neuron(
+                    snn_graph=snn_graph,
+                    name="counter",
+                    identifiers=[
+                        ("node_index", node_index),
+                        ("m_val", m_index),
+                    ],
+                    vth=0.0,
+                    pos=(float(node_index), 3.0 + m_index),
+                    recur=-1.0,
+                )
+            )
+        for node_index in range(size):
+            add_synapse(
+                snn_graph=snn_graph,
+                left=selectors[node_index],
+                right=selectors[node_index],
+                weight=-5.0,
+            )
+            for neighbour in range(size):
+                if neighbour == node_index:
+                    continue
+                degree_receiver: str = add_neuron(
+                    snn_graph=snn_graph,
+                    name="degree_receiver",
+                    identifiers=[
+                        ("node_index", node_index),
+                        ("neighbour", neighbour),
+                        ("m_val", m_index),
+                    ],
+                    vth=1.0 + neighbour,
+                    pos=(float(node_index), 4.0 + neighbour),
+                )
+                if m_index == 0:
+                    add_synapse(
+                        snn_graph=snn_graph,
+                        left=spike_once[node_index],
+                        right=degree_receiver,
+                        weight=1.0,
+                    )
+                else:
+                    add_synapse(
+                        snn_graph=snn_graph,
+                        left=next_round[m_index - 1],
+                        right=degree_receiver,
+                        weight=2.0,
+                    )
+                add_synapse(
+                    snn_graph=snn_graph,
+                    left=rand[neighbour],
+                    right=degree_receiver,
+                    weight=0.5 + neighbour,
+                )
+                add_synapse(
+                    snn_graph=snn_graph,
+                    left=selectors[node_index],
+                    right=degree_receiver,
+                    weight=-5.0,
+                )
+                add_synapse(
+                    snn_graph=snn_graph,
+                    left=degree_receiver,
+                    right=degree_receiver,
+                    weight=-2.0,
+                )
+                if m_index < m_val:
+                    add_synapse(
+                        snn_graph=snn_graph,
+                        left=degree_receiver,
+                        right=next_round[m_index],
+                        weight=1.0,
+                    )
+                else:
+                    add_synapse(
+                        snn_graph=snn_graph,
+                        left=degree_receiver,
+                        right=counters[neighbour],
+                        weight=1.0,
+                    )
+            if m_index > 0:
+                add_synapse(
+                    snn_graph=snn_graph,
+                    left=next_round[m_index - 1],
+                    right=selectors[node_index],
+                    weight=1.0,
+                )
+            add_synapse(
+                snn_graph=snn_graph,
+                left=counters[node_index],
+                right=counters[node_index],
+                weight=-1.0,
+            )
+            add_synapse(
+                snn_graph=snn_graph,
+                left=counters[node_index],
+                right=terminator,
+                weight=1.0,
+            )
+        if m_index > 0:
+            connector: str = add_neuron(
+                snn_graph=snn_graph,
+                name="connector",
+                identifiers=[("node_index", 0), ("m_val", m_index)],
+                vth=0.0,
+                pos=(7.0, float(m_index)),
+            )
+            add_synapse(
+                snn_graph=snn_graph,
+                left=next_round[m_index - 1],
+                right=connector,
+                weight=3.0,
+            )
+            add_synapse(
+                snn_graph=snn_graph,
+                left=connector,
+                right=selectors[0],
+                weight=1.0,
+            )
+            add_synapse(
+                snn_graph=snn_graph,
+                left=connector,
+                right=connector,
+                weight=-1.0,
+            )
+    for m_index in range(m_val):
+        add_synapse(
+            snn_graph=snn_graph,
+            left=next_round[m_index],
+            right=next_round[m_index],
+            weight=-3.0,
+        )
+    return snn_graph
+
+
+@typechecked
+def get_graph_snapshot(*, snn_graph: nx.DiGraph) -> Tuple[Any, ...]:
+    """Returns the ordered nodes with their neuron properties, the ordered
+    edges with their weights and flags, and the graph attributes."""
+    nodes = [
+        (
+            node_name,
+            [
+                (
+                    lif_neuron.full_name,
+                    lif_neuron.bias.get(),
+                    lif_neuron.du.get(),
+                    lif_neuron.dv.get(),
+                    lif_neuron.vth.get(),
+                    tuple(lif_neuron.pos),
+                )
+                for lif_neuron in node_attributes["nx_lif"]
+            ],
+            node_attributes.get("recur"),
+        )
+        for node_name, node_attributes in snn_graph.nodes.items()
+    ]
+    edges = [
+        (
+            left,
+            right,
+            edge_attributes["synapse"].weight,
+            edge_attributes.get("is_redundant"),
+        )
+        for left, right, edge_attributes in snn_graph.edges(data=True)
+    ]
+    return nodes, edges, snn_graph.graph
@@ -0,0 +1,73 @@
+"""Simulates every LIF neuron of a SNN graph at every timestep, as the
+reference of the simulators that skip or share neuron updates."""
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import networkx as nx
+from typeguard import typechecked
+
+
+@typechecked
+def simulate_time_stepped(
+    *,
+    snn_graph: nx.DiGraph,
+    nr_of_timesteps: int,
+    perturbations: Optional[
+        Dict[int, Dict[Hashable, Dict[str, float]]]
+    ] = None,
+) -> Tuple[Dict[Hashable, List[int]], Dict[Hashable, Tuple[float, float]]]:
+    """Returns the spike times and the final u and v of each node, starting
+    from u=v=0, where the spikes of timestep t are the input of timestep
+    t+1.
+
+    :param perturbations: The new bias, du, dv, vth, u or v of nodes, that
+    are set before the timestep they are stored under. The graph is not
+    changed.
+    """
+    neuron_properties: Dict[Hashable, Dict[str, float]] = {
+        node_name: {
+            property_name: getattr(
+                snn_graph.nodes[node_name]["nx_lif"][0], property_name
+            ).get()
+            for property_name in ["bias", "du", "dv", "vth"]
+        }
+        for node_name in snn_graph
+    }
+    u: Dict[Hashable, float] = dict.fromkeys(snn_graph, 0.0)
+    v: Dict[Hashable, float] = dict.fromkeys(snn_graph, 0.0)
+    spikes: Dict[Hashable, bool] = dict.fromkeys(snn_graph, False)
+    spike_times: Dict[Hashable, List[int]] = {
+        node_name: [] for node_name in snn_graph
+    }
+    for timestep in range(1, nr_of_timesteps + 1):
+        for node_name, perturbation in (
+            (perturbations or {}).get(timestep, {}).items()
+        ):
+            u[node_name] = perturbation.get("u", u[node_name])
+            v[node_name] = perturbation.get("v", v[node_name])
+            neuron_properties[node_name].update(
+                {
+                    property_name: value
+                    for property_name, value in perturbation.items()
+                    if property_name not in ["u", "v"]
+                }
+            )
+        a_in: Dict[Hashable, float] = dict.fromkeys(snn_graph, 0.0)
+        for left, right, edge_attributes in snn_graph.edges(data=True):
+            if spikes[left]:
+                a_in[right] += edge_attributes["synapse"].weight
+        for node_name, properties in neuron_properties.items():
+            u[node_name] = (
+                u[node_name] * (1 - properties["du"]) + a_in[node_name]
+            )
+            v[node_name] = (
+                v[node_name] * (1 - properties["dv"])
+                + u[node_name]
+                + properties["bias"]
+            )
+            spikes[node_name] = v[node_name] > properties["vth"]
+            if spikes[node_name]:
+                v[node_name] = 0.0
+                spike_times[node_name].append(timestep)
+    return spike_times, {
+        node_name: (u[node_name], v[node_name]) for node_name in snn_graph
+    }
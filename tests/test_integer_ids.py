@@ -0,0 +1,210 @@
+"""Tests whether graphs are relabelled to integer node ids and back without
+changes, and whether a delta applied to integer node ids yields the
+relabelled adapted graph."""
+import copy
+import unittest
+from typing import Any, Tuple
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.Adaptation_delta import reverse_index_key
+from snnadaptation.plan.apply_adaptation_plan import apply_adaptation_delta
+from snnadaptation.plan.apply_fused_adaptation import (
+    apply_fused_adaptation,
+    get_fused_adaptation_delta,
+)
+from snnadaptation.plan.integer_ids import (
+    Node_name_table,
+    apply_adaptation_delta_with_integer_ids,
+    get_node_name_table,
+    relabel_to_integer_ids,
+    relabel_to_node_names,
+)
+from snnadaptation.plan.strip_adaptation import strip_adaptation
+from tests.test_helper_synthetic_mdsa_graph import (
+    get_graph_snapshot,
+    get_synthetic_mdsa_graph,
+)
+
+
+@typechecked
+def get_sorted_snapshot(*, snn_graph: nx.DiGraph) -> Tuple[Any, ...]:
+    """Returns the graph snapshot with the nodes and edges sorted, as the
+    delta adds the nodes of integer ids in id order."""
+    nodes, edges, graph_attributes = get_graph_snapshot(snn_graph=snn_graph)
+    return sorted(nodes), sorted(edges), graph_attributes
+
+
+adaptations = [
+    Adaptation("redundancy", 2),
+    Adaptation("population", 2),
+    Adaptation("population", 2, next_stages=[Adaptation("redundancy", 1)]),
+]
+
+
+class Test_integer_ids(unittest.TestCase):
+    """Tests the conversion between node names and integer node ids."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def assert_integer_ids(
+        self, *, id_graph: nx.DiGraph, named_graph: nx.DiGraph
+    ) -> None:
+        """Asserts the id graph has dense integer ids, and the neurons and
+        synapses of the named graph under the names of its name table."""
+        name_table: Node_name_table = get_node_name_table(snn_graph=id_graph)
+        self.assertEqual(sorted(id_graph), list(range(len(named_graph))))
+        self.assertEqual(
+            {name_table.get_name(node_id) for node_id in id_graph},
+            set(named_graph),
+        )
+        self.assertEqual(
+            {
+                (name_table.get_name(left), name_table.get_name(right))
+                for left, right in id_graph.edges
+            },
+            set(named_graph.edges),
+        )
+        for left, right in id_graph.graph.get("population_projections", []):
+            self.assertIsInstance(left, int)
+            self.assertIsInstance(right, int)
+
+    @typechecked
+    def test_round_trip(self) -> None:
+        """Relabelling an unadapted and adapted graphs to integer ids and back
+        yields the graphs. The unadapted graph gets the neuron_ids of its
+        graph order."""
+        snn_graph = get_synthetic_mdsa_graph(size=4, m_val=2)
+        id_graph = relabel_to_integer_ids(snn_graph=snn_graph)
+        self.assert_integer_ids(id_graph=id_graph, named_graph=snn_graph)
+        self.assertEqual(
+            [id_graph.nodes[node_id] for node_id in range(len(snn_graph))],
+            [snn_graph.nodes[node_name] for node_name in snn_graph],
+        )
+        named_graph = relabel_to_node_names(snn_graph=id_graph)
+        self.assertEqual(
+            named_graph.graph.pop("neuron_ids"),
+            {
+                node_name: node_id
+                for node_id, node_name in enumerate(snn_graph)
+            },
+        )
+        self.assertEqual(
+            get_graph_snapshot(snn_graph=named_graph),
+            get_graph_snapshot(snn_graph=snn_graph),
+        )
+
+        for adaptation in adaptations:
+            with self.subTest(adaptation=adaptation.get_name()):
+                adapted_graph = apply_fused_adaptation(
+                    adaptation_graph=snn_graph,
+                    adaptation=adaptation,
+                    plot_config=Plot_config(),
+                )
+                id_graph = relabel_to_integer_ids(snn_graph=adapted_graph)
+                self.assert_integer_ids(
+                    id_graph=id_graph, named_graph=adapted_graph
+                )
+                self.assertNotIn("neuron_ids", id_graph.graph)
+                self.assertEqual(
+                    get_graph_snapshot(
+                        snn_graph=relabel_to_node_names(snn_graph=id_graph)
+                    ),
+                    get_graph_snapshot(snn_graph=adapted_graph),
+                )
+
+    @typechecked
+    def test_delta_with_integer_ids(self) -> None:
+        """Applying a delta to integer ids yields the relabelled adapted graph
+        with node names, and does not change the input graph."""
+        plot_config = Plot_config()
+        for adaptation in adaptations:
+            with self.subTest(adaptation=adaptation.get_name()):
+                snn_graph = get_synthetic_mdsa_graph(size=4, m_val=2)
+                input_snapshot = get_graph_snapshot(snn_graph=snn_graph)
+                delta = get_fused_adaptation_delta(
+                    snn_graph=snn_graph,
+                    adaptation=adaptation,
+                    plot_config=plot_config,
+                )
+                id_graph = apply_adaptation_delta_with_integer_ids(
+                    snn_graph=snn_graph, delta=delta
+                )
+                self.assertEqual(
+                    get_graph_snapshot(snn_graph=snn_graph), input_snapshot
+                )
+                adapted_graph = apply_adaptation_delta(
+                    adaptation_graph=copy.deepcopy(snn_graph), delta=delta
+                )
+                self.assertEqual(
+                    get_sorted_snapshot(snn_graph=id_graph),
+                    get_sorted_snapshot(
+                        snn_graph=relabel_to_integer_ids(
+                            snn_graph=adapted_graph
+                        )
+                    ),
+                )
+                self.assertEqual(
+                    get_sorted_snapshot(
+                        snn_graph=relabel_to_node_names(snn_graph=id_graph)
+                    ),
+                    get_sorted_snapshot(snn_graph=adapted_graph),
+                )
+
+    @typechecked
+    def test_strip_integer_ids(self) -> None:
+        """Stripping an adapted graph with integer ids, made from a delta or
+        by relabelling, yields the unadapted graph with node names. Without
+        its reverse index, such a graph can not be stripped."""
+        plot_config = Plot_config()
+        snn_graph = get_synthetic_mdsa_graph(size=4, m_val=2)
+        for adaptation in adaptations:
+            with self.subTest(adaptation=adaptation.get_name()):
+                delta = get_fused_adaptation_delta(
+                    snn_graph=snn_graph,
+                    adaptation=adaptation,
+                    plot_config=plot_config,
+                )
+                for id_graph in [
+                    apply_adaptation_delta_with_integer_ids(
+                        snn_graph=snn_graph, delta=delta
+                    ),
+                    relabel_to_integer_ids(
+                        snn_graph=apply_fused_adaptation(
+                            adaptation_graph=snn_graph,
+                            adaptation=adaptation,
+                            plot_config=plot_config,
+                        )
+                    ),
+                ]:
+                    self.assertEqual(
+                        get_sorted_snapshot(
+                            snn_graph=strip_adaptation(
+                                adaptation_graph=id_graph
+                            )
+                        ),
+                        get_sorted_snapshot(snn_graph=snn_graph),
+                    )
+                id_graph = apply_adaptation_delta_with_integer_ids(
+                    snn_graph=snn_graph, delta=delta
+                )
+                id_graph.graph.pop(reverse_index_key)
+                with self.assertRaises(ValueError):
+                    strip_adaptation(adaptation_graph=id_graph)
+
+    @typechecked
+    def test_name_table_errors(self) -> None:
+        """Rejects duplicate node names, and graphs without a name table."""
+        with self.assertRaises(ValueError):
+            Node_name_table(["rand_0", "rand_0"])
+        with self.assertRaises(KeyError):
+            get_node_name_table(
+                snn_graph=get_synthetic_mdsa_graph(size=2, m_val=1)
+            )
@@ -0,0 +1,75 @@
+"""Tests whether the adapted graphs of a nested adaptation equal the graphs
+that the adaptations with each redundancy create."""
+import copy
+import unittest
+
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.fingerprint.graph_fingerprint import (
+    get_fingerprint_diff,
+    get_graph_fingerprint,
+)
+from snnadaptation.nested.nested_adaptation import build_nested_adaptation
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.plan.strip_adaptation import strip_adaptation
+from tests.test_helper_synthetic_mdsa_graph import (
+    get_graph_snapshot,
+    get_synthetic_mdsa_graph,
+)
+
+
+class Test_nested_adaptation(unittest.TestCase):
+    """Compares the graphs of a nested adaptation with direct adaptations."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def test_adapted_graphs_equal_adaptations(self) -> None:
+        """Compares the fingerprints and graph attributes, including the
+        reverse index, of each redundancy, and strips each graph back to the
+        input graph."""
+        max_redundancy: int = 3
+        for adaptation_type in ["redundancy", "population"]:
+            snn_graph = get_synthetic_mdsa_graph(size=4, m_val=2)
+            nested_adaptation = build_nested_adaptation(
+                snn_graph=snn_graph,
+                adaptation=Adaptation(adaptation_type, max_redundancy),
+                plot_config=Plot_config(),
+            )
+            for redundancy in range(1, max_redundancy + 1):
+                with self.subTest(
+                    adaptation_type=adaptation_type, redundancy=redundancy
+                ):
+                    adapted_graph = nested_adaptation.get_adapted_graph(
+                        redundancy
+                    )
+                    expected_graph = apply_fused_adaptation(
+                        adaptation_graph=snn_graph,
+                        adaptation=Adaptation(adaptation_type, redundancy),
+                        plot_config=Plot_config(),
+                    )
+                    self.assertEqual(
+                        get_fingerprint_diff(
+                            expected=get_graph_fingerprint(
+                                snn_graph=expected_graph
+                            ),
+                            actual=get_graph_fingerprint(
+                                snn_graph=adapted_graph
+                            ),
+                        ),
+                        [],
+                    )
+                    self.assertEqual(adapted_graph.graph, expected_graph.graph)
+                    self.assertEqual(
+                        get_graph_snapshot(
+                            snn_graph=strip_adaptation(
+                                adaptation_graph=copy.deepcopy(adapted_graph)
+                            )
+                        ),
+                        get_graph_snapshot(snn_graph=snn_graph),
+                    )
@@ -0,0 +1,279 @@
+"""Tests which neurons a selection policy adapts, and the exact graph that
+sparse redundancy and population coding create for a selection."""
+import unittest
+from typing import Dict, Set, Tuple
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.population.apply_population_coding import (
+    apply_population_coding,
+)
+from snnadaptation.redundancy.apply_sparse_redundancy import (
+    apply_sparse_redundancy,
+)
+from snnadaptation.selection.select_neurons import select_neurons
+from snnadaptation.selection.Selection_policy import Selection_policy
+from tests.test_helper_synthetic_mdsa_graph import add_neuron, add_synapse
+
+spike_once = "spike_once_0"
+rand = "rand_0"
+degree_receiver = "degree_receiver_0_0"
+selector = "selector_0_0"
+counter = "counter_0_0"
+connector = "connector_0"
+
+
+@typechecked
+def get_selection_graph() -> nx.DiGraph:
+    """Returns a graph with a neuron per role, in which the degree_receiver
+    has the largest fan-out, fan-in and degree."""
+    snn_graph = nx.DiGraph()
+    for name, identifiers, bias, vth in [
+        ("spike_once", [("node_index", 0)], 2.0, 1.0),
+        ("rand", [("node_index", 0)], 2.0, 1.0),
+        ("degree_receiver", [("node_index", 0), ("neighbour", 0)], 0.0, 2.0),
+        ("selector", [("node_index", 0), ("m_val", 0)], 1.0, 3.0),
+        ("counter", [("node_index", 0), ("m_val", 0)], 0.0, 4.0),
+        ("connector", [("node_index", 0)], 0.0, 1.0),
+    ]:
+        add_neuron(
+            snn_graph=snn_graph,
+            name=name,
+            identifiers=identifiers,
+            bias=bias,
+            du=0.5,
+            vth=vth,
+        )
+    for left, right, weight in [
+        (spike_once, degree_receiver, 1.0),
+        (rand, degree_receiver, 2.0),
+        (degree_receiver, selector, 3.0),
+        (degree_receiver, counter, 4.0),
+        (selector, counter, 5.0),
+        (counter, connector, 6.0),
+    ]:
+        add_synapse(snn_graph=snn_graph, left=left, right=right, weight=weight)
+    return snn_graph
+
+
+@typechecked
+def get_weights(
+    *, snn_graph: nx.DiGraph
+) -> Dict[Tuple[str, str], Tuple[float, bool]]:
+    """Returns the weight and redundancy flag of each synapse."""
+    return {
+        (left, right): (
+            edge_attributes["synapse"].weight,
+            bool(edge_attributes.get("is_redundant", False)),
+        )
+        for left, right, edge_attributes in snn_graph.edges(data=True)
+    }
+
+
+@typechecked
+def get_neuron_properties(
+    *, snn_graph: nx.DiGraph
+) -> Dict[str, Tuple[float, float, float, float]]:
+    """Returns the bias, du, dv and vth of each neuron."""
+    return {
+        node_name: (
+            node_attributes["nx_lif"][0].bias.get(),
+            node_attributes["nx_lif"][0].du.get(),
+            node_attributes["nx_lif"][0].dv.get(),
+            node_attributes["nx_lif"][0].vth.get(),
+        )
+        for node_name, node_attributes in snn_graph.nodes.items()
+    }
+
+
+class Test_select_neurons(unittest.TestCase):
+    """Tests the selection of the adapted neurons."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        self.snn_graph = get_selection_graph()
+
+    @typechecked
+    def select(
+        self,
+        *,
+        selection: Selection_policy,
+        redundancy: int = 2,
+        adaptation_type: str = "redundancy",
+    ) -> Set[str]:
+        """Returns the neurons the selection adapts in the selection
+        graph."""
+        return select_neurons(
+            snn_graph=self.snn_graph,
+            adaptation_type=adaptation_type,
+            redundancy=redundancy,
+            selection=selection,
+        )
+
+    @typechecked
+    def test_roles_and_node_names(self) -> None:
+        """Selects the neurons that have one of the roles and are listed, and
+        never the connectors for population coding."""
+        self.assertEqual(
+            self.select(selection=Selection_policy(roles=["rand", "counter"])),
+            {rand, counter},
+        )
+        self.assertEqual(
+            self.select(
+                selection=Selection_policy(
+                    roles=["selector"], node_names=[selector, counter]
+                )
+            ),
+            {selector},
+        )
+        self.assertEqual(
+            self.select(
+                selection=Selection_policy(), adaptation_type="population"
+            ),
+            set(self.snn_graph) - {connector},
+        )
+        with self.assertRaises(ValueError):
+            self.select(selection=Selection_policy(node_names=["rand_1"]))
+        with self.assertRaises(NotImplementedError):
+            Selection_policy(roles=["synapse"])
+        with self.assertRaises(ValueError):
+            Selection_policy(max_neurons=-1)
+
+    @typechecked
+    def test_budgets(self) -> None:
+        """Selects the most critical neurons first, in graph order for equal
+        scores, and skips neurons that do not fit in the remaining budget."""
+        for criticality, max_neurons, expected_nodes in [
+            ("fan_out", 2, {degree_receiver}),
+            ("fan_out", 4, {degree_receiver, spike_once}),
+            ("fan_in", 4, {degree_receiver, counter}),
+            ("degree", 5, {degree_receiver, counter}),
+            ("degree", 1, set()),
+        ]:
+            with self.subTest(
+                criticality=criticality, max_neurons=max_neurons
+            ):
+                self.assertEqual(
+                    self.select(
+                        selection=Selection_policy(
+                            max_neurons=max_neurons, criticality=criticality
+                        )
+                    ),
+                    expected_nodes,
+                )
+
+        # With redundancy 1, adapting the degree_receiver adds 5 synapses,
+        # the counter 3, the selector 4 and the spike_once 2.
+        for max_synapses, expected_nodes, nr_of_added_synapses in [
+            (4, {counter}, 3),
+            (5, {degree_receiver}, 5),
+            (7, {degree_receiver, spike_once}, 7),
+        ]:
+            with self.subTest(max_synapses=max_synapses):
+                selection = Selection_policy(
+                    max_synapses=max_synapses, criticality="degree"
+                )
+                self.assertEqual(
+                    self.select(selection=selection, redundancy=1),
+                    expected_nodes,
+                )
+                adapted_graph = apply_sparse_redundancy(
+                    adaptation_graph=self.snn_graph,
+                    redundancy=1,
+                    plot_config=Plot_config(),
+                    selection=selection,
+                )
+                self.assertEqual(
+                    adapted_graph.number_of_edges(),
+                    self.snn_graph.number_of_edges() + nr_of_added_synapses,
+                )
+
+    @typechecked
+    def test_sparse_redundancy_of_selection(self) -> None:
+        """The redundant degree_receivers get the inputs and outputs of their
+        original from the unadapted neighbours, and are inhibited by their
+        original and the lower redundant neurons."""
+        adapted_graph = apply_sparse_redundancy(
+            adaptation_graph=self.snn_graph,
+            redundancy=2,
+            plot_config=Plot_config(),
+            selection=Selection_policy(node_names=[degree_receiver]),
+        )
+        expected_properties = get_neuron_properties(snn_graph=self.snn_graph)
+        expected_weights = get_weights(snn_graph=self.snn_graph)
+        for red_level in [1, 2]:
+            red_node_name = f"r_{red_level}_{degree_receiver}"
+            # The vth delays the redundant neuron by red_level timesteps.
+            expected_properties[red_node_name] = (
+                0.0,
+                0.5,
+                0.0,
+                2.0 + red_level,
+            )
+            expected_weights.update(
+                {
+                    (spike_once, red_node_name): (1.0, True),
+                    (rand, red_node_name): (2.0, True),
+                    (red_node_name, selector): (3.0, True),
+                    (red_node_name, counter): (4.0, True),
+                    (degree_receiver, red_node_name): (-100.0, True),
+                }
+            )
+        expected_weights[
+            (f"r_1_{degree_receiver}", f"r_2_{degree_receiver}")
+        ] = (-100.0, True)
+        self.assertEqual(
+            get_neuron_properties(snn_graph=adapted_graph), expected_properties
+        )
+        self.assertEqual(
+            get_weights(snn_graph=adapted_graph), expected_weights
+        )
+
+    @typechecked
+    def test_population_coding_of_selection(self) -> None:
+        """Only the populations of selected neurons are fully connected. The
+        synapses from an unadapted neuron into a population are scaled up to
+        the input of a full population, and the synapses from a population
+        into an unadapted neuron are scaled down to the input of a single
+        neuron."""
+        adapted_graph = apply_population_coding(
+            adaptation_graph=self.snn_graph,
+            redundancy=1,
+            plot_config=Plot_config(),
+            selection=Selection_policy(node_names=[degree_receiver, selector]),
+        )
+        red_degree_receiver = f"r_1_{degree_receiver}"
+        red_selector = f"r_1_{selector}"
+        expected_properties = get_neuron_properties(snn_graph=self.snn_graph)
+        # The selector population has a bias and vth of redundancy + 1 times
+        # those of the original selector.
+        expected_properties[selector] = (2.0, 0.5, 0.0, 6.0)
+        expected_properties[red_selector] = (2.0, 0.5, 0.0, 6.0)
+        expected_properties[red_degree_receiver] = expected_properties[
+            degree_receiver
+        ]
+        self.assertEqual(
+            get_neuron_properties(snn_graph=adapted_graph), expected_properties
+        )
+        self.assertEqual(
+            get_weights(snn_graph=adapted_graph),
+            {
+                (spike_once, degree_receiver): (2.0, False),
+                (spike_once, red_degree_receiver): (2.0, True),
+                (rand, degree_receiver): (4.0, False),
+                (rand, red_degree_receiver): (4.0, True),
+                (degree_receiver, selector): (3.0, False),
+                (degree_receiver, red_selector): (3.0, True),
+                (red_degree_receiver, selector): (3.0, True),
+                (red_degree_receiver, red_selector): (3.0, True),
+                (degree_receiver, counter): (2.0, False),
+                (red_degree_receiver, counter): (2.0, True),
+                (selector, counter): (2.5, False),
+                (red_selector, counter): (2.5, True),
+                (counter, connector): (6.0, False),
+            },
+        )
@@ -0,0 +1,142 @@
+"""Tests whether worker processes read the exported network from the shared
+memory segment, and whether the segment is removed when the last process
+detaches."""
+import multiprocessing
+import unittest
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List
+
+import networkx as nx
+import numpy as np
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.sharing.Shared_network import (
+    attach_shared_network,
+    export_shared_network,
+)
+from tests.test_helper_synthetic_mdsa_graph import get_synthetic_mdsa_graph
+
+
+@typechecked
+def read_shared_network(
+    descriptor: Dict[str, Any], lock: Any, results: Any
+) -> None:
+    """Attaches the worker to the shared network, sends a copy of its arrays
+    and node names to the test process, and detaches."""
+    shared_network = attach_shared_network(descriptor=descriptor, lock=lock)
+    results.put(
+        (
+            {
+                array_name: array.tolist()
+                for array_name, array in shared_network.arrays.items()
+            },
+            shared_network.get_node_names(),
+        )
+    )
+    shared_network.detach()
+
+
+@typechecked
+def segment_exists(*, name: str) -> bool:
+    """Returns True if the shared memory segment has not been removed."""
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    # Opening registers the segment at the resource tracker of this process.
+    resource_tracker.unregister(
+        getattr(segment, "_name", segment.name), "shared_memory"
+    )
+    segment.close()
+    return True
+
+
+class Test_shared_network(unittest.TestCase):
+    """Tests the export of networks into shared memory."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def test_workers_read_network(self) -> None:
+        """Workers in separate processes read the neurons, recur values and
+        synapses of an adapted graph. The segment stays until the exporting
+        process, which detaches last, detaches."""
+        snn_graph: nx.DiGraph = apply_fused_adaptation(
+            adaptation_graph=get_synthetic_mdsa_graph(size=3, m_val=1),
+            adaptation=Adaptation("redundancy", 2),
+            plot_config=Plot_config(),
+        )
+        context = multiprocessing.get_context("spawn")
+        shared_network = export_shared_network(
+            snn_graph=snn_graph, lock=context.Lock()
+        )
+        segment_name: str = shared_network.descriptor["segment"]
+        results = context.Queue()
+        workers: List[Any] = [
+            context.Process(
+                target=read_shared_network,
+                args=(shared_network.descriptor, shared_network.lock, results),
+            )
+            for _ in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+        worker_results = [results.get(timeout=60) for _ in workers]
+        for worker in workers:
+            worker.join(timeout=60)
+            self.assertEqual(worker.exitcode, 0)
+
+        node_names: List[str] = shared_network.get_node_names()
+        self.assertEqual(set(node_names), set(snn_graph))
+        expected_recur: List[float] = [
+            snn_graph.nodes[node_name].get("recur", np.nan)
+            for node_name in node_names
+        ]
+        self.assertTrue(any(np.isnan(recur) for recur in expected_recur))
+        self.assertFalse(all(np.isnan(recur) for recur in expected_recur))
+        for arrays, worker_node_names in worker_results:
+            self.assertEqual(worker_node_names, node_names)
+            np.testing.assert_array_equal(arrays["recur"], expected_recur)
+            self.assertEqual(
+                arrays["vth"],
+                [
+                    snn_graph.nodes[node_name]["nx_lif"][0].vth.get()
+                    for node_name in node_names
+                ],
+            )
+            self.assertEqual(
+                [
+                    (node_names[left], node_names[right], weight)
+                    for left, right, weight in zip(
+                        arrays["left"], arrays["right"], arrays["weight"]
+                    )
+                ],
+                [
+                    (left, right, edge_attributes["synapse"].weight)
+                    for left, right, edge_attributes in snn_graph.edges(
+                        data=True
+                    )
+                ],
+            )
+
+        self.assertTrue(segment_exists(name=segment_name))
+        shared_network.detach()
+        self.assertFalse(segment_exists(name=segment_name))
+        with self.assertRaises(ValueError):
+            attach_shared_network(
+                descriptor=shared_network.descriptor, lock=shared_network.lock
+            )
+
+    @typechecked
+    def test_empty_graph(self) -> None:
+        """An empty graph is exported without node names."""
+        shared_network = export_shared_network(snn_graph=nx.DiGraph())
+        self.assertEqual(shared_network.get_node_names(), [])
+        self.assertEqual(len(shared_network.arrays["left"]), 0)
+        shared_network.detach()
@@ -0,0 +1,205 @@
+"""Tests whether SNN graphs that are streamed into (compressed) node-link
+json files are read back unchanged, also when json values span the chunks
+in which the file is read, and whether networkx reads the files."""
+import gzip
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import unittest
+from typing import IO, Any, Callable, List, Tuple
+from unittest import mock
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.serialization import stream_node_link_json
+from snnadaptation.serialization.node_link_json import (
+    graph_to_node_link,
+    read_graph_from_json,
+)
+from snnadaptation.serialization.stream_node_link_json import (
+    Json_stream,
+    iterate_node_link,
+    stream_graph_from_json,
+    stream_graph_to_json,
+)
+from tests.test_helper_synthetic_mdsa_graph import (
+    get_graph_snapshot,
+    get_synthetic_mdsa_graph,
+)
+
+
+class Test_stream_node_link_json(unittest.TestCase):
+    """Tests the streamed node-link json writer and reader."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        self.snn_graph = apply_fused_adaptation(
+            adaptation_graph=get_synthetic_mdsa_graph(size=3, m_val=1),
+            adaptation=Adaptation("redundancy", 2),
+            plot_config=Plot_config(),
+        )
+        # Strings with json delimiters and escapes.
+        self.snn_graph.graph["note"] = 'a}b]c,"d"\\e\n\u00e9{['
+
+    @typechecked
+    def assert_round_trip(self, *, json_path: str) -> None:
+        """Streams the graph into the file and back, with small chunks such
+        that json values span several chunks."""
+        stream_graph_to_json(snn_graph=self.snn_graph, json_path=json_path)
+        with mock.patch.object(stream_node_link_json, "chunk_size", 7):
+            self.assertEqual(
+                get_graph_snapshot(
+                    snn_graph=stream_graph_from_json(json_path=json_path)
+                ),
+                get_graph_snapshot(snn_graph=self.snn_graph),
+            )
+
+    @typechecked
+    def test_plain_round_trip(self) -> None:
+        """The uncompressed file is the json of write_graph_to_json."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = os.path.join(tmp_dir, "graph.json")
+            self.assert_round_trip(json_path=json_path)
+            with open(json_path, encoding="utf-8") as json_file:
+                self.assertEqual(
+                    json.load(json_file),
+                    graph_to_node_link(snn_graph=self.snn_graph),
+                )
+            self.assertEqual(
+                get_graph_snapshot(
+                    snn_graph=read_graph_from_json(json_path=json_path)
+                ),
+                get_graph_snapshot(snn_graph=self.snn_graph),
+            )
+
+    @typechecked
+    def test_gzip_round_trip(self) -> None:
+        """The .gz file is gzip compressed."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = os.path.join(tmp_dir, "graph.json.gz")
+            self.assert_round_trip(json_path=json_path)
+            with gzip.open(json_path, "rt", encoding="utf-8") as json_file:
+                self.assertEqual(
+                    json.load(json_file),
+                    graph_to_node_link(snn_graph=self.snn_graph),
+                )
+
+    @typechecked
+    def test_networkx_loader(self) -> None:
+        """The decompressed file is the nx.node_link_data layout, which
+        nx.node_link_graph reads as load_json_to_nx_graph_from_file of
+        snncompare does, with the encoded neurons and synapses."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_openers: List[Tuple[str, Callable[..., IO[Any]]]] = [
+                ("graph.json", open),
+                ("graph.json.gz", gzip.open),
+            ]
+            for file_name, open_file in file_openers:
+                json_path = os.path.join(tmp_dir, file_name)
+                stream_graph_to_json(
+                    snn_graph=self.snn_graph, json_path=json_path
+                )
+                with open_file(json_path, "rt", encoding="utf-8") as json_file:
+                    node_link = json.load(json_file)
+                loaded_graph: nx.DiGraph = nx.node_link_graph(node_link)
+                self.assertEqual(
+                    list(node_link),
+                    list(nx.node_link_data(nx.DiGraph())),
+                )
+                self.assertEqual(nx.node_link_data(loaded_graph), node_link)
+                self.assertEqual(list(loaded_graph), list(self.snn_graph))
+                self.assertEqual(
+                    list(loaded_graph.edges), list(self.snn_graph.edges)
+                )
+                self.assertEqual(
+                    loaded_graph.nodes["rand_0"]["nx_lif"][0]["vth"],
+                    self.snn_graph.nodes["rand_0"]["nx_lif"][0].vth.get(),
+                )
+
+    @typechecked
+    def test_large_value(self) -> None:
+        """Decodes a graph attribute that spans many chunks once, instead of
+        decoding the buffer again per chunk."""
+        self.snn_graph.graph["large"] = list(range(20000))
+        decoded_lengths: List[int] = []
+        raw_decode = json.JSONDecoder.raw_decode
+
+        def counted_raw_decode(
+            decoder: json.JSONDecoder, text: str, index: int = 0
+        ) -> Tuple[Any, int]:
+            """Decodes the json, and keeps the length of the text after the
+            index."""
+            decoded_lengths.append(len(text) - index)
+            return raw_decode(decoder, text, index)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = os.path.join(tmp_dir, "graph.json")
+            with mock.patch.object(
+                json.JSONDecoder, "raw_decode", counted_raw_decode
+            ):
+                self.assert_round_trip(json_path=json_path)
+            self.assertLess(
+                sum(decoded_lengths), 2 * os.path.getsize(json_path)
+            )
+
+    @unittest.skipIf(
+        importlib.util.find_spec("zstandard") is None,
+        "zstandard is not installed.",
+    )
+    @typechecked
+    def test_zstd_round_trip(self) -> None:
+        """The .zst file is zstd compressed."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.assert_round_trip(
+                json_path=os.path.join(tmp_dir, "graph.json.zst")
+            )
+
+    @typechecked
+    def test_json_stream(self) -> None:
+        """Decodes values with delimiters and escapes in strings, numbers
+        that end at a chunk boundary, and empty lists."""
+        text: str = (
+            '{"a": "x}]\\"y\\\\", "nodes": [{"id": "]"}, 12345],'
+            + ' "links": [], "b": -1.5e3}'
+        )
+        with mock.patch.object(stream_node_link_json, "chunk_size", 3):
+            json_stream = Json_stream(io.StringIO(text))
+            json_stream.expect("{")
+            self.assertEqual(json_stream.decode_value(), "a")
+            json_stream.expect(":")
+            self.assertEqual(json_stream.decode_value(), 'x}]"y\\')
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = os.path.join(tmp_dir, "entries.json")
+            with open(json_path, "w", encoding="utf-8") as json_file:
+                json_file.write(text)
+            with mock.patch.object(stream_node_link_json, "chunk_size", 3):
+                self.assertEqual(
+                    list(iterate_node_link(json_path=json_path)),
+                    [
+                        ("a", 'x}]"y\\'),
+                        ("nodes", {"id": "]"}),
+                        ("nodes", 12345),
+                        ("b", -1500.0),
+                    ],
+                )
+
+    @typechecked
+    def test_truncated_file(self) -> None:
+        """Raises an error on a file that ends in the middle of the json,
+        instead of returning part of the graph."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = os.path.join(tmp_dir, "graph.json")
+            stream_graph_to_json(snn_graph=self.snn_graph, json_path=json_path)
+            for size in [os.path.getsize(json_path) // 2, 1]:
+                with open(json_path, "r+", encoding="utf-8") as json_file:
+                    json_file.truncate(size)
+                with self.assertRaises(ValueError):
+                    stream_graph_from_json(json_path=json_path)
@@ -0,0 +1,81 @@
+"""Tests whether stripping an adapted graph gives back the input graph, with
+and without the reverse index of the adaptation."""
+import unittest
+from typing import Any, List, Tuple
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.Adaptation_delta import reverse_index_key
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.plan.strip_adaptation import strip_adaptation
+from tests.test_helper_synthetic_mdsa_graph import (
+    get_graph_snapshot,
+    get_synthetic_mdsa_graph,
+)
+
+
+@typechecked
+def get_topology(*, snn_graph: nx.DiGraph) -> Tuple[List[Any], List[Any]]:
+    """Returns the ordered node names and edges of a graph."""
+    return list(snn_graph.nodes), list(snn_graph.edges)
+
+
+class Test_strip_adaptation(unittest.TestCase):
+    """Strips adapted graphs and compares them with their input graphs."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def test_round_trips(self) -> None:
+        """With the reverse index, the input graph is restored exactly. Without
+        it, the neurons, synapses and graph attributes of the adaptation are
+        removed, but the neuron properties and synapse weights that
+        population coding overrode are not restored."""
+        for adaptation in [
+            Adaptation("redundancy", 1),
+            Adaptation("redundancy", 3),
+            Adaptation("population", 2),
+            Adaptation(
+                "population", 1, next_stages=[Adaptation("redundancy", 2)]
+            ),
+        ]:
+            with self.subTest(adaptation=adaptation.get_name()):
+                snn_graph = get_synthetic_mdsa_graph(size=4, m_val=2)
+                self.assertEqual(
+                    get_graph_snapshot(
+                        snn_graph=strip_adaptation(
+                            adaptation_graph=apply_fused_adaptation(
+                                adaptation_graph=snn_graph,
+                                adaptation=adaptation,
+                                plot_config=Plot_config(),
+                            )
+                        )
+                    ),
+                    get_graph_snapshot(snn_graph=snn_graph),
+                )
+
+                adapted_graph = apply_fused_adaptation(
+                    adaptation_graph=snn_graph,
+                    adaptation=adaptation,
+                    plot_config=Plot_config(),
+                )
+                adapted_graph.graph.pop(reverse_index_key)
+                stripped_graph = strip_adaptation(
+                    adaptation_graph=adapted_graph
+                )
+                self.assertEqual(stripped_graph.graph, snn_graph.graph)
+                self.assertEqual(
+                    get_topology(snn_graph=stripped_graph),
+                    get_topology(snn_graph=snn_graph),
+                )
+                if adaptation.adaptation_type == "redundancy":
+                    self.assertEqual(
+                        get_graph_snapshot(snn_graph=stripped_graph),
+                        get_graph_snapshot(snn_graph=snn_graph),
+                    )
@@ -0,0 +1,113 @@
+"""Tests whether simulating one representative per class of identical neurons
+yields the spikes and states of a time-stepped simulation, also after a
+perturbation splits the classes during the run."""
+import unittest
+from typing import Dict, Hashable, Optional
+
+import networkx as nx
+from snncompare.export_plots.Plot_config import Plot_config
+from typeguard import typechecked
+
+from snnadaptation.Adaptation import Adaptation
+from snnadaptation.plan.apply_fused_adaptation import apply_fused_adaptation
+from snnadaptation.simulation.Symmetry_reduced_simulator import (
+    Symmetry_reduced_simulator,
+)
+from tests.test_helper_synthetic_mdsa_graph import get_synthetic_mdsa_graph
+from tests.test_helper_time_stepped_simulation import simulate_time_stepped
+
+nr_of_timesteps: int = 40
+
+
+class Test_symmetry_reduced_simulator(unittest.TestCase):
+    """Compares the symmetry reduced simulator with a time-stepped
+    simulation."""
+
+    # Initialize test object
+    @typechecked
+    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+
+    @typechecked
+    def assert_equal_simulation(
+        self,
+        *,
+        snn_graph: nx.DiGraph,
+        perturbations: Optional[
+            Dict[int, Dict[Hashable, Dict[str, float]]]
+        ] = None,
+    ) -> Symmetry_reduced_simulator:
+        """Asserts the symmetry reduced and time-stepped simulations of the
+        graph have the same spike times, and the same final states up to
+        rounding. Returns the symmetry reduced simulator."""
+        simulator = Symmetry_reduced_simulator(snn_graph)
+        for timestep in range(1, nr_of_timesteps + 1):
+            for node_name, perturbation in (
+                (perturbations or {}).get(timestep, {}).items()
+            ):
+                simulator.perturb_neuron(node_name, perturbation)
+            simulator.simulate_timestep()
+        spike_times, states = simulate_time_stepped(
+            snn_graph=snn_graph,
+            nr_of_timesteps=nr_of_timesteps,
+            perturbations=perturbations,
+        )
+        self.assertEqual(simulator.get_spike_times(), spike_times)
+        for node_name, (u, v) in states.items():
+            reduced_u, reduced_v = simulator.get_state(node_name)
+            self.assertAlmostEqual(reduced_u, u)
+            self.assertAlmostEqual(reduced_v, v)
+        return simulator
+
+    @typechecked
+    def test_population_classes(self) -> None:
+        """The copies of each population coded neuron form one class."""
+        adapted_graph = apply_fused_adaptation(
+            adaptation_graph=get_synthetic_mdsa_graph(size=4, m_val=2),
+            adaptation=Adaptation("population", 3),
+            plot_config=Plot_config(),
+        )
+        self.assertEqual(len(adapted_graph), 286)
+        simulator = self.assert_equal_simulation(snn_graph=adapted_graph)
+        self.assertEqual(simulator.get_nr_of_classes(), 34)
+
+    @typechecked
+    def test_adapted_graphs(self) -> None:
+        """Simulates adapted graphs without and with perturbations during the
+        run, which split the classes of the perturbed neurons."""
+        for adaptation in [
+            Adaptation("population", 1),
+            Adaptation("population", 3),
+            Adaptation("redundancy", 2),
+        ]:
+            with self.subTest(adaptation=adaptation.get_name()):
+                adapted_graph = apply_fused_adaptation(
+                    adaptation_graph=get_synthetic_mdsa_graph(size=4, m_val=2),
+                    adaptation=adaptation,
+                    plot_config=Plot_config(),
+                )
+                unperturbed_classes: int = self.assert_equal_simulation(
+                    snn_graph=adapted_graph
+                ).get_nr_of_classes()
+                node_names = list(adapted_graph)
+                simulator = self.assert_equal_simulation(
+                    snn_graph=adapted_graph,
+                    perturbations={
+                        3: {node_names[-1]: {"vth": 1000.0}},
+                        7: {node_names[len(node_names) // 2]: {"vth": 1000.0}},
+                        12: {node_names[5]: {"u": 3.0, "v": -1.0}},
+                    },
+                )
+                self.assertGreater(
+                    simulator.get_nr_of_classes(), unperturbed_classes
+                )
+
+    @typechecked
+    def test_perturbation_key(self) -> None:
+        """Rejects perturbations of values that are not neuron properties or
+        state."""
+        simulator = Symmetry_reduced_simulator(
+            get_synthetic_mdsa_graph(size=2, m_val=1)
+        )
+        with self.assertRaises(KeyError):
+            simulator.perturb_neuron("rand_0", {"weight": 1.0})